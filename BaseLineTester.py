@@ -1,11 +1,10 @@
 import math
 import os
-from copy import deepcopy
 
 import numpy as np
 import pandas as pd
 
-from CONFIG import BASE_PATH
+from CONFIG import BASE_PATH, VARIANT_CACHE_PATH
 from VariantGenerator import VariantGenerator
 
 
@@ -13,7 +12,7 @@ class BaseLineTester:
 
     def __init__(self, student_name):
         self.student_name = student_name
-        self.vg = VariantGenerator(student_name)
+        self.vg = VariantGenerator(student_name, cache_path=VARIANT_CACHE_PATH)
         self.eq_net = None
         self.vectors_list = None
         self.vectors_df = None
@@ -66,7 +65,7 @@ class BaseLineTester:
     def _init_vectors_list(self, base_path, students_group):
         if self.eq_net is None:
             self._get_eq_net(base_path=base_path, students_group=students_group)
-        self.vectors_list = deepcopy(self.eq_net.gnss_vectors)
+        self.vectors_list = list(self.eq_net.gnss_vectors)
         return self.vectors_list
 
     def _init_vectors_df(self, base_path, students_group):
@@ -98,8 +97,7 @@ class BaseLineTester:
     def _create_blank_vectors_df(self, base_path=BASE_PATH, students_group=""):
         if self.vectors_df is None:
             self._init_vectors_df(base_path, students_group)
-        blank_df = deepcopy(self.vectors_df)
-        blank_df = blank_df.applymap(lambda x: np.nan)
+        blank_df = self.vectors_df.applymap(lambda x: np.nan)
         blank_df.to_excel('output.xlsx', sheet_name='Лист1', index=True)
         return blank_df
 
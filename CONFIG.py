@@ -1,3 +1,5 @@
+import os
+
 
 # GNSS NET parameters
 
@@ -28,10 +30,50 @@ CROP_PERC = 0.1
 
 BASE_PATH = ""
 
+# Каталог кэша вариантов внутри BASE_PATH (None - без кэша)
+VARIANT_CACHE_PATH = os.path.join(BASE_PATH, "Кэш вариантов")
+
+# Каталог кэша результатов проверки векторов внутри BASE_PATH (None - только в памяти)
+GRADING_CACHE_PATH = os.path.join(BASE_PATH, "Кэш проверки")
+
+# Режим наблюдения (VectorsWatcher): время без изменений файла перед проверкой и период опроса, с.
+# На отпечатки кэшей вариантов и проверки не влияют
+WATCH_DEBOUNCE = 2.0
+
+WATCH_POLL_INTERVAL = 1.0
+
 # MEASURED MSE #
 
 MSE_A = 5
 
 MSE_B = 3
 
-MSE_Z_SCALER = 5
\ No newline at end of file
+MSE_Z_SCALER = 5
+
+# Схема векторов серии (GnssVectorsGraph): разрешены ли замкнутые фигуры и повторные векторы.
+# В шаблоне задания NUM_POINTS - 1 векторов на серию, то есть схема - дерево
+CHECK_ALLOW_CYCLES = False
+
+CHECK_ALLOW_DUPLICATES = False
+
+# Допуски автоматической приемки уравнивания (EqSolutionChecker) #
+
+# Отклонения уравненных координат от истинных, м
+CHECK_MAX_PLAN_ERROR = 0.05
+
+CHECK_MAX_HEIGHT_ERROR = 0.15
+
+# Большая полуось эллипса ошибок, м
+CHECK_MAX_ELLIPSE_A = 0.1
+
+# Диапазон ошибки единицы веса mu / r
+CHECK_MU_LIMITS = (0.2, 3.0)
+
+# Доля допуска, начиная с которой решение считается пограничным
+CHECK_BORDERLINE_RATIO = 0.8
+
+# Очередь пограничных решений для ручной проверки (None - принимать автоматически)
+CHECK_REVIEW_QUEUE_PATH = None
+
+# Решения проверяющего по очереди: JSON {SHA-256 файла векторов: "OK" или "FAIL"} (None - не применяются)
+CHECK_REVIEW_DECISIONS_PATH = None
\ No newline at end of file
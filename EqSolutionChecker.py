@@ -0,0 +1,162 @@
+import datetime
+import json
+import math
+
+import numpy as np
+
+from CONFIG import (CHECK_MAX_PLAN_ERROR, CHECK_MAX_HEIGHT_ERROR, CHECK_MAX_ELLIPSE_A, CHECK_MU_LIMITS,
+                    CHECK_BORDERLINE_RATIO, CHECK_REVIEW_QUEUE_PATH, CHECK_REVIEW_DECISIONS_PATH)
+from EqualisedNetwork import EqualisedNetwork
+from GnssNet import GnssNet
+
+
+class EqSolutionChecker:
+
+    OK = "OK"
+    BORDERLINE = "BORDERLINE"
+    FAIL = "FAIL"
+
+    def __init__(self, max_plan_error=CHECK_MAX_PLAN_ERROR, max_height_error=CHECK_MAX_HEIGHT_ERROR,
+                 max_ellipse_a=CHECK_MAX_ELLIPSE_A, mu_limits=CHECK_MU_LIMITS,
+                 borderline_ratio=CHECK_BORDERLINE_RATIO, review_queue_path=CHECK_REVIEW_QUEUE_PATH,
+                 review_decisions_path=CHECK_REVIEW_DECISIONS_PATH):
+        """
+        Автоматическая приемка решения уравнивания. Уравненные координаты определяемых точек
+        сравниваются с истинными из базовой сети варианта, ошибка единицы веса mu / r
+        (r - число избыточных измерений) и большие полуоси эллипсов ошибок - с допусками.
+        Значение, превысившее borderline_ratio от допуска (но не сам допуск), считается пограничным.
+        Решения проверяющего по пограничным работам берутся из файла review_decisions_path
+        по SHA-256 файла векторов.
+
+        :param max_plan_error: Допустимое отклонение в плане, м
+        :param max_height_error: Допустимое отклонение по высоте, м
+        :param max_ellipse_a: Допустимая большая полуось эллипса ошибок, м
+        :param mu_limits: Допустимый диапазон mu / r
+        :param borderline_ratio: Доля допуска, начиная с которой решение пограничное
+        :param review_queue_path: Файл очереди ручной проверки (JSON Lines); None - пограничные
+                                  решения принимаются автоматически
+        :param review_decisions_path: Файл решений проверяющего:
+                                      JSON {SHA-256 файла векторов: OK или FAIL}; None - решений нет
+        """
+        self.max_plan_error = max_plan_error
+        self.max_height_error = max_height_error
+        self.max_ellipse_a = max_ellipse_a
+        self.mu_limits = mu_limits
+        self.borderline_ratio = borderline_ratio
+        self.review_queue_path = review_queue_path
+        self.review_decisions_path = review_decisions_path
+
+    def get_metrics(self, eq_net: EqualisedNetwork, base_gnss_net: GnssNet):
+        """
+        Показатели решения: наибольшие отклонения от истинных координат, mu / r и большая полуось эллипса.
+        """
+        coord_df, mse_df = eq_net.coord_df, eq_net.mse_df
+        plan_errors, height_errors = [0.0], [0.0]
+        for point_name in coord_df.columns:
+            point = base_gnss_net.get_point_by_name(point_name)
+            if point.is_base():
+                continue
+            x, y, z = coord_df[point_name][["X", "Y", "Z"]].tolist()
+            plan_errors.append(math.hypot(x - point.x, y - point.y))
+            height_errors.append(abs(z - point.z))
+        redundancy = eq_net.get_redundancy()
+        return {"plan_error": max(plan_errors),
+                "height_error": max(height_errors),
+                "mu": float(eq_net.get_mu()) / redundancy if redundancy > 0 else math.nan,
+                "ellipse_a": max(mse_df.loc["a"].tolist(), default=0.0)}
+
+    def get_verdict(self, metrics):
+        """
+        :return: (OK, BORDERLINE или FAIL, список описаний нарушений)
+        """
+        mu_min, mu_max = self.mu_limits
+        limits = (("plan_error", self.max_plan_error, "Отклонение в плане"),
+                  ("height_error", self.max_height_error, "Отклонение по высоте"),
+                  ("ellipse_a", self.max_ellipse_a, "Большая полуось эллипса ошибок"))
+        failures, borderline = [], []
+        for key, limit, title in limits:
+            if not metrics[key] <= limit:
+                failures.append(f"{title} {metrics[key]:.3f} м больше допуска {limit} м")
+            elif metrics[key] > self.borderline_ratio * limit:
+                borderline.append(f"{title} {metrics[key]:.3f} м близко к допуску {limit} м")
+        mu = metrics["mu"]
+        if not mu_min <= mu <= mu_max:
+            failures.append(f"mu / r = {mu:.3f} вне диапазона [{mu_min}, {mu_max}]")
+        elif mu > self.borderline_ratio * mu_max or mu * self.borderline_ratio < mu_min:
+            borderline.append(f"mu / r = {mu:.3f} близко к границе диапазона [{mu_min}, {mu_max}]")
+        if failures:
+            return self.FAIL, failures
+        if borderline:
+            return self.BORDERLINE, borderline
+        return self.OK, []
+
+    def check(self, eq_net: EqualisedNetwork, base_gnss_net: GnssNet, student_name="", vectors_hash=None):
+        """
+        Проверяет решение. Пограничное решение при заданной очереди добавляется в нее,
+        иначе принимается.
+
+        :param vectors_hash: SHA-256 файла векторов студента (ключ очереди и решений проверяющего)
+
+        :return: (OK, BORDERLINE или FAIL, список описаний нарушений, показатели)
+        """
+        try:
+            metrics = self.get_metrics(eq_net, base_gnss_net)
+        except (np.linalg.LinAlgError, ValueError, ZeroDivisionError, KeyError) as e:
+            return self.FAIL, [f"Ошибка уравнивания: {e}"], {}
+        verdict, problems = self.get_verdict(metrics)
+        if verdict == self.BORDERLINE:
+            if self.review_queue_path is None:
+                verdict = self.OK
+            else:
+                self.add_to_review_queue(student_name, metrics, problems, vectors_hash)
+        return verdict, problems, metrics
+
+    def _read_review_queue(self):
+        try:
+            with open(self.review_queue_path, "rt", encoding="UTF-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return []
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
+
+    def add_to_review_queue(self, student_name, metrics, problems, vectors_hash=None):
+        """
+        Дописывает решение в очередь ручной проверки одной строкой JSON.
+        Повторная проверка того же файла векторов студента в очередь не добавляется.
+
+        :return: True, если запись добавлена
+        """
+        for record in self._read_review_queue():
+            if record.get("student") == student_name and record.get("vectors_hash") == vectors_hash:
+                return False
+        record = {"time": str(datetime.datetime.now()),
+                  "student": student_name,
+                  "vectors_hash": vectors_hash,
+                  "metrics": metrics,
+                  "problems": problems}
+        with open(self.review_queue_path, "a", encoding="UTF-8") as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return True
+
+    def get_decision(self, vectors_hash):
+        """
+        Решение проверяющего по файлу векторов.
+
+        :param vectors_hash: SHA-256 файла векторов
+        :return: OK, FAIL или None, если решения нет
+        """
+        if self.review_decisions_path is None or vectors_hash is None:
+            return None
+        try:
+            with open(self.review_decisions_path, "rt", encoding="UTF-8") as file:
+                decisions = json.load(file)
+        except (OSError, ValueError):
+            return None
+        decision = decisions.get(vectors_hash) if isinstance(decisions, dict) else None
+        return decision if decision in (self.OK, self.FAIL) else None
@@ -8,135 +8,647 @@ from GnssMasureGenerator import GnssMeasureGenerator
 from GnssNetGenerator import GnssNetGenerator
 from GnssVector import GnssVector
 
+try:
+    from scipy import linalg as scipy_linalg
+    from scipy import sparse
+    from scipy.sparse import linalg as sparse_linalg
+except ImportError:
+    scipy_linalg = None
+    sparse = None
+    sparse_linalg = None
+
 
 class EqualisedNetwork:
 
-    def __init__(self, *gnss_vectors: GnssVector):
+    # Число определяемых координат, начиная с которого backend="auto" выбирает разреженное решение
+    SPARSE_THRESHOLD = 1500
+    # Число точек, диагональные блоки N^-1 которых вычисляются за один проход (3 столбца правой части на точку)
+    Q_BLOCKS_CHUNK = 64
+
+    def __init__(self, *gnss_vectors: GnssVector, backend="auto", sequential=False):
+        """
+        Уравнивание сети векторов.
+
+        :param gnss_vectors: Объекты GnssVector
+        :param backend: "dense", "sparse" (нужен scipy) или "auto" - разреженное решение
+                        для сетей с числом определяемых координат не меньше SPARSE_THRESHOLD
+        :param sequential: Последовательное уравнивание: при добавлении и удалении векторов
+                           решение обновляется без повторного разложения N (только плотное решение)
+        """
+        if backend not in ("auto", "dense", "sparse"):
+            raise ValueError(f"Неизвестный backend: {backend}")
+        if backend == "sparse" and sparse is None:
+            raise ImportError("Для backend='sparse' требуется scipy")
+        if backend == "sparse" and sequential:
+            raise ValueError("Последовательное уравнивание поддерживается только плотным решением")
+        self.backend = backend
+        self.sequential = sequential
         self.gnss_vectors = list(gnss_vectors)
         self.mse_df = None
         self.coord_df = None
         self.result_df = None
+        self.observations_covariance = None
+        self._solution = None
+        self._solution_key = None
         self.calculate()
 
     def add_gnss_vector(self, gnss_vector: GnssVector):
-        if isinstance(gnss_vector, GnssVector):
+        self.add_gnss_vectors(gnss_vector)
+
+    def add_gnss_vectors(self, *gnss_vectors: GnssVector):
+        """
+        Добавляет векторы в сеть. В последовательном режиме решение обновляется
+        по каждому вектору и результаты (result_df) сразу пересчитываются.
+        """
+        for gnss_vector in gnss_vectors:
+            if not isinstance(gnss_vector, GnssVector):
+                raise ValueError("Должен быть GnssVector")
+        for gnss_vector in gnss_vectors:
             self.gnss_vectors.append(gnss_vector)
+            if self.sequential:
+                self._update_sequential_solution(gnss_vector, sign=1)
+            else:
+                self._solution = None
+        if self.sequential:
+            self._refresh_sequential_results()
+
+    def remove_gnss_vector(self, gnss_vector: GnssVector):
+        """
+        Удаляет вектор (тот же объект) из сети.
+        В последовательном режиме решение обновляется и результаты сразу пересчитываются.
+        """
+        for idx, vector in enumerate(self.gnss_vectors):
+            if vector is gnss_vector:
+                break
+        else:
+            raise ValueError("Вектора нет в сети")
+        del self.gnss_vectors[idx]
+        if self.sequential:
+            self._update_sequential_solution(gnss_vector, sign=-1)
+            self._refresh_sequential_results()
         else:
-            raise ValueError("Должен быть GnssVector")
+            self._solution = None
 
-    def _get_a_coefficients_df(self):
-        df = pd.DataFrame()
+    def set_observations_covariance(self, covariance=None):
+        """
+        Задает полную ковариационную матрицу измерений для коррелированных измерений.
+        Порядок строк - как у _get_observations_index(). None - независимые измерения с весами 1 / mse^2.
+
+        :param covariance: Матрица (3 * число векторов) x (3 * число векторов) или None
+        """
+        if covariance is not None:
+            covariance = np.asarray(covariance, dtype=np.float64)
+            if covariance.shape != (3 * len(self.gnss_vectors),) * 2:
+                raise ValueError("Размер ковариационной матрицы не соответствует числу измерений")
+        self.observations_covariance = covariance
+        self._solution = None
+
+    def _init_unknowns(self):
+        """
+        Сопоставляет каждой определяемой точке номер первого из ее столбцов x, y, z в матрице A.
+        Порядок точек - порядок их первого появления в векторах.
+
+        :return: словарь {имя точки: номер столбца}
+        """
+        unknowns_idx = {}
         for vector in self.gnss_vectors:
-            df = pd.concat([df, vector.get_a_coefficients_df()])
-        self.a_coefficients_df = df.fillna(0)
-        return df.fillna(0)
+            for point in vector.point_0, vector.point_1:
+                if point.is_rover() and point.name not in unknowns_idx:
+                    unknowns_idx[point.name] = 3 * len(unknowns_idx)
+        self.unknowns_idx = unknowns_idx
+        return unknowns_idx
+
+    def _get_unknowns_index(self):
+        return [f"{point_name}_{axis}" for point_name in self._init_unknowns() for axis in ("x", "y", "z")]
+
+    def _get_observations_index(self):
+        return [f"{observation}_{vector.point_0.name}-{vector.point_1.name}"
+                for vector in self.gnss_vectors
+                for observation in ("s_dist", "azimuth", "zenith")]
+
+    def _get_vectors_array(self, attr, gnss_vectors=None):
+        if gnss_vectors is None:
+            gnss_vectors = self.gnss_vectors
+        return np.array([getattr(vector, attr) for vector in gnss_vectors], dtype=np.float64)
+
+    def _get_a_triplets(self, gnss_vectors=None, unknowns_idx=None):
+        """
+        Ненулевые элементы матрицы коэффициентов параметрических уравнений поправок.
+        Строки - наклонная дальность, азимут и зенитное расстояние каждого вектора,
+        столбцы - координаты x, y, z определяемых точек.
+
+        :param gnss_vectors: Векторы (по умолчанию - все векторы сети)
+        :param unknowns_idx: Номера столбцов точек (по умолчанию - _init_unknowns())
+        :return: массивы номеров строк, номеров столбцов и значений
+        """
+        if gnss_vectors is None:
+            gnss_vectors = self.gnss_vectors
+        if unknowns_idx is None:
+            unknowns_idx = self._init_unknowns()
+        if not gnss_vectors:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0)
+        dz, s_dist, h_dist = (self._get_vectors_array(attr, gnss_vectors) for attr in ("dz", "s_dist", "h_dist"))
+        azimuth = self._get_vectors_array("azimuth", gnss_vectors).tolist()
+        cos_a = np.array([math.cos(value) for value in azimuth])
+        sin_a = np.array([math.sin(value) for value in azimuth])
+        zenith_denominator = dz ** 2 + h_dist ** 2
+
+        # Коэффициенты для конечной точки вектора (vector, наблюдение, ось), для начальной - с обратным знаком
+        coefficients = np.zeros((len(gnss_vectors), 3, 3))
+        coefficients[:, 0] = np.column_stack((cos_a, sin_a, dz / s_dist))
+        coefficients[:, 1, 0] = -sin_a / h_dist
+        coefficients[:, 1, 1] = cos_a / h_dist
+        coefficients[:, 2] = np.column_stack(((dz * cos_a) / zenith_denominator,
+                                              (dz * sin_a) / zenith_denominator,
+                                              (h_dist / zenith_denominator) * -1))
+
+        rows = 3 * np.arange(len(gnss_vectors))[:, None, None] + np.arange(3)[None, :, None]
+        axes = np.arange(3)[None, None, :]
+        rows_lst, columns_lst, values_lst = [], [], []
+        for end_point, sign in ("point_0", -1), ("point_1", 1):
+            columns = np.array([unknowns_idx.get(getattr(vector, end_point).name, -1)
+                                for vector in gnss_vectors])
+            is_rover = columns >= 0
+            end_rows, end_columns = np.broadcast_arrays(rows[is_rover], columns[is_rover][:, None, None] + axes)
+            rows_lst.append(end_rows.ravel())
+            columns_lst.append(end_columns.ravel())
+            values_lst.append((sign * coefficients[is_rover]).ravel())
+        return np.concatenate(rows_lst), np.concatenate(columns_lst), np.concatenate(values_lst)
+
+    def _get_a_matrix(self, as_sparse=False):
+        """
+        Матрица A: плотный массив или, при as_sparse=True, разреженная матрица CSR.
+        """
+        rows, columns, values = self._get_a_triplets()
+        shape = (3 * len(self.gnss_vectors), 3 * len(self.unknowns_idx))
+        if as_sparse:
+            return sparse.csr_matrix((values, (rows, columns)), shape=shape)
+        a = np.zeros(shape)
+        a[rows, columns] = values
+        self.a_matrix = a
+        return a
+
+    def _is_sparse_backend(self):
+        unknowns_count = 3 * len(self._init_unknowns())
+        if self.backend == "auto":
+            return sparse is not None and unknowns_count >= self.SPARSE_THRESHOLD
+        return self.backend == "sparse" and unknowns_count > 0
+
+    def _get_weights(self, gnss_vectors=None):
+        """
+        Веса измерений 1 / mse^2 (диагональ матрицы P) в виде одномерного массива.
+        """
+        if gnss_vectors is None:
+            gnss_vectors = self.gnss_vectors
+        if not gnss_vectors:
+            return np.zeros(0)
+        return np.column_stack([1 / self._get_vectors_array(attr, gnss_vectors) ** 2
+                                for attr in ("mse_s_dist", "mse_azimuth", "mse_zenith")]).ravel()
+
+    def _get_p_matrix(self):
+        """
+        Полная весовая матрица P. Нужна только для коррелированных измерений и для отчетов.
+        """
+        if self.observations_covariance is not None:
+            return np.linalg.inv(self.observations_covariance)
+        return np.diag(self._get_weights())
+
+    def _get_l_vector(self, gnss_vectors=None):
+        """
+        Свободные члены: значения, вычисленные по исходным координатам, минус измеренные.
+        """
+        if gnss_vectors is None:
+            gnss_vectors = self.gnss_vectors
+        if not gnss_vectors:
+            return np.zeros(0)
+        x_0, y_0, z_0, x_1, y_1, z_1 = (self._get_vectors_array(attr, gnss_vectors)
+                                        for attr in ("x_0", "y_0", "z_0", "x_1", "y_1", "z_1"))
+        s_dist_0 = ((x_0 - x_1) ** 2 + (y_0 - y_1) ** 2 + (z_0 - z_1) ** 2) ** 0.5
+        azimuth_0 = np.array(list(map(math.atan2, (y_1 - y_0).tolist(), (x_1 - x_0).tolist())))
+        zenith_0 = np.array(list(map(math.acos, ((z_1 - z_0) / s_dist_0).tolist())))
+        l = np.column_stack((s_dist_0 - self._get_vectors_array("s_dist", gnss_vectors),
+                             azimuth_0 - self._get_vectors_array("azimuth", gnss_vectors),
+                             zenith_0 - self._get_vectors_array("zenith", gnss_vectors)))
+        return l.ravel()
+
+    def _get_a_coefficients_df(self):
+        a = self._get_a_matrix()
+        self.a_coefficients_df = pd.DataFrame(a, index=self._get_observations_index(),
+                                              columns=self._get_unknowns_index())
+        return self.a_coefficients_df
 
     def get_p_coefficients_df(self):
-        df = pd.DataFrame()
-        for vector in self.gnss_vectors:
-            df = pd.concat([df, vector.get_p_df()])
-        self.p_coefficients_df = df.fillna(0)
-        return df.fillna(0)
+        index = self._get_observations_index()
+        self.p_coefficients_df = pd.DataFrame(self._get_p_matrix(), index=index, columns=index)
+        return self.p_coefficients_df
 
     def _get_l_ds(self):
-        ds = pd.Series()
+        self.l_ds = pd.Series(self._get_l_vector(), index=self._get_observations_index())
+        return self.l_ds
+
+    def _get_base_coordinates(self):
+        """
+        Исходные координаты всех точек сети (берутся из первого вектора, содержащего точку).
+
+        :return: словарь {имя точки: (x, y, z)}
+        """
+        base_coord = {}
         for vector in self.gnss_vectors:
-            ds = pd.concat([ds, vector.get_l_ds()])
-        self.l_ds = ds
-        return ds
+            for point_name, coordinates in ((vector.point_0.name, (vector.x_0, vector.y_0, vector.z_0)),
+                                            (vector.point_1.name, (vector.x_1, vector.y_1, vector.z_1))):
+                if point_name not in base_coord:
+                    base_coord[point_name] = coordinates
+        return base_coord
 
     def _get_base_coord_ds(self):
-        ds = pd.Series()
-        for vector in self.gnss_vectors:
-            ds = ds.combine_first(vector.get_base_coord_ds())
-        return ds
+        return pd.Series({f"{point_name}_{axis}": value
+                          for point_name, coordinates in self._get_base_coordinates().items()
+                          for axis, value in zip(("x", "y", "z"), coordinates)})
 
     def get_final_coordinates(self):
-        base_coord = self._get_base_coord_ds()
-        dt = self._get_dt_ds()
-        coord_ds = base_coord.add(dt, fill_value=0)
+        base_coord = self._get_base_coordinates()
+        solution = self._solve()
+        unknowns_idx = solution["unknowns_idx"]
+        dt = solution["dt"].tolist()
+        coord_dict = {point_name: coordinates if point_name not in unknowns_idx else
+                      tuple(value + dt[unknowns_idx[point_name] + axis] for axis, value in enumerate(coordinates))
+                      for point_name, coordinates in base_coord.items()}
         points_dict = {}
         for vector in self.gnss_vectors:
             for point in vector.point_0, vector.point_1:
                 if point.is_rover():
-                    point.x = coord_ds[f"{point.name}_x"]
-                    point.y = coord_ds[f"{point.name}_y"]
-                    point.z = coord_ds[f"{point.name}_z"]
-                points_dict[point.name] = {"X": point.x,
-                                           "Y": point.y,
-                                           "Z": point.z}
-        return pd.DataFrame(points_dict)
+                    point.x, point.y, point.z = coord_dict[point.name]
+                points_dict[point.name] = (point.x, point.y, point.z)
+        return self._points_df(points_dict, ("X", "Y", "Z"))
+
+    @staticmethod
+    def _points_df(points_dict, index):
+        """
+        Таблица со столбцами-точками и строками index из словаря {имя точки: значения}.
+        """
+        if not points_dict:
+            return pd.DataFrame()
+        return pd.DataFrame(np.array(list(points_dict.values()), dtype=np.float64).T,
+                            index=list(index), columns=list(points_dict))
+
+    def _solve(self):
+        """
+        Уравнивание сети: A, P и l собираются один раз, матрица нормальных уравнений N
+        раскладывается один раз, и это разложение используется для поправок к координатам,
+        поправок к измерениям, mu и ковариационной матрицы.
+        Плотная N раскладывается по Холецкому (N = L * L.T). Для больших сетей A собирается
+        в формате CSR, а N раскладывается разреженным LU с упорядочением, уменьшающим заполнение.
+        Результат кешируется до изменения списка векторов.
+
+        :return: словарь с промежуточными и итоговыми результатами уравнивания
+        """
+        solution_key = tuple(id(vector) for vector in self.gnss_vectors)
+        if self._solution is not None and self._solution_key == solution_key:
+            return self._solution
+        is_sparse = self._is_sparse_backend() and self.observations_covariance is None and not self.sequential
+        a = self._get_a_matrix(as_sparse=is_sparse)
+        l = self._get_l_vector()
+        if self.observations_covariance is None:
+            # Диагональная P: A.T * P * A и v.T * P * v через масштабирование строк
+            w = self._get_weights()
+            p = None
+            atp = (sparse.diags(w) @ a).T if is_sparse else (a * w[:, None]).T
+        else:
+            w = None
+            p = self._get_p_matrix()
+            atp = a.T @ p
+        n = atp @ a
+        atpl = atp @ l
+        solution = self._init_solution(a, w, p, l, n, atpl)
+        if is_sparse:
+            solution["lu"] = sparse_linalg.splu(n.tocsc(), permc_spec="MMD_AT_PLUS_A",
+                                                diag_pivot_thresh=0, options={"SymmetricMode": True})
+        else:
+            solution["chol"] = np.linalg.cholesky(n)
+            if self.sequential and p is None:
+                # Для последовательного режима хранится N^-1, которая обновляется при изменении сети
+                solution["n_inv"] = self._cho_solve(solution["chol"], np.eye(n.shape[0]))
+                solution["ltpl"] = l @ (w * l)
+        dt = -self._solve_normal_equations(solution, atpl)
+        v = a @ dt + l
+        solution["dt"] = dt
+        solution["v"] = v
+        solution["mu"] = v @ (w * v) if p is None else v.T @ p @ v
+        self._solution = solution
+        self._solution_key = solution_key
+        return solution
+
+    def _init_solution(self, a, w, p, l, n, atpl):
+        return {"a": a,
+                "w": w,
+                "p": p,
+                "l": l,
+                "n": n,
+                "atpl": atpl,
+                "chol": None,
+                "lu": None,
+                "n_inv": None,
+                "q": None,
+                "q_blocks": None,
+                "unknowns_idx": dict(self.unknowns_idx),
+                "unknowns_index": self._get_unknowns_index(),
+                "observations_index": self._get_observations_index()}
+
+    @classmethod
+    def calculate_networks(cls, networks):
+        """
+        Уравнивает сразу много сетей (например, сети всех студентов группы).
+        Сети с одинаковыми размерами A группируются, и каждая группа решается одним
+        пакетным вызовом NumPy (разложение Холецкого стопки матриц), а блоки ковариационной
+        матрицы считаются по разложению только при расчете СКО точек.
+        Сети с коррелированными измерениями, разреженным или последовательным решением
+        уравниваются по отдельности.
+
+        :param networks: Объекты EqualisedNetwork или объекты с атрибутом eq_net (VariantGenerator)
+        :return: список пар (result_df, mu) в порядке networks; (None, None) для сетей, которые не уравниваются
+        """
+        networks = [network if isinstance(network, cls) else network.eq_net for network in networks]
+        results = [None] * len(networks)
+        groups = {}
+        for idx, network in enumerate(networks):
+            if (network.observations_covariance is None and not network.sequential
+                    and not network._is_sparse_backend()):
+                a = network._get_a_matrix()
+                groups.setdefault(a.shape, []).append((idx, a, network._get_weights(), network._get_l_vector()))
+            else:
+                results[idx] = cls._calculate_network(network)
+        for group in groups.values():
+            idx_lst = [idx for idx, _, _, _ in group]
+            a, w, l = (np.stack([item[pos] for item in group]) for pos in (1, 2, 3))
+            atp = (a * w[:, :, None]).transpose(0, 2, 1)
+            n = atp @ a
+            atpl = (atp @ l[:, :, None])[:, :, 0]
+            try:
+                chol = np.linalg.cholesky(n)
+            except np.linalg.LinAlgError:
+                for idx in idx_lst:
+                    results[idx] = cls._calculate_network(networks[idx])
+                continue
+            dt = -np.stack([cls._cho_solve(chol_item, atpl_item) for chol_item, atpl_item in zip(chol, atpl)])
+            v = (a @ dt[:, :, None])[:, :, 0] + l
+            mu = (w * v ** 2).sum(axis=1)
+            for pos, idx in enumerate(idx_lst):
+                network = networks[idx]
+                solution = network._init_solution(a[pos], w[pos], None, l[pos], n[pos], atpl[pos])
+                solution.update({"chol": chol[pos], "dt": dt[pos], "v": v[pos], "mu": float(mu[pos])})
+                network._solution = solution
+                network._solution_key = tuple(id(vector) for vector in network.gnss_vectors)
+                results[idx] = cls._calculate_network(network)
+        return results
+
+    @staticmethod
+    def _calculate_network(network):
+        try:
+            network.calculate()
+        except np.linalg.LinAlgError:
+            network.mse_df = None
+            network.coord_df = None
+            network.result_df = None
+            return None, None
+        return network.result_df, network.get_mu()
+
+    @staticmethod
+    def _solve_triangular(chol, b):
+        """
+        Решает L * x = b для нижней треугольной L (без scipy - общим np.linalg.solve).
+        """
+        if scipy_linalg is not None:
+            return scipy_linalg.solve_triangular(chol, b, lower=True, check_finite=False)
+        return np.linalg.solve(chol, b)
+
+    @staticmethod
+    def _cho_solve(chol, b):
+        """
+        Решает N * x = b по разложению Холецкого N = L * L.T (без scipy - двумя вызовами np.linalg.solve).
+        """
+        if scipy_linalg is not None:
+            return scipy_linalg.cho_solve((chol, True), b, check_finite=False)
+        return np.linalg.solve(chol.T, np.linalg.solve(chol, b))
+
+    @classmethod
+    def _solve_normal_equations(cls, solution, b):
+        """
+        Решает N * x = b по готовому разложению N.
+        """
+        if solution["lu"] is not None:
+            return solution["lu"].solve(b)
+        if solution["n_inv"] is not None:
+            return solution["n_inv"] @ b
+        return cls._cho_solve(solution["chol"], b)
+
+    def _update_sequential_solution(self, gnss_vector, sign):
+        """
+        Обновляет решение после добавления (sign=1) или удаления (sign=-1) вектора
+        без повторного разложения N.
+        Если вектор не добавляет новых точек, N^-1 и поправки обновляются формулой
+        Шермана-Моррисона-Вудбери (обновление ранга 3). Если вектор добавляет одну новую точку,
+        она определяется только этим вектором, и N^-1 дополняется блоками для ее координат.
+        В остальных случаях (две новые точки, точка потеряла все измерения, вырожденность)
+        решение сбрасывается и при следующем расчете выполняется полное уравнивание.
+        """
+        solution = self._solution
+        self._solution = None
+        if solution is None or solution["n_inv"] is None:
+            return
+        old_idx = solution["unknowns_idx"]
+        new_idx = self._init_unknowns()
+        w = self._get_weights([gnss_vector])
+        l = self._get_l_vector([gnss_vector])
+        try:
+            if sign > 0:
+                new_points = [point_name for point_name in new_idx if point_name not in old_idx]
+                a = self._get_vector_rows(gnss_vector, new_idx)
+                if not new_points:
+                    self._woodbury_update(solution, a, w, l, sign)
+                elif len(new_points) == 1:
+                    self._border_update(solution, a, w, l)
+                else:
+                    return
+            else:
+                if set(new_idx) != set(old_idx):
+                    return
+                a = self._get_vector_rows(gnss_vector, old_idx)
+                self._woodbury_update(solution, a, w, l, sign)
+                if list(new_idx) != list(old_idx):
+                    self._permute_solution(solution, old_idx, new_idx)
+        except np.linalg.LinAlgError:
+            return
+        solution.update({"a": None, "l": None, "v": None, "w": None, "chol": None, "q": None, "q_blocks": None,
+                         "unknowns_idx": dict(new_idx),
+                         "unknowns_index": self._get_unknowns_index(),
+                         "observations_index": self._get_observations_index()})
+        self._solution = solution
+        self._solution_key = tuple(id(vector) for vector in self.gnss_vectors)
+
+    def _get_vector_rows(self, gnss_vector, unknowns_idx):
+        """
+        Три строки матрицы A для одного вектора при заданной нумерации столбцов.
+        """
+        rows, columns, values = self._get_a_triplets([gnss_vector], unknowns_idx)
+        a = np.zeros((3, 3 * len(unknowns_idx)))
+        a[rows, columns] = values
+        return a
+
+    @staticmethod
+    def _woodbury_update(solution, a, w, l, sign):
+        n_inv, dt = solution["n_inv"], solution["dt"]
+        qa = n_inv @ a.T
+        s = np.diag(1 / (sign * w)) + a @ qa
+        r = a @ dt + l
+        k = np.linalg.solve(s, qa.T).T
+        solution["dt"] = dt - k @ r
+        solution["n_inv"] = n_inv - k @ qa.T
+        solution["mu"] = solution["mu"] + r @ np.linalg.solve(s, r)
+        atw = (a * w[:, None]).T
+        solution["n"] = solution["n"] + sign * (atw @ a)
+        solution["atpl"] = solution["atpl"] + sign * (atw @ l)
+        solution["ltpl"] = solution["ltpl"] + sign * (l @ (w * l))
+
+    @staticmethod
+    def _border_update(solution, a, w, l):
+        old_count = solution["n"].shape[0]
+        a_1, a_2 = a[:, :old_count], a[:, old_count:]
+        a_2_inv = np.linalg.inv(a_2)
+        q_11 = solution["n_inv"]
+        q_21 = -a_2_inv @ a_1 @ q_11
+        q_22 = a_2_inv @ (np.diag(1 / w) + a_1 @ q_11 @ a_1.T) @ a_2_inv.T
+        solution["n_inv"] = np.block([[q_11, q_21.T], [q_21, q_22]])
+        solution["dt"] = np.concatenate((solution["dt"], -a_2_inv @ (l + a_1 @ solution["dt"])))
+        atw = (a * w[:, None]).T
+        solution["n"] = np.pad(solution["n"], (0, 3)) + atw @ a
+        solution["atpl"] = np.pad(solution["atpl"], (0, 3)) + atw @ l
+        solution["ltpl"] = solution["ltpl"] + l @ (w * l)
+
+    @staticmethod
+    def _permute_solution(solution, old_idx, new_idx):
+        order = np.array([old_idx[point_name] + axis for point_name in new_idx for axis in range(3)], dtype=np.intp)
+        for key in "n", "n_inv":
+            solution[key] = solution[key][np.ix_(order, order)]
+        for key in "atpl", "dt":
+            solution[key] = solution[key][order]
+
+    def _refresh_sequential_results(self):
+        """
+        Пересчитывает результаты после изменения сети в последовательном режиме.
+        Пока сеть не определяется (например, строится вектор за вектором), результаты равны None.
+        """
+        try:
+            self.calculate()
+        except np.linalg.LinAlgError:
+            self.mse_df = None
+            self.coord_df = None
+            self.result_df = None
+
+    def _get_q_matrix(self):
+        """
+        Ковариационная матрица уравненных координат mu * N^-1.
+        """
+        solution = self._solve()
+        if solution["q"] is None:
+            if solution["n_inv"] is not None:
+                q = solution["n_inv"]
+            else:
+                q = self._solve_normal_equations(solution, np.eye(solution["n"].shape[0]))
+            solution["q"] = solution["mu"] * q
+        return solution["q"]
 
     def _get_dt_ds(self):
-        a = self._get_a_coefficients_df()
-        point_idx = a.columns
-        a = a.to_numpy()
-        p = self.get_p_coefficients_df().to_numpy()
-        l = self._get_l_ds().to_numpy()
-        n = a.T @ p @ a
-        atpl = a.T @ p @ l
-        q = np.linalg.inv(n)
-        dt = -q @ atpl
-        dt_ds = pd.Series(dt.flatten(), index=point_idx)
-        return dt_ds
+        solution = self._solve()
+        return pd.Series(solution["dt"], index=solution["unknowns_index"])
 
     def get_v_ds(self):
-        a = self._get_a_coefficients_df().to_numpy()
-        dt = self._get_dt_ds().to_numpy()
-        l = self._get_l_ds().to_numpy()
-        v = a @ dt + l
-        ds = pd.Series(v, index=self._get_a_coefficients_df().index)
-        return ds
+        solution = self._solve()
+        if solution["v"] is None:
+            solution["v"] = self._get_a_matrix() @ solution["dt"] + self._get_l_vector()
+        return pd.Series(solution["v"], index=solution["observations_index"])
 
     def get_mu(self):
-        v = self.get_v_ds().to_numpy()
-        p = self.get_p_coefficients_df().to_numpy()
-        mu = v.T @ p @ v
-        return mu
+        return self._solve()["mu"]
+
+    def get_redundancy(self):
+        """
+        Число избыточных измерений: измерения минус определяемые координаты.
+        """
+        return 3 * len(self.gnss_vectors) - len(self._solve()["unknowns_index"])
 
     def calculate(self):
         self.mse_df = self._calk_points_mse_ellipses()
         self.coord_df =  self.get_final_coordinates()
         self.result_df = pd.concat([self.coord_df, self.mse_df])
 
+    def _get_q_blocks(self):
+        """
+        Диагональные блоки 3x3 ковариационной матрицы mu * N^-1 для каждой определяемой точки.
+        Вычисляются только нужные блоки по уже готовому разложению N, пачками по Q_BLOCKS_CHUNK точек:
+        для плотной N - столбцы L^-1 треугольным решением (N^-1 = L^-T * L^-1; столбцы L^-1,
+        начиная с j-го, зависят только от L[j:, j:]), для разреженной - решением N * X = E
+        для столбцов точек пачки.
+
+        :return: массив (число определяемых точек, 3, 3)
+        """
+        solution = self._solve()
+        if solution["q_blocks"] is None:
+            unknowns_count = len(solution["unknowns_index"])
+            points_count = unknowns_count // 3
+            if solution["n_inv"] is not None:
+                idx = np.arange(points_count)
+                blocks = solution["n_inv"].reshape(points_count, 3, points_count, 3)[idx, :, idx, :]
+            else:
+                blocks = np.empty((points_count, 3, 3))
+                for start in range(0, points_count, self.Q_BLOCKS_CHUNK):
+                    end = min(points_count, start + self.Q_BLOCKS_CHUNK)
+                    columns = np.arange(3 * (end - start))
+                    idx = np.arange(end - start)
+                    if solution["lu"] is not None:
+                        e = np.zeros((unknowns_count, len(columns)))
+                        e[3 * start + columns, columns] = 1
+                        x = solution["lu"].solve(e)[3 * start:3 * end].reshape(len(idx), 3, len(idx), 3)
+                        blocks[start:end] = x[idx, :, idx, :]
+                    else:
+                        chol = solution["chol"][3 * start:, 3 * start:]
+                        e = np.zeros((len(chol), len(columns)))
+                        e[columns, columns] = 1
+                        x = self._solve_triangular(chol, e).reshape(len(chol), len(idx), 3)
+                        blocks[start:end] = np.einsum("kri,krj->rij", x, x)
+            solution["q_blocks"] = solution["mu"] * blocks
+        return solution["q_blocks"]
+
     def _calk_points_mse_ellipses(self):
+        """
+        СКО и параметры эллипсов ошибок всех определяемых точек, рассчитанные одним векторным проходом.
+        """
+        blocks = self._get_q_blocks()
+        q_xx, q_xy, q_yx, q_yy, q_zz = (blocks[:, 0, 0], blocks[:, 0, 1], blocks[:, 1, 0],
+                                        blocks[:, 1, 1], blocks[:, 2, 2])
+        theta = np.degrees(np.arctan2(2 * q_xy, q_xy - q_yy) / 2)
+        theta = np.where(theta < 0, theta + 360, theta)
+        q = ((q_xx - q_yy) ** 2 + 4 * q_yx ** 2) ** 0.5
+        points_mse = {"M": (q_xx + q_yy) ** 0.5,
+                      "m_x": q_xx ** 0.5,
+                      "m_y": q_yy ** 0.5,
+                      "m_z": q_zz ** 0.5,
+                      "theta": theta,
+                      "a": ((q_xx + q_yy + q) / 2) ** 0.5,
+                      "b": (np.maximum(q_xx + q_yy - q, 0) / 2) ** 0.5}
+        points_mse = {key: value.tolist() for key, value in points_mse.items()}
+
+        unknowns_idx = self._solve()["unknowns_idx"]
         mse_dict = {}
-        a = self._get_a_coefficients_df()
-        point_idx = a.columns
-        a = a.to_numpy()
-        p = self.get_p_coefficients_df().to_numpy()
-        n = a.T @ p @ a
-        mu = self.get_mu()
-
-        q = mu * np.linalg.inv(n)
-        q_df = pd.DataFrame(q, columns=point_idx, index=point_idx)
         for vector in self.gnss_vectors:
             for point in vector.point_0, vector.point_1:
                 if point.is_rover():
-                    p_np = q_df[[f"{point.name}_x",
-                                 f"{point.name}_y"]].loc[[f"{point.name}_x",
-                                                          f"{point.name}_y"]].to_numpy()
-                    theta = math.degrees(math.atan2((2 * p_np[0][1]), (p_np[0][1] - p_np[1][1])) / 2)
-                    theta = theta + 360 if theta < 0 else theta
-                    q = ((p_np[0][0] - p_np[1][1]) ** 2 + 4 * p_np[1][0] ** 2) ** 0.5
-                    a = ((p_np[0][0] + p_np[1][1] + q) / 2) ** 0.5
-                    b = ((p_np[0][0] + p_np[1][1] - q) / 2) ** 0.5
-                    try:
-                        m_z = q_df.loc[f"{point.name}_z"][f"{point.name}_z"] ** 0.5
-                    except KeyError:
-                        m_z = None
-                    point.mse = {"M": (p_np[0][0] + p_np[1][1]) ** 0.5,
-                                      "m_x": p_np[0][0] ** 0.5,
-                                      "m_y": p_np[1][1] ** 0.5,
-                                      "m_z": m_z,
-                                      "theta": theta,
-                                      "a": a,
-                                      "b": b}
+                    idx = unknowns_idx[point.name] // 3
+                    point.mse = {key: value[idx] for key, value in points_mse.items()}
                 else:
                     point.mse = {"M": 0, "m_x": 0, "m_y": 0,
                                  "m_z": 0, "theta": 0, "a": 0, "b": 0}
-                mse_dict[point.name] = point.mse
-        return pd.DataFrame(mse_dict)
+                mse_dict[point.name] = list(point.mse.values())
+        return self._points_df(mse_dict, points_mse)
 
     def plot_eq_net(self, fig=None, ax=None, show=True):
         if fig is None and ax is None:
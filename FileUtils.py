@@ -0,0 +1,30 @@
+import os
+import uuid
+
+
+def write_file_atomic(path, content, encoding="UTF-8"):
+    """
+    Атомарно записывает текстовый файл: содержимое пишется одним буферизованным дескриптором
+    во временный файл в том же каталоге, который затем переименовывается в path (os.replace).
+    Читатели видят либо прежний файл, либо новый целиком; повторная запись заменяет файл, а не дописывает его.
+
+    :param path: Путь к файлу
+    :param content: Строка, байты или итерируемый объект строк
+    :param encoding: Кодировка файла (для текстового содержимого)
+    """
+    tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+    try:
+        if isinstance(content, bytes):
+            file = open(tmp_path, "xb")
+        else:
+            file = open(tmp_path, "x", encoding=encoding)
+        with file:
+            if isinstance(content, (str, bytes)):
+                file.write(content)
+            else:
+                file.writelines(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
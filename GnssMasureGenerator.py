@@ -1,8 +1,10 @@
 import datetime
 import random
-from copy import deepcopy
+
+import numpy as np
 
 from CONFIG import D_TIME, NUM_OF_MEASURES, GNSS_DISPLACEMENT, PASS_POINT_PROB, CROP_PERC, MSE_Z_SCALER
+from GnssMeasureData import GnssMeasureData, datetime_to_epoch
 from GnssNet import GnssNet
 
 
@@ -10,7 +12,28 @@ class GnssMeasureGenerator:
 
     def __init__(self, gnss_net: GnssNet, d_time=D_TIME, num_of_measure=NUM_OF_MEASURES,
                  gnss_displacement=GNSS_DISPLACEMENT, month=None, day=None, pass_point_prob=PASS_POINT_PROB,
-                 random_seed=None):
+                 random_seed=None, rng=None):
+        """
+        Генератор измерений для всех точек сети.
+
+        Все измерения формируются пакетно массивами (точки x эпохи x 3).
+        Если rng не задан, случайные числа берутся из глобального модуля random
+        в том же порядке, что и раньше, поэтому варианты студентов воспроизводятся
+        без изменений; объект random.Random дает тот же порядок чисел без глобального состояния.
+        Если передан np.random.Generator, используется быстрый генератор NumPy
+        (шум - нормальное распределение вместо суммы 12 равномерных): общие для серии
+        величины берутся из него, а измерения каждой точки - из собственного подпотока.
+
+        :param gnss_net: Объект GnssNet
+        :param d_time: Интервал между эпохами, с
+        :param num_of_measure: Количество эпох
+        :param gnss_displacement: Размах общего для всех точек смещения, м
+        :param month: Месяц начала измерений
+        :param day: День начала измерений
+        :param pass_point_prob: Вероятность пропуска эпохи
+        :param random_seed: Начальное значение для модуля random (используется, если rng не задан)
+        :param rng: Собственный генератор: random.Random или np.random.Generator
+        """
         self.random_seed = random_seed
         self.gnss_net = gnss_net
         self.d_time = datetime.timedelta(seconds=d_time)
@@ -19,87 +42,154 @@ class GnssMeasureGenerator:
         self.month = month
         self.day = day
         self.pass_point_prob = pass_point_prob
-        if random_seed is not None:
+        self.rng = rng
+        self._is_numpy_rng = isinstance(rng, np.random.Generator)
+        # Источник чисел режима прежнего порядка: собственный random.Random или глобальный модуль random
+        self._random_source = rng if isinstance(rng, random.Random) else random
+        self._point_rngs = None
+        if random_seed is not None and rng is None:
             random.seed(random_seed)
         self.start_time, self.end_time = self.init_times_border()
+        self.epochs = self.get_epochs()
         self.total_displacement = self.get_total_displacement()
         self.init_gnss_point_measure_data()
 
+    def _get_point_rngs(self):
+        """
+        Подпотоки генератора NumPy для каждой точки сети (создаются один раз).
+        """
+        if self._point_rngs is None:
+            self._point_rngs = self.rng.spawn(len(self.gnss_net.points))
+        return self._point_rngs
+
+    def _draw(self, draw, shape, per_point):
+        """
+        Массив заданной формы из генератора NumPy. Если per_point, первая ось - точки сети
+        и строка каждой точки берется из ее подпотока.
+        """
+        if not per_point:
+            return draw(self.rng, shape)
+        return np.array([draw(point_rng, tuple(shape[1:])) for point_rng in self._get_point_rngs()]).reshape(shape)
+
+    def _random(self, shape, per_point=False):
+        """
+        Массив равномерно распределенных на [0, 1) чисел заданной формы.
+        В режиме модуля random числа заполняют массив в порядке C (последняя ось - самая быстрая).
+        """
+        if self._is_numpy_rng:
+            return self._draw(lambda rng, size: rng.random(size), shape, per_point)
+        count = int(np.prod(shape))
+        source = self._random_source
+        return np.fromiter((source.random() for _ in range(count)), dtype=np.float64, count=count).reshape(shape)
+
+    def _randint(self, a, b, size=None, per_point=False):
+        """
+        Случайные целые числа на отрезке [a, b].
+        """
+        if self._is_numpy_rng:
+            if size is None:
+                return int(self.rng.integers(a, b + 1))
+            return self._draw(lambda rng, shape: rng.integers(a, b + 1, size=shape), size, per_point)
+        source = self._random_source
+        if size is None:
+            return source.randint(a, b)
+        count = int(np.prod(size))
+        return np.array([source.randint(a, b) for _ in range(count)], dtype=np.int64).reshape(size)
+
+    def _norm(self, shape, count=12, per_point=False):
+        """
+        Массив нормально распределенных чисел заданной формы.
+        В режиме модуля random - как и раньше, sum() count равномерных чисел минус count / 2
+        для каждого значения по порядку: встроенный sum() (Python 3.12+) суммирует с компенсацией,
+        и поэлементное сложение массивов дало бы другие последние знаки. Промежуточный массив
+        (..., count) не создается.
+        """
+        if self._is_numpy_rng:
+            return self._draw(lambda rng, size: rng.standard_normal(size), shape, per_point)
+        size = int(np.prod(shape))
+        random_ = self._random_source.random
+        norm_values = (sum([random_() for _ in range(count)]) - count / 2 for _ in range(size))
+        return np.fromiter(norm_values, dtype=np.float64, count=size).reshape(shape)
+
     def init_times_border(self):
         current_time = datetime.datetime.now()
 
         if self.month is None:
-            self.month = random.randint(1, current_time.month - 1)
+            self.month = self._randint(1, current_time.month - 1)
         if self.day is None:
-            self.day = random.randint(1, 28)
+            self.day = self._randint(1, 28)
 
         start_time = datetime.datetime(current_time.year, self.month, self.day,
-                                       random.randint(8, 20),
-                                       random.randint(0, 59),
-                                       random.randint(0, 59))
+                                       self._randint(8, 20),
+                                       self._randint(0, 59),
+                                       self._randint(0, 59))
         end_time = start_time + self.num_of_measure * self.d_time
         return start_time, end_time
 
+    def get_epochs(self):
+        """
+        Массив эпох измерений int64 (микросекунды от 1970-01-01).
+        """
+        d_time = self.d_time // datetime.timedelta(microseconds=1)
+        return datetime_to_epoch(self.start_time) + d_time * np.arange(self.num_of_measure, dtype=np.int64)
+
     def get_total_displacement(self):
-        def get_disp():
-            return {"x": round(random.random() * self.gnss_displacement - self.gnss_displacement / 2, 3),
-                    "y": round(random.random() * self.gnss_displacement - self.gnss_displacement / 2, 3),
-                    "z": round(random.random() * self.gnss_displacement - self.gnss_displacement / 2, 3),
-                    }
-
-        total_displacement = {
-            self.start_time + i * self.d_time: get_disp() for i in range(self.num_of_measure)
-        }
-        return total_displacement
-
-    def init_custom_point_error(self):
+        """
+        Общее для всех точек смещение в каждую эпоху, массив (эпохи, 3).
+        """
+        displacement = self._random((self.num_of_measure, 3)) * self.gnss_displacement - self.gnss_displacement / 2
+        if self._is_numpy_rng:
+            return np.round(displacement, 3)
+        return np.array([round(value, 3) for value in displacement.ravel().tolist()],
+                        dtype=np.float64).reshape(displacement.shape)
+
+    def init_custom_point_error(self, measures):
+        """
+        Добавляет к измерениям всех точек случайные ошибки, зависящие от удаленности точки.
+
+        :param measures: массив измерений (точки, эпохи, 3), изменяется на месте
+        """
         farthest_point = self.gnss_net.find_farthest_point()
 
-        def get_norm_value(count=12):
-            norm_val = sum([random.random() for _ in range(count)]) - count / 2
-            return norm_val
+        coordinates = self.gnss_net.coordinates
+        distance = ((coordinates[:, 0] - farthest_point.x) ** 2 + (coordinates[:, 1] - farthest_point.y) ** 2) ** 0.5
+        vector_mse = (self.gnss_net.accuracy["a"] + self.gnss_net.accuracy["b"] * distance / 1000) / 1000
 
-        for point in self.gnss_net:
-            distance = ((point.x - farthest_point.x) ** 2 + (point.y - farthest_point.y) ** 2) ** 0.5
-            vector_mse = (self.gnss_net.accuracy["a"] + self.gnss_net.accuracy["b"] * distance / 1000) / 1000
-            for time, measure in point:
-                measure["x"] += get_norm_value() * vector_mse
-                measure["y"] += get_norm_value() * vector_mse
-                measure["z"] += get_norm_value() * vector_mse * MSE_Z_SCALER
+        errors = self._norm(measures.shape, per_point=True) * vector_mse[:, None, None]
+        errors[..., 2] *= MSE_Z_SCALER
+        measures += errors
 
     def init_gross_errors(self):
         pass
 
     def pass_the_points(self):
-        def is_a_pass_a_point():
-            rv = random.random()
-            pass_flag = True if rv <= self.pass_point_prob else False
-            return pass_flag
-
-        for point in self.gnss_net:
-            measure_data = {}
-            for time, measure in point.measure_data.items():
-                if is_a_pass_a_point():
-                    continue
-                measure_data[time] = measure
-            point.measure_data = measure_data
+        """
+        Маска (точки, эпохи) сохраняемых эпох: каждая эпоха пропускается с вероятностью pass_point_prob.
+        """
+        return self._random((len(self.gnss_net.points), self.num_of_measure), per_point=True) > self.pass_point_prob
 
     def init_gnss_point_measure_data(self):
-        for point in self.gnss_net:
-            point.measure_data = deepcopy(self.total_displacement)
-            for time, measure in point:
-                measure["x"] += point.x
-                measure["y"] += point.y
-                measure["z"] += point.z
-        self.init_custom_point_error()
-        self.pass_the_points()
-        self.crop_measure_from_time()
+        points = self.gnss_net.points
+        measures = self.total_displacement[None, :, :] + self.gnss_net.coordinates[:, None, :]
+        self.init_custom_point_error(measures)
+        mask = self.pass_the_points()
+        mask &= self.crop_measure_from_time()
+        for point, point_measures, point_mask in zip(points, measures, mask):
+            point.measure_data = GnssMeasureData(self.epochs[point_mask],
+                                                 point_measures[point_mask, 0],
+                                                 point_measures[point_mask, 1],
+                                                 point_measures[point_mask, 2])
 
     def crop_measure_from_time(self, crop_perc=CROP_PERC):
-        for point in self.gnss_net:
-            start_time = self.start_time + random.randint(0, int(crop_perc * self.num_of_measure)) * self.d_time
-            end_time = self.end_time - random.randint(0, int(crop_perc * self.num_of_measure)) * self.d_time
-            point.measure_data = {k: v for k, v in point.measure_data.items() if start_time <= k <= end_time}
+        """
+        Маска (точки, эпохи) эпох, попадающих в случайно обрезанное окно измерений каждой точки.
+        """
+        max_crop = int(crop_perc * self.num_of_measure)
+        crops = self._randint(0, max_crop, size=(len(self.gnss_net.points), 2), per_point=True)
+        d_time = self.d_time // datetime.timedelta(microseconds=1)
+        start_epochs = datetime_to_epoch(self.start_time) + crops[:, 0] * d_time
+        end_epochs = datetime_to_epoch(self.end_time) - crops[:, 1] * d_time
+        return (start_epochs[:, None] <= self.epochs[None, :]) & (self.epochs[None, :] <= end_epochs[:, None])
 
 
 if __name__ == "__main__":
@@ -117,7 +207,8 @@ if __name__ == "__main__":
     # for point in gnss_net:
     #     print(point)
     #
+    # gmg = GnssMeasureGenerator(gnss_net, rng=np.random.default_rng(42), num_of_measure=100)
     for point in gnss_net:
         for measure in point:
             print(measure)
-        print("#" * 100)
\ No newline at end of file
+        print("#" * 100)
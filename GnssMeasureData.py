@@ -0,0 +1,224 @@
+import datetime
+
+import numpy as np
+
+
+COORDINATES = ("x", "y", "z")
+
+EPOCH_UNIT = "datetime64[us]"
+
+
+def datetime_to_epoch(time):
+    """
+    Переводит момент времени в целочисленную эпоху (микросекунды от 1970-01-01).
+
+    :param time: datetime.datetime, np.datetime64 или int
+    :return: int
+    """
+    if isinstance(time, (int, np.integer)):
+        return int(time)
+    return int(np.datetime64(time, "us").astype(np.int64))
+
+
+def datetimes_to_epochs(times):
+    """
+    Векторный вариант datetime_to_epoch.
+
+    :param times: последовательность моментов времени
+    :return: np.ndarray int64
+    """
+    return np.asarray(list(times), dtype=EPOCH_UNIT).astype(np.int64)
+
+
+def epochs_to_datetimes(epochs):
+    """
+    Переводит массив эпох обратно в объекты datetime.datetime.
+
+    :param epochs: np.ndarray int64
+    :return: np.ndarray объектов datetime.datetime
+    """
+    return np.asarray(epochs, dtype=np.int64).astype(EPOCH_UNIT).astype(object)
+
+
+class GnssEpochView:
+    """
+    Легковесное представление одной эпохи хранилища GnssMeasureData.
+    Ведет себя как словарь {"x": ..., "y": ..., "z": ...}, а запись по ключу
+    изменяет данные непосредственно в массивах хранилища.
+    """
+    __slots__ = ("_data", "_idx")
+
+    def __init__(self, data, idx):
+        self._data = data
+        self._idx = idx
+
+    def __getitem__(self, key):
+        if key not in COORDINATES:
+            raise KeyError(key)
+        return float(getattr(self._data, key)[self._idx])
+
+    def __setitem__(self, key, value):
+        if key not in COORDINATES:
+            raise KeyError(key)
+        getattr(self._data, key)[self._idx] = value
+
+    def __iter__(self):
+        return iter(COORDINATES)
+
+    def __len__(self):
+        return len(COORDINATES)
+
+    def __eq__(self, other):
+        try:
+            return all(self[key] == other[key] for key in COORDINATES)
+        except (KeyError, TypeError):
+            return False
+
+    def keys(self):
+        return COORDINATES
+
+    def values(self):
+        return [self[key] for key in COORDINATES]
+
+    def items(self):
+        return [(key, self[key]) for key in COORDINATES]
+
+    def get(self, key, default=None):
+        return self[key] if key in COORDINATES else default
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class GnssMeasureData:
+
+    def __init__(self, epochs=None, x=None, y=None, z=None):
+        """
+        Колоночное хранилище измерений точки: отсортированный массив эпох int64
+        (микросекунды от 1970-01-01) и непрерывные массивы float64 координат x, y, z.
+        Поддерживает интерфейс словаря {datetime: {"x": ..., "y": ..., "z": ...}}.
+
+        :param epochs: массив эпох int64
+        :param x: массив координат x
+        :param y: массив координат y
+        :param z: массив координат z
+        """
+        if epochs is None:
+            epochs = np.empty(0, dtype=np.int64)
+        epochs = np.asarray(epochs, dtype=np.int64)
+        x, y, z = (np.zeros(len(epochs)) if c is None else np.asarray(c, dtype=np.float64) for c in (x, y, z))
+        if not len(epochs) == len(x) == len(y) == len(z):
+            raise ValueError("Массивы эпох и координат должны быть одной длины")
+        if len(epochs) > 1 and np.any(epochs[1:] <= epochs[:-1]):
+            epochs, order = np.unique(epochs, return_index=True)
+            x, y, z = x[order], y[order], z[order]
+        self.epochs = np.ascontiguousarray(epochs)
+        self.x = np.ascontiguousarray(x)
+        self.y = np.ascontiguousarray(y)
+        self.z = np.ascontiguousarray(z)
+
+    @classmethod
+    def from_dict(cls, measure_dict):
+        """
+        Создает хранилище из словаря {datetime: {"x": ..., "y": ..., "z": ...}}.
+
+        :param measure_dict: словарь измерений
+        :return: GnssMeasureData
+        """
+        if isinstance(measure_dict, GnssMeasureData):
+            return measure_dict
+        measures = list(measure_dict.values())
+        return cls(epochs=datetimes_to_epochs(measure_dict.keys()),
+                   x=[measure["x"] for measure in measures],
+                   y=[measure["y"] for measure in measures],
+                   z=[measure["z"] for measure in measures])
+
+    def to_dict(self):
+        """
+        Возвращает измерения в виде обычного словаря {datetime: {"x": ..., "y": ..., "z": ...}}.
+        """
+        return {time: {"x": x, "y": y, "z": z}
+                for time, x, y, z in zip(self.times, self.x.tolist(), self.y.tolist(), self.z.tolist())}
+
+    @property
+    def times(self):
+        """
+        Эпохи измерений в виде объектов datetime.datetime.
+        """
+        return epochs_to_datetimes(self.epochs)
+
+    @property
+    def xyz(self):
+        """
+        Координаты измерений в виде массива (n, 3).
+        """
+        return np.column_stack((self.x, self.y, self.z))
+
+    @property
+    def nbytes(self):
+        return self.epochs.nbytes + self.x.nbytes + self.y.nbytes + self.z.nbytes
+
+    def select(self, mask):
+        """
+        Возвращает новое хранилище с эпохами, выбранными булевой маской или индексами.
+
+        :param mask: булева маска или массив индексов
+        :return: GnssMeasureData
+        """
+        return GnssMeasureData(self.epochs[mask], self.x[mask], self.y[mask], self.z[mask])
+
+    def index_of(self, time):
+        """
+        Возвращает индекс эпохи в хранилище или None, если эпохи нет.
+
+        :param time: момент времени
+        """
+        epoch = datetime_to_epoch(time)
+        idx = int(np.searchsorted(self.epochs, epoch))
+        if idx < len(self.epochs) and self.epochs[idx] == epoch:
+            return idx
+        return None
+
+    def get(self, time, default=None):
+        idx = self.index_of(time)
+        if idx is None:
+            return default
+        return GnssEpochView(self, idx)
+
+    def __getitem__(self, time):
+        idx = self.index_of(time)
+        if idx is None:
+            raise KeyError(time)
+        return GnssEpochView(self, idx)
+
+    def __contains__(self, time):
+        return self.index_of(time) is not None
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def __iter__(self):
+        return iter(self.times)
+
+    def __eq__(self, other):
+        if isinstance(other, dict):
+            other = GnssMeasureData.from_dict(other)
+        if not isinstance(other, GnssMeasureData):
+            return NotImplemented
+        return (np.array_equal(self.epochs, other.epochs) and np.array_equal(self.x, other.x) and
+                np.array_equal(self.y, other.y) and np.array_equal(self.z, other.z))
+
+    def keys(self):
+        return list(self.times)
+
+    def values(self):
+        return [GnssEpochView(self, idx) for idx in range(len(self.epochs))]
+
+    def items(self):
+        return zip(self.times, self.values())
+
+    def __repr__(self):
+        if len(self.epochs) == 0:
+            return "GnssMeasureData(empty)"
+        start, end = self.times[[0, -1]]
+        return f"GnssMeasureData(epochs={len(self.epochs)}, start={start}, end={end})"
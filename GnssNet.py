@@ -1,18 +1,150 @@
 from matplotlib import pyplot as plt
+import numpy as np
 
 from CONFIG import MSE_B, MSE_A
 from GnssPoint import GnssPoint
+from GnssSpatialIndex import GnssSpatialIndex
 
 
 class GnssNet:
+
+    # Типы точек с постоянными кодами; остальные типы получают коды по мере добавления
+    POINT_TYPES = ("base", "rover")
+
     def __init__(self, accuracy=None):
         """
         Инициализация объекта GnssNet.
+
+        Сеть хранит данные точек в непрерывных массивах: координаты (n, 3), коды типов и имена.
+        Точки в self.points - легковесные представления (GnssPoint) строк этих массивов.
         """
         if accuracy is None:
             accuracy = {"a": MSE_A, "b": MSE_B}
         self.accuracy = accuracy
         self.points = []
+        self._point_types = list(self.POINT_TYPES)
+        self._coordinates = np.empty((0, 3), dtype=np.float64)
+        self._type_codes = np.empty(0, dtype=np.int8)
+        self._names = np.empty(0, dtype=object)
+        self._mse = []
+        self._measure_data = []
+        # Массивы координат, типов и имен разделяются с копиями сети (см. copy) до первой записи
+        self._shared_arrays = False
+        # Имя -> точки с этим именем в порядке добавления
+        self._points_by_name = {}
+        # Пространственный индекс строится при первом запросе и поддерживается add_point / remove_point
+        self._spatial_index = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_spatial_index"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for idx, point in enumerate(self.points):
+            point._attach(self, idx)
+
+    def __len__(self):
+        return len(self.points)
+
+    def copy(self):
+        """
+        Копия сети с копированием при записи.
+        Массивы координат, типов и имен общие с исходной сетью, пока одна из сетей их не изменит
+        (изменение координат, имени или типа точки, добавление или удаление точек): тогда
+        изменяющая сеть получает собственную копию массивов. Точки копии - новые представления
+        строк массивов; словари СКО копируются, хранилища измерений (GnssMeasureData) общие
+        до замены - измерения точки копии следует задавать присваиванием point.measure_data.
+
+        :return: Объект GnssNet
+        """
+        net = GnssNet.__new__(GnssNet)
+        net.accuracy = dict(self.accuracy)
+        net._point_types = list(self._point_types)
+        net._coordinates, net._type_codes, net._names = self._coordinates, self._type_codes, self._names
+        self._shared_arrays = net._shared_arrays = True
+        net._mse = [None if mse is None else dict(mse) for mse in self._mse]
+        net._measure_data = list(self._measure_data)
+        net._spatial_index = None
+        net.points = []
+        net._points_by_name = {}
+        for idx in range(len(self.points)):
+            point = GnssPoint.__new__(GnssPoint)
+            point._attach(net, idx)
+            net.points.append(point)
+            net._points_by_name.setdefault(net._names[idx], []).append(point)
+        return net
+
+    def _own_arrays(self):
+        """
+        Перед записью в массивы точек делает их собственными, если они разделяются с копией сети.
+        """
+        if self._shared_arrays:
+            size = len(self.points)
+            self._coordinates = self._coordinates[:size].copy()
+            self._type_codes = self._type_codes[:size].copy()
+            self._names = self._names[:size].copy()
+            self._shared_arrays = False
+
+    @property
+    def coordinates(self):
+        """
+        Координаты точек сети, массив (n, 3) только для чтения (изменять координаты следует через точки).
+        """
+        coordinates = self._coordinates[:len(self.points)]
+        coordinates.flags.writeable = False
+        return coordinates
+
+    @property
+    def names(self):
+        """
+        Имена точек сети, массив (n,) только для чтения.
+        """
+        names = self._names[:len(self.points)]
+        names.flags.writeable = False
+        return names
+
+    @property
+    def type_codes(self):
+        """
+        Коды типов точек сети, массив (n,) только для чтения; тип по коду - self.point_types[code].
+        """
+        type_codes = self._type_codes[:len(self.points)]
+        type_codes.flags.writeable = False
+        return type_codes
+
+    @property
+    def point_types(self):
+        return tuple(self._point_types)
+
+    def get_type_code(self, point_type):
+        """
+        Возвращает код типа точки, регистрируя новый тип при необходимости.
+        """
+        if point_type not in self._point_types:
+            if len(self._point_types) >= np.iinfo(self._type_codes.dtype).max:
+                raise ValueError("Слишком много типов точек в сети")
+            self._point_types.append(point_type)
+        return self._point_types.index(point_type)
+
+    def _reserve(self, count):
+        """
+        Увеличивает емкость массивов сети не менее чем до count строк (с удвоением).
+        """
+        self._own_arrays()
+        capacity = len(self._coordinates)
+        if count <= capacity:
+            return
+        capacity = max(count, 2 * capacity, 16)
+        coordinates = np.empty((capacity, 3), dtype=np.float64)
+        type_codes = np.empty(capacity, dtype=self._type_codes.dtype)
+        names = np.empty(capacity, dtype=object)
+        size = len(self.points)
+        coordinates[:size] = self._coordinates[:size]
+        type_codes[:size] = self._type_codes[:size]
+        names[:size] = self._names[:size]
+        self._coordinates, self._type_codes, self._names = coordinates, type_codes, names
 
     def add_point(self, point):
         """
@@ -21,25 +153,141 @@ class GnssNet:
         :param point: Объект GnssPoint
         """
         if isinstance(point, GnssPoint):
+            if point._net is not None:
+                raise ValueError("The point already belongs to a network")
+            idx = len(self.points)
+            self._reserve(idx + 1)
+            self._coordinates[idx] = point.x, point.y, point.z
+            self._type_codes[idx] = self.get_type_code(point.point_type)
+            self._names[idx] = point.name
+            self._mse.append(point.mse)
+            self._measure_data.append(point._data[6])
             self.points.append(point)
+            point._attach(self, idx)
+            self._points_by_name.setdefault(point.name, []).append(point)
+            if self._spatial_index is not None:
+                self._spatial_index.add(point)
         else:
             raise ValueError("The point must be an instance of GnssPoint")
 
+    def add_points(self, coordinates, names, point_types):
+        """
+        Пакетно добавляет точки в сеть.
+
+        :param coordinates: Массив координат (n, 3)
+        :param names: Последовательность имен точек
+        :param point_types: Последовательность типов точек ('base' или 'rover')
+        :return: Список добавленных объектов GnssPoint
+        """
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 3)
+        names, point_types = list(names), list(point_types)
+        if not len(coordinates) == len(names) == len(point_types):
+            raise ValueError("Массивы координат, имен и типов точек должны быть одной длины")
+        start = len(self.points)
+        self._reserve(start + len(coordinates))
+        end = start + len(coordinates)
+        self._coordinates[start:end] = coordinates
+        self._type_codes[start:end] = [self.get_type_code(point_type) for point_type in point_types]
+        self._names[start:end] = names
+        self._mse += [None] * len(coordinates)
+        self._measure_data += [None] * len(coordinates)
+        points = []
+        for idx, name in enumerate(names, start=start):
+            point = GnssPoint.__new__(GnssPoint)
+            point._attach(self, idx)
+            points.append(point)
+            self._points_by_name.setdefault(name, []).append(point)
+        self.points += points
+        if self._spatial_index is not None:
+            for point in points:
+                self._spatial_index.add(point)
+        return points
+
     def remove_point(self, point):
         """
         Удаляет точку из сети.
 
         :param point: Объект GnssPoint
         """
-        if point in self.points:
-            self.points.remove(point)
+        # Как и list.remove, удаляется первая точка сети, равная заданной (с тем же именем)
+        same_name_points = self._points_by_name.get(point.name)
+        if same_name_points:
+            point = same_name_points.pop(0)
+            if not same_name_points:
+                del self._points_by_name[point.name]
+            if self._spatial_index is not None:
+                self._spatial_index.remove(point)
+            idx = point._idx
+            point._detach()
+            self._own_arrays()
+            size = len(self.points)
+            for array in self._coordinates, self._type_codes, self._names:
+                array[idx:size - 1] = array[idx + 1:size]
+            del self._mse[idx], self._measure_data[idx], self.points[idx]
+            for next_idx, next_point in enumerate(self.points[idx:], start=idx):
+                next_point._idx = next_idx
         else:
             raise ValueError("The point is not in the network")
 
+    def index_of(self, point):
+        """
+        Возвращает номер строки точки в массивах сети.
+
+        :param point: Объект GnssPoint этой сети
+        """
+        if point._net is not self:
+            raise ValueError("The point is not in the network")
+        return point._idx
+
+    def _set_point_coordinate(self, idx, axis, value):
+        self._own_arrays()
+        self._coordinates[idx, axis] = value
+        self._invalidate_spatial_index()
+
+    def _set_point_name(self, idx, name):
+        self._own_arrays()
+        old_name = self._names[idx]
+        self._names[idx] = name
+        self._rename_point(self.points[idx], old_name)
+
+    def _set_point_type(self, idx, point_type):
+        code = self.get_type_code(point_type)
+        self._own_arrays()
+        self._type_codes[idx] = code
+
+    def _rename_point(self, point, old_name):
+        """
+        Обновляет индекс имен после переименования точки сети.
+        """
+        points = self._points_by_name[old_name]
+        points[:] = [item for item in points if item is not point]
+        if not points:
+            del self._points_by_name[old_name]
+        same_name_points = self._points_by_name.setdefault(point.name, [])
+        same_name_points.append(point)
+        # Порядок точек с одинаковым именем - порядок в сети
+        same_name_points.sort(key=lambda item: item._idx)
+
+    def _invalidate_spatial_index(self):
+        self._spatial_index = None
+
+    @property
+    def spatial_index(self):
+        """
+        Пространственный индекс точек сети (GnssSpatialIndex).
+        Перестраивается, если число точек с момента построения заметно изменилось
+        или если изменились координаты точек.
+        """
+        index = self._spatial_index
+        if index is None or not index.built_count / 4 <= len(self.points) <= index.built_count * 4:
+            index = GnssSpatialIndex(self.points, coordinates=self.coordinates)
+            self._spatial_index = index
+        return index
+
     def get_point_by_name(self, point_name: str) -> GnssPoint:
-        for point in self:
-            if point.name == point_name.upper():
-                return point
+        same_name_points = self._points_by_name.get(point_name.upper())
+        if same_name_points:
+            return same_name_points[0]
         raise PointNameException(f"Нет точки с таким именем!", point_name)
 
     def get_points(self):
@@ -56,7 +304,7 @@ class GnssNet:
 
         :return: Список объектов GnssPoint
         """
-        return [point for point in self.points if point.is_base()]
+        return self._get_points_by_type("base")
 
     def get_rover_points(self):
         """
@@ -64,7 +312,24 @@ class GnssNet:
 
         :return: Список объектов GnssPoint
         """
-        return [point for point in self.points if point.is_rover()]
+        return self._get_points_by_type("rover")
+
+    def _get_points_by_type(self, point_type):
+        if point_type not in self._point_types:
+            return []
+        return [self.points[idx] for idx in np.flatnonzero(self.type_codes == self._point_types.index(point_type))]
+
+    def compute_vectors(self, pairs, color="black", is_measured_vector=True):
+        """
+        Пакетно вычисляет векторы между парами точек сети.
+
+        :param pairs: Список пар имен точек [(point_0_name, point_1_name), ...]
+        :param color: Цвет векторов или список цветов для каждой пары
+        :param is_measured_vector: Рассчитывать ли СКО векторов
+        :return: Объект GnssVectorBatch, итерируемый по векторам GnssVectorView
+        """
+        from GnssVectorBatch import GnssVectorBatch
+        return GnssVectorBatch(self, pairs, color=color, is_measured_vector=is_measured_vector)
 
     def __str__(self):
         """
@@ -92,18 +357,30 @@ class GnssNet:
         if not self.points:
             raise ValueError("The network is empty")
 
-        farthest_point = None
-        max_distance = -1
+        ref_x, ref_y = reference_point
+        return self.spatial_index.find_farthest(ref_x, ref_y)
 
+    def find_nearest_points(self, reference_point, k=1):
+        """
+        Находит k ближайших точек к заданной точке отсчета.
+
+        :param reference_point: Кортеж (x, y) с координатами точки отсчета.
+        :param k: Количество точек
+        :return: Список объектов GnssPoint по возрастанию расстояния.
+        """
         ref_x, ref_y = reference_point
+        return self.spatial_index.find_nearest(ref_x, ref_y, k)
 
-        for point in self.points:
-            distance = ((point.x - ref_x) ** 2 + (point.y - ref_y) ** 2) ** 0.5
-            if distance > max_distance:
-                max_distance = distance
-                farthest_point = point
+    def find_points_in_radius(self, reference_point, radius):
+        """
+        Находит точки на расстоянии не более radius от заданной точки отсчета.
 
-        return farthest_point
+        :param reference_point: Кортеж (x, y) с координатами точки отсчета.
+        :param radius: Радиус поиска
+        :return: Список объектов GnssPoint по возрастанию расстояния.
+        """
+        ref_x, ref_y = reference_point
+        return self.spatial_index.find_in_radius(ref_x, ref_y, radius)
 
     def plot_net(self):
         """
@@ -111,23 +388,19 @@ class GnssNet:
         """
         fig, ax = plt.subplots()
 
-        for point in self.points:
-            ax.text(x=point.x,
-                    y=point.y,
-                    s=point.name,
+        coordinates = self.coordinates
+        for (x, y, _), name in zip(coordinates.tolist(), self.names):
+            ax.text(x=x,
+                    y=y,
+                    s=name,
                     )
 
-        base_points = self.get_base_points()
-        rover_points = self.get_rover_points()
-
-        base_x = [point.x for point in base_points]
-        base_y = [point.y for point in base_points]
-
-        rover_x = [point.x for point in rover_points]
-        rover_y = [point.y for point in rover_points]
+        type_codes = self.type_codes
+        base_mask = type_codes == self._point_types.index("base")
+        rover_mask = type_codes == self._point_types.index("rover")
 
-        ax.scatter(base_x, base_y, c='r', marker='o', label='Base Points')
-        ax.scatter(rover_x, rover_y, c='b', marker='^', label='Rover Points')
+        ax.scatter(coordinates[base_mask, 0], coordinates[base_mask, 1], c='r', marker='o', label='Base Points')
+        ax.scatter(coordinates[rover_mask, 0], coordinates[rover_mask, 1], c='b', marker='^', label='Rover Points')
 
         ax.set_xlabel('X')
         ax.set_ylabel('Y')
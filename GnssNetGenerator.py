@@ -2,31 +2,87 @@ import math
 import random
 import string
 
+import numpy as np
+
 from GnssNet import GnssNet
-from GnssPoint import GnssPoint
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
 
 
 class GnssNetGenerator:
 
+    # Число попыток на одну точку, после которого generate_points_grid прекращает поиск
+    MAX_ATTEMPTS_PER_POINT = 10_000
+
+    # Число кандидатов, проверяемых вокруг каждой активной точки в алгоритме Бридсона
+    POISSON_DISK_CANDIDATES = 30
+
+    # Предельное число элементов в промежуточном массиве расстояний при поиске ближайших точек перебором
+    MAX_CHUNK_ELEMENTS = 2 ** 22
+
     def __init__(self, num_points=15, count_of_base_point=2, min_distance=1500,
-                 xy_limits=20_000, z_limit=500, random_seed=None):
+                 xy_limits=20_000, z_limit=500, random_seed=None, rng=None):
+        """
+        Генератор случайной сети точек.
+
+        :param num_points: Количество точек
+        :param count_of_base_point: Количество исходных (base) точек
+        :param min_distance: Минимальное расстояние между точками
+        :param xy_limits: Размер области по осям X и Y
+        :param z_limit: Размах высот
+        :param random_seed: Начальное значение для модуля random (используется, если rng не задан)
+        :param rng: Собственный генератор случайных чисел:
+                    random.Random - прежний алгоритм с прежним порядком чисел, но без глобального состояния;
+                    np.random.Generator - быстрый алгоритм Бридсона (Poisson-disk);
+                    None - прежний алгоритм на глобальном модуле random
+        """
         self.random_seed = random_seed
-        if random_seed is not None:
+        self.rng = rng
+        self._is_numpy_rng = isinstance(rng, np.random.Generator)
+        # Источник чисел прежнего алгоритма: собственный random.Random или глобальный модуль random
+        self._random = rng if isinstance(rng, random.Random) else random
+        if random_seed is not None and rng is None:
             random.seed(random_seed)
         self.num_points = num_points
         self.count_of_base_point = count_of_base_point
         self.min_distance = min_distance
-        self.x_range, self.y_range, self.z_range = self._gen_ranges(xy_limits, z_limit)
-        self.points = self.generate_points_grid()
+        self.x_range, self.y_range, self.z_range = self._gen_ranges(xy_limits, z_limit, rng)
+        self._check_points_density()
+        if not self._is_numpy_rng:
+            self.points = self.generate_points_grid()
+        else:
+            self.points = self.generate_points_poisson_disk()
         self.base_points = self.find_most_distant_points()
 
 
     @staticmethod
-    def _gen_ranges(xy_limits, z_limit):
-        x0, y0 = [random.randint(a=40_000, b =80_000) for _ in range(2)]
-        z0 = random.randint(100, 500)
+    def _gen_ranges(xy_limits, z_limit, rng=None):
+        if not isinstance(rng, np.random.Generator):
+            rng = random if rng is None else rng
+            x0, y0 = [rng.randint(a=40_000, b =80_000) for _ in range(2)]
+            z0 = rng.randint(100, 500)
+        else:
+            x0, y0 = (int(value) for value in rng.integers(40_000, 80_000, size=2, endpoint=True))
+            z0 = int(rng.integers(100, 500, endpoint=True))
         return (x0, x0 + xy_limits), (y0, y0 + xy_limits), (z0, z0 + z_limit)
 
+    def _check_points_density(self):
+        """
+        Проверяет, что num_points точек в принципе помещаются в область при заданном min_distance:
+        в каждой ячейке сетки со стороной min_distance / sqrt(2) может быть не больше одной точки.
+        """
+        cell_size = self.min_distance / 2 ** 0.5
+        cols = math.ceil((self.x_range[1] - self.x_range[0]) / cell_size)
+        rows = math.ceil((self.y_range[1] - self.y_range[0]) / cell_size)
+        if self.num_points > rows * cols:
+            raise PointsDensityException(f"В области {self.x_range[1] - self.x_range[0]} x "
+                                         f"{self.y_range[1] - self.y_range[0]} нельзя разместить "
+                                         f"{self.num_points} точек с минимальным расстоянием {self.min_distance}",
+                                         self.num_points)
+
     def generate_points_grid(self):
         """
         Генерирует num_points точек в заданном диапазоне x_range и y_range,
@@ -68,56 +124,261 @@ class GnssNetGenerator:
                         return False
             return True
 
+        max_attempts = self.MAX_ATTEMPTS_PER_POINT * self.num_points
+        attempts = 0
         while len(points) < self.num_points:
-            point = (random.uniform(*self.x_range), random.uniform(*self.y_range), random.uniform(*self.z_range))
+            attempts += 1
+            if attempts > max_attempts:
+                raise PointsDensityException(f"За {max_attempts} попыток удалось разместить только "
+                                             f"{len(points)} точек из {self.num_points}", self.num_points)
+            point = (self._random.uniform(*self.x_range), self._random.uniform(*self.y_range),
+                     self._random.uniform(*self.z_range))
             if is_valid(point):
                 row, col = get_cell(point)
                 grid[row][col] = point
                 points.append(point)
         return points
 
-    def find_most_distant_points(self):
+    def generate_points_poisson_disk(self):
         """
-        Находит n самых удаленных между собой точек.
+        Генерирует num_points точек алгоритмом Бридсона (Poisson-disk sampling) с генератором self.rng.
+        Область заполняется точками с расстоянием между ними не меньше радиуса r >= min_distance,
+        подобранного так, чтобы точек получилось немного больше num_points, после чего из них
+        случайно выбираются num_points. Кандидаты вокруг активной точки генерируются и проверяются
+        по сетке занятости пакетно. Объем работы ограничен: каждая точка проверяет
+        POISSON_DISK_CANDIDATES кандидатов, а радиус уменьшается до min_distance конечное число раз.
 
-        :param points: список точек
-        :param n: количество точек для выделения
-        :return: список n самых удаленных точек
+        :return: список сгенерированных точек (x, y, z)
         """
+        width = self.x_range[1] - self.x_range[0]
+        height = self.y_range[1] - self.y_range[0]
+        radius = max(self.min_distance, (width * height / (2 * self.num_points)) ** 0.5)
+        while True:
+            xy = self._poisson_disk_sample(width, height, radius)
+            if len(xy) >= self.num_points or radius == self.min_distance:
+                break
+            radius = max(self.min_distance, radius * 0.9)
+        if len(xy) < self.num_points:
+            raise PointsDensityException(f"Удалось разместить только {len(xy)} точек из {self.num_points} "
+                                         f"с минимальным расстоянием {self.min_distance}", self.num_points)
+        xy = xy[self.rng.choice(len(xy), size=self.num_points, replace=False)]
+        z = self.rng.uniform(*self.z_range, size=self.num_points)
+        xy = xy + np.array([self.x_range[0], self.y_range[0]])
+        return list(zip(xy[:, 0].tolist(), xy[:, 1].tolist(), z.tolist()))
 
-        def min_distance_to_others(point, others):
-            return min(math.dist(point, other) for other in others if other != point)
+    def _poisson_disk_sample(self, width, height, radius):
+        """
+        Заполняет прямоугольник width x height точками с попарным расстоянием не меньше radius.
+        За одну итерацию кандидаты генерируются сразу для всех активных точек; из найденных
+        подходящих кандидатов сохраняются только не конфликтующие друг с другом.
 
-        most_distant_points = []
-        remaining_points = self.points[:]
+        :return: массив (n, 2) координат относительно левого нижнего угла
+        """
+        cell_size = radius / 2 ** 0.5
+        cols, rows = int(math.ceil(width / cell_size)), int(math.ceil(height / cell_size))
+        # Сетка занятости хранит координаты точки в ячейке (NaN - ячейка пуста);
+        # рамка шириной 2 ячейки избавляет от проверок границ
+        grid_shape = (rows + 4, cols + 4)
+        grid_x, grid_y = np.full(grid_shape, np.nan).ravel(), np.full(grid_shape, np.nan).ravel()
+        # Номера новых кандидатов в ячейках, используются для разрешения конфликтов между ними
+        new_grid = np.full(grid_shape, -1, dtype=np.int64).ravel()
+        offsets = np.array([dr * grid_shape[1] + dc for dr in range(-2, 3) for dc in range(-2, 3)])
+        points = np.empty((rows * cols, 2))
 
-        for _ in range(self.count_of_base_point):
-            if not remaining_points:
-                break
-            point = max(remaining_points, key=lambda p: min_distance_to_others(p, remaining_points))
-            most_distant_points.append(point)
-            remaining_points.remove(point)
+        def get_cells(xy):
+            cells = (xy / cell_size).astype(np.int64) + 2
+            return cells[..., 1] * grid_shape[1] + cells[..., 0]
+
+        def add_points(xy, cells):
+            points[count:count + len(xy)] = xy
+            grid_x[cells], grid_y[cells] = xy[:, 0], xy[:, 1]
+            return np.arange(count, count + len(xy))
+
+        count = 0
+        first_point = self.rng.uniform((0, 0), (width, height))[None, :]
+        active = add_points(first_point, get_cells(first_point))
+        count = 1
+        k = self.POISSON_DISK_CANDIDATES
+        while len(active):
+            angle = self.rng.uniform(0, 2 * math.pi, (len(active), k))
+            distance = radius * np.sqrt(self.rng.uniform(1, 4, (len(active), k)))
+            candidates_x = points[active, 0, None] + distance * np.cos(angle)
+            candidates_y = points[active, 1, None] + distance * np.sin(angle)
+            inside = (candidates_x >= 0) & (candidates_x < width) & (candidates_y >= 0) & (candidates_y < height)
+            candidates_x[~inside], candidates_y[~inside] = 0, 0
+            # Сначала проверяются первые кандидаты каждой точки, остальные - только там, где подходящих не нашлось
+            valid = np.zeros_like(inside)
+            rows_to_check = np.arange(len(active))
+            for columns in slice(0, k // 5), slice(k // 5, k):
+                check_x, check_y = candidates_x[rows_to_check, columns], candidates_y[rows_to_check, columns]
+                neighbours = get_cells(np.stack((check_x, check_y), axis=-1))[..., None] + offsets
+                # Сравнение с NaN пустых ячеек всегда ложно
+                too_close = ((grid_x[neighbours] - check_x[..., None]) ** 2 +
+                             (grid_y[neighbours] - check_y[..., None]) ** 2 < radius ** 2).any(axis=-1)
+                valid[rows_to_check, columns] = inside[rows_to_check, columns] & ~too_close
+                rows_to_check = rows_to_check[~valid[rows_to_check, columns].any(axis=1)]
+            has_valid = valid.any(axis=1)
+            # Активная точка без подходящих кандидатов исключается из дальнейшего поиска
+            active = active[has_valid]
+            first = valid[has_valid].argmax(axis=1)
+            chosen = np.column_stack((candidates_x[has_valid, first], candidates_y[has_valid, first]))
+            if not len(chosen):
+                continue
 
+            # Кандидат сохраняется, если рядом нет кандидата с меньшим номером (в т.ч. в той же ячейке)
+            cells = get_cells(chosen)
+            _, first_in_cell = np.unique(cells, return_index=True)
+            new_grid[cells[first_in_cell]] = first_in_cell
+            neighbours = new_grid[cells[:, None] + offsets]
+            other = chosen[np.maximum(neighbours, 0)]
+            conflict = ((neighbours >= 0) & (neighbours < np.arange(len(chosen))[:, None]) &
+                        (((other - chosen[:, None, :]) ** 2).sum(axis=-1) < radius ** 2))
+            keep = ~conflict.any(axis=1)
+            new_grid[cells[first_in_cell]] = -1
+
+            new_idx = add_points(chosen[keep], cells[keep])
+            count += len(new_idx)
+            active = np.concatenate((active, new_idx))
+        return points[:count]
+
+    def find_most_distant_points(self, distance_matrix=None, kd_tree=None):
+        """
+        Находит count_of_base_point самых удаленных между собой точек: на каждом шаге выбирается
+        оставшаяся точка, наиболее удаленная от ближайшей к ней оставшейся точки.
+        Для каждой точки хранятся номер и расстояние до ближайшей оставшейся точки; после выбора
+        точки пересчитываются только те, для кого она была ближайшей, поэтому каждый шаг линеен по n.
+
+        :param distance_matrix: Необязательная матрица попарных расстояний между точками (n, n)
+        :param kd_tree: Необязательное KD-дерево по точкам (с методом query, как у scipy.spatial.cKDTree);
+                        если не задано и scipy установлен, дерево строится автоматически
+        :return: список самых удаленных точек
+        """
+        points = np.array(self.points, dtype=np.float64).reshape(-1, 3)
+        if distance_matrix is not None:
+            distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+            if distance_matrix.shape != (len(points), len(points)):
+                raise ValueError(f"Размер матрицы расстояний {distance_matrix.shape} "
+                                 f"не соответствует числу точек {len(points)}")
+        elif kd_tree is None and cKDTree is not None and len(points) > 1:
+            kd_tree = cKDTree(points)
+
+        remaining = np.ones(len(points), dtype=bool)
+        nearest = self._get_nearest_remaining(points, np.arange(len(points)), remaining,
+                                              distance_matrix, kd_tree)
+        nearest_distance = np.array([self._get_point_distance(idx, nearest_idx)
+                                     for idx, nearest_idx in enumerate(nearest.tolist())])
+
+        most_distant_points = []
+        for _ in range(min(self.count_of_base_point, len(points))):
+            # np.argmax, как и max, возвращает первую из равноудаленных точек
+            point_idx = int(np.argmax(np.where(remaining, nearest_distance, -np.inf)))
+            most_distant_points.append(self.points[point_idx])
+            remaining[point_idx] = False
+            affected = np.flatnonzero(remaining & (nearest == point_idx))
+            if len(affected):
+                nearest[affected] = self._get_nearest_remaining(points, affected, remaining,
+                                                                distance_matrix, kd_tree)
+                nearest_distance[affected] = [self._get_point_distance(idx, nearest_idx)
+                                              for idx, nearest_idx in zip(affected.tolist(),
+                                                                          nearest[affected].tolist())]
         return most_distant_points
 
+    def _get_point_distance(self, idx, other_idx):
+        """
+        Расстояние между точками с номерами idx и other_idx (math.dist, как и раньше); inf, если other_idx < 0.
+        """
+        if other_idx < 0:
+            return math.inf
+        return math.dist(self.points[idx], self.points[other_idx])
+
+    def _get_nearest_remaining(self, points, idx, remaining, distance_matrix=None, kd_tree=None):
+        """
+        Для точек с номерами idx находит номера ближайших к ним оставшихся точек (-1, если других точек нет).
+
+        :param points: массив координат (n, 3)
+        :param idx: массив номеров точек
+        :param remaining: булева маска оставшихся точек
+        :param distance_matrix: матрица попарных расстояний или None
+        :param kd_tree: KD-дерево по points или None
+        :return: массив номеров ближайших точек
+        """
+        nearest = np.full(len(idx), -1, dtype=np.int64)
+        if kd_tree is not None and distance_matrix is None:
+            # Среди k ближайших соседей заведомо есть оставшаяся точка, если k больше числа выбывших точек
+            k = min(len(points), int((~remaining).sum()) + 2)
+            _, neighbours = kd_tree.query(points[idx], k=max(k, 2))
+            neighbours = np.asarray(neighbours).reshape(len(idx), -1)
+            is_candidate = ((neighbours < len(points)) & (neighbours != idx[:, None]) &
+                            remaining[np.minimum(neighbours, len(points) - 1)])
+            found = is_candidate.any(axis=1)
+            nearest[found] = neighbours[found, is_candidate[found].argmax(axis=1)]
+            return nearest
+
+        chunk = max(1, self.MAX_CHUNK_ELEMENTS // max(1, len(points)))
+        for start in range(0, len(idx), chunk):
+            chunk_idx = idx[start:start + chunk]
+            if distance_matrix is not None:
+                distances = distance_matrix[chunk_idx].copy()
+            else:
+                distances = ((points[None, :, :] - points[chunk_idx, None, :]) ** 2).sum(axis=2)
+            distances[:, ~remaining] = np.inf
+            distances[np.arange(len(chunk_idx)), chunk_idx] = np.inf
+            chunk_nearest = distances.argmin(axis=1)
+            found = np.isfinite(distances[np.arange(len(chunk_idx)), chunk_nearest])
+            nearest[start:start + chunk] = np.where(found, chunk_nearest, -1)
+        return nearest
+
     @staticmethod
-    def generate_unique_name():
+    def generate_unique_name(rng=random):
         """
         Генерирует уникальное имя из четырех заглавных латинских букв.
 
+        :param rng: Источник случайных чисел (модуль random или объект random.Random)
         :return: уникальное имя
         """
-        return ''.join(random.choices(string.ascii_uppercase, k=4))
+        return ''.join(rng.choices(string.ascii_uppercase, k=4))
+
+    def generate_unique_names(self):
+        """
+        Генерирует num_points попарно различных имен из четырех заглавных латинских букв генератором self.rng.
+
+        :return: список имен
+        """
+        letters = np.array(list(string.ascii_uppercase))
+        if self.num_points > len(letters) ** 4:
+            raise ValueError(f"Нельзя составить {self.num_points} различных имен из четырех букв: "
+                             f"их всего {len(letters) ** 4}")
+        names = []
+        used_names = set()
+        while len(names) < self.num_points:
+            codes = self.rng.integers(0, len(letters), size=(self.num_points - len(names), 4))
+            for name in map("".join, letters[codes].tolist()):
+                if name not in used_names:
+                    used_names.add(name)
+                    names.append(name)
+        return names
 
     def create_gnss_net(self):
         gnss_net = GnssNet()
+        if not self._is_numpy_rng:
+            names = [self.generate_unique_name(self._random) for _ in self.points]
+        else:
+            names = self.generate_unique_names()
+        base_points = set(self.base_points)
 
-        for point in self.points:
-            gnss_point = GnssPoint(x=round(point[0], 3),
-                                   y=round(point[1], 3),
-                                   z=round(point[2], 3),
-                                   name=self.generate_unique_name(),
-                                   point_type= "base" if point in self.base_points else "rover")
-            gnss_net.add_point(gnss_point)
-
+        gnss_net.add_points(coordinates=[[round(coordinate, 3) for coordinate in point] for point in self.points],
+                            names=names,
+                            point_types=["base" if point in base_points else "rover" for point in self.points])
         return gnss_net
+
+
+class PointsDensityException(ValueError):
+    """Исключение: заданное число точек не помещается в область при заданном минимальном расстоянии."""
+
+    def __init__(self, message, num_points):
+        self.num_points = num_points
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f'{self.message} - {self.num_points}'
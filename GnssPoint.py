@@ -2,25 +2,136 @@ import math
 
 from matplotlib import pyplot as plt
 
+from GnssMeasureData import GnssMeasureData
+
 
 class GnssPoint:
+    __slots__ = ("_net", "_idx", "_data")
+
     def __init__(self, x, y, z, name, point_type):
         """
         Инициализация объекта GnssPoint.
 
+        Пока точка не добавлена в сеть, ее данные хранятся в самой точке. После GnssNet.add_point
+        точка становится легковесным представлением строки idx массивов сети: координаты, имя
+        и тип читаются и записываются непосредственно в массивы GnssNet.
+
         :param x: Координата x (например, широта)
         :param y: Координата y (например, долгота)
         :param z: Координата z (например, высота)
         :param name: Название точки
         :param point_type: Тип точки ('base' или 'rover')
         """
-        self.x = x
-        self.y = y
-        self.z = z
-        self.name = name
-        self.point_type = point_type
-        self.mse = None
-        self.measure_data = {}
+        self._net = None
+        self._idx = None
+        self._data = [x, y, z, name, point_type, None, None]
+
+    def _attach(self, net, idx):
+        """
+        Связывает точку со строкой idx массивов сети net (вызывается GnssNet).
+        """
+        self._net = net
+        self._idx = idx
+        self._data = None
+
+    def _detach(self):
+        """
+        Копирует данные точки из массивов сети в саму точку (вызывается GnssNet при удалении точки).
+        """
+        self._data = [self.x, self.y, self.z, self.name, self.point_type, self.mse, self.measure_data]
+        self._net = None
+        self._idx = None
+
+    def __getstate__(self):
+        """
+        Копия точки (deepcopy, pickle) хранит собственные данные;
+        сеть связывает свои точки с массивами заново при собственном восстановлении.
+        """
+        return [self.x, self.y, self.z, self.name, self.point_type, self.mse, self.measure_data]
+
+    def __setstate__(self, state):
+        self._net = None
+        self._idx = None
+        self._data = list(state)
+
+    def _get_coordinate(self, axis):
+        if self._net is None:
+            return self._data[axis]
+        return float(self._net._coordinates[self._idx, axis])
+
+    def _set_coordinate(self, axis, value):
+        if self._net is None:
+            self._data[axis] = value
+        else:
+            self._net._set_point_coordinate(self._idx, axis, value)
+
+    x = property(lambda self: self._get_coordinate(0), lambda self, value: self._set_coordinate(0, value))
+    y = property(lambda self: self._get_coordinate(1), lambda self, value: self._set_coordinate(1, value))
+    z = property(lambda self: self._get_coordinate(2), lambda self, value: self._set_coordinate(2, value))
+
+    @property
+    def name(self):
+        if self._net is None:
+            return self._data[3]
+        return self._net._names[self._idx]
+
+    @name.setter
+    def name(self, name):
+        if self._net is None:
+            self._data[3] = name
+        else:
+            self._net._set_point_name(self._idx, name)
+
+    @property
+    def point_type(self):
+        if self._net is None:
+            return self._data[4]
+        return self._net._point_types[self._net._type_codes[self._idx]]
+
+    @point_type.setter
+    def point_type(self, point_type):
+        if self._net is None:
+            self._data[4] = point_type
+        else:
+            self._net._set_point_type(self._idx, point_type)
+
+    @property
+    def mse(self):
+        """
+        Словарь СКО и параметров эллипса ошибок точки или None.
+        """
+        if self._net is None:
+            return self._data[5]
+        return self._net._mse[self._idx]
+
+    @mse.setter
+    def mse(self, mse):
+        if self._net is None:
+            self._data[5] = mse
+        else:
+            self._net._mse[self._idx] = mse
+
+    @property
+    def measure_data(self):
+        """
+        Колоночное хранилище измерений точки (GnssMeasureData).
+        Пустое хранилище создается при первом обращении.
+        """
+        storage, idx = (self._data, 6) if self._net is None else (self._net._measure_data, self._idx)
+        if storage[idx] is None:
+            storage[idx] = GnssMeasureData()
+        return storage[idx]
+
+    @measure_data.setter
+    def measure_data(self, measure_data):
+        """
+        Принимает GnssMeasureData или словарь {datetime: {"x": ..., "y": ..., "z": ...}}.
+        """
+        measure_data = GnssMeasureData.from_dict(measure_data)
+        if self._net is None:
+            self._data[6] = measure_data
+        else:
+            self._net._measure_data[self._idx] = measure_data
 
     def __eq__(self, other):
         return self.name == other.name
@@ -0,0 +1,239 @@
+import math
+
+import numpy as np
+
+
+class GnssSpatialIndex:
+
+    # Среднее число точек в ячейке сетки при автоматическом выборе ее размера
+    POINTS_PER_CELL = 4
+
+    def __init__(self, points=(), cell_size=None, coordinates=None):
+        """
+        Пространственный индекс точек сети по плановым координатам (x, y).
+        Точки раскладываются по ячейкам равномерной сетки (хеш ячейка -> точки), что дает
+        запросы k ближайших точек и точек в радиусе без перебора всей сети. Для поиска самой
+        удаленной точки хранится выпуклая оболочка: самая удаленная точка всегда лежит на ней.
+        Равноудаленные точки упорядочиваются по порядку добавления в индекс.
+
+        :param points: Итерируемый объект точек GnssPoint
+        :param cell_size: Размер ячейки сетки; если не задан, выбирается по плотности точек
+        :param coordinates: Необязательный массив координат точек (n, 2) или (n, 3),
+                            чтобы не читать координаты из каждой точки
+        """
+        points = list(points)
+        if coordinates is None:
+            coordinates = [(point.x, point.y) for point in points]
+        else:
+            coordinates = [(x, y) for x, y in np.asarray(coordinates)[:, :2].tolist()]
+        if cell_size is None:
+            cell_size = self.get_cell_size(coordinates)
+        if cell_size <= 0:
+            raise ValueError("Размер ячейки пространственного индекса должен быть положительным")
+        self.cell_size = cell_size
+        # Число точек при построении: по нему владелец решает, не пора ли перестроить индекс
+        self.built_count = max(len(points), 1)
+        self.cells = {}
+        # id(точки) -> (ячейка, координаты (x, y), порядковый номер добавления)
+        self._entries = {}
+        self._next_order = 0
+        self._coordinates = {}
+        self._bounds = None
+        self._hull = None
+        for point, (x, y) in zip(points, coordinates):
+            self._add(point, x, y)
+
+    @classmethod
+    def get_cell_size(cls, coordinates):
+        """
+        Размер ячейки, при котором в ячейке в среднем POINTS_PER_CELL точек.
+
+        :param coordinates: список координат (x, y)
+        """
+        if len(coordinates) < 2:
+            return 1.0
+        xs = [x for x, _ in coordinates]
+        ys = [y for _, y in coordinates]
+        area = (max(xs) - min(xs)) * (max(ys) - min(ys))
+        if area <= 0:
+            return max(max(xs) - min(xs), max(ys) - min(ys), 1.0) / len(coordinates) * cls.POINTS_PER_CELL
+        return (area * cls.POINTS_PER_CELL / len(coordinates)) ** 0.5
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, point):
+        return id(point) in self._entries
+
+    def _get_cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def add(self, point):
+        """
+        Добавляет точку в индекс.
+
+        :param point: Объект GnssPoint
+        """
+        self._add(point, point.x, point.y)
+
+    def _add(self, point, x, y):
+        if id(point) in self._entries:
+            return
+        cell = self._get_cell(x, y)
+        coordinates = (x, y)
+        self.cells.setdefault(cell, []).append(point)
+        self._entries[id(point)] = (cell, coordinates, self._next_order)
+        self._next_order += 1
+        self._coordinates.setdefault(coordinates, []).append(point)
+        if self._bounds is None:
+            self._bounds = [cell[0], cell[0], cell[1], cell[1]]
+        else:
+            self._bounds = [min(self._bounds[0], cell[0]), max(self._bounds[1], cell[0]),
+                            min(self._bounds[2], cell[1]), max(self._bounds[3], cell[1])]
+        if self._hull is not None and not self._is_inside_hull(coordinates):
+            self._hull = None
+
+    def remove(self, point):
+        """
+        Удаляет точку из индекса.
+
+        :param point: Объект GnssPoint
+        """
+        if id(point) not in self._entries:
+            raise ValueError("Точки нет в пространственном индексе")
+        cell, coordinates, _ = self._entries.pop(id(point))
+        self._remove_by_identity(self.cells, cell, point)
+        self._remove_by_identity(self._coordinates, coordinates, point)
+        if coordinates not in self._coordinates and self._hull is not None and coordinates in self._hull:
+            self._hull = None
+
+    @staticmethod
+    def _remove_by_identity(groups, key, point):
+        points = groups[key]
+        points[:] = [item for item in points if item is not point]
+        if not points:
+            del groups[key]
+
+    def _get_distance(self, point, x, y):
+        point_x, point_y = self._entries[id(point)][1]
+        return ((point_x - x) ** 2 + (point_y - y) ** 2) ** 0.5
+
+    def _get_ring_cells(self, center, ring):
+        """
+        Непустые ячейки на границе квадрата (2 * ring + 1) x (2 * ring + 1) ячеек вокруг center.
+        """
+        ci, cj = center
+        i_min, i_max, j_min, j_max = self._bounds
+        if ring == 0:
+            cells = [center]
+        else:
+            cells = []
+            for i in range(max(ci - ring, i_min), min(ci + ring, i_max) + 1):
+                cells += [(i, j) for j in (cj - ring, cj + ring) if j_min <= j <= j_max]
+            for j in range(max(cj - ring + 1, j_min), min(cj + ring - 1, j_max) + 1):
+                cells += [(i, j) for i in (ci - ring, ci + ring) if i_min <= i <= i_max]
+        return [cell for cell in cells if cell in self.cells]
+
+    def find_nearest(self, x, y, k=1):
+        """
+        Находит k ближайших к (x, y) точек.
+
+        :return: список точек по возрастанию расстояния
+        """
+        if k <= 0 or not self._entries:
+            return []
+        center = self._get_cell(x, y)
+        i_min, i_max, j_min, j_max = self._bounds
+        # Кольца, не пересекающие занятую область сетки, пропускаются
+        ring = max(0, i_min - center[0], center[0] - i_max, j_min - center[1], center[1] - j_max)
+        last_ring = max(abs(center[0] - i_min), abs(center[0] - i_max),
+                        abs(center[1] - j_min), abs(center[1] - j_max))
+        found = []
+        while ring <= last_ring:
+            for cell in self._get_ring_cells(center, ring):
+                found += [(self._get_distance(point, x, y), self._entries[id(point)][2], point)
+                          for point in self.cells[cell]]
+            if len(found) >= k:
+                found.sort(key=lambda item: item[:2])
+                found = found[:k]
+                # Точки за пределами просмотренного квадрата не ближе расстояния до его границы
+                border = min(x - (center[0] - ring) * self.cell_size, (center[0] + ring + 1) * self.cell_size - x,
+                             y - (center[1] - ring) * self.cell_size, (center[1] + ring + 1) * self.cell_size - y)
+                if found[-1][0] <= border:
+                    break
+            ring += 1
+        found.sort(key=lambda item: item[:2])
+        return [point for _, _, point in found[:k]]
+
+    def find_in_radius(self, x, y, radius):
+        """
+        Находит точки на расстоянии не более radius от (x, y).
+
+        :return: список точек по возрастанию расстояния
+        """
+        if not self._entries:
+            return []
+        i_min, i_max, j_min, j_max = self._bounds
+        first_i, first_j = self._get_cell(x - radius, y - radius)
+        last_i, last_j = self._get_cell(x + radius, y + radius)
+        found = []
+        for i in range(max(first_i, i_min), min(last_i, i_max) + 1):
+            for j in range(max(first_j, j_min), min(last_j, j_max) + 1):
+                for point in self.cells.get((i, j), ()):
+                    distance = self._get_distance(point, x, y)
+                    if distance <= radius:
+                        found.append((distance, self._entries[id(point)][2], point))
+        found.sort(key=lambda item: item[:2])
+        return [point for _, _, point in found]
+
+    def find_farthest(self, x, y):
+        """
+        Находит самую удаленную от (x, y) точку (из равноудаленных - добавленную раньше).
+        Перебираются только точки на выпуклой оболочке.
+        """
+        if not self._entries:
+            return None
+        if self._hull is None:
+            self._hull = self._get_hull()
+        candidates = [point for coordinates in self._hull for point in self._coordinates[coordinates]]
+        return min(candidates, key=lambda point: (-self._get_distance(point, x, y), self._entries[id(point)][2]))
+
+    def _get_hull(self):
+        """
+        Выпуклая оболочка (алгоритм Эндрю) по уникальным координатам точек.
+        Точки, лежащие на сторонах оболочки, сохраняются.
+
+        :return: список координат вершин оболочки против часовой стрелки
+        """
+        coordinates = sorted(self._coordinates)
+        if len(coordinates) < 3:
+            return coordinates
+
+        def cross(o, a, b):
+            return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+        lower, upper = [], []
+        for chain, ordered in (lower, coordinates), (upper, reversed(coordinates)):
+            for item in ordered:
+                while len(chain) >= 2 and cross(chain[-2], chain[-1], item) < 0:
+                    chain.pop()
+                chain.append(item)
+        return list(dict.fromkeys(lower[:-1] + upper[:-1]))
+
+    def _is_inside_hull(self, coordinates):
+        """
+        Лежит ли точка внутри или на границе текущей выпуклой оболочки.
+        """
+        hull = self._hull
+        if coordinates in hull:
+            return True
+        is_flat = True
+        for idx, start in enumerate(hull):
+            end = hull[(idx + 1) % len(hull)]
+            cross = ((end[0] - start[0]) * (coordinates[1] - start[1]) -
+                     (end[1] - start[1]) * (coordinates[0] - start[0]))
+            if cross < 0:
+                return False
+            is_flat = is_flat and cross == 0
+        # Для вырожденной (отрезок) оболочки проверка по сторонам не работает - оболочка перестраивается
+        return not is_flat
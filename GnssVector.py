@@ -1,5 +1,6 @@
 import math
 
+import numpy as np
 import pandas as pd
 from matplotlib import pyplot as plt
 
@@ -36,53 +37,97 @@ class GnssVector:
                     self.point_1.x + self.point_1.y + self.point_1.z, 6)
         return hash(res)
 
+    def get_epoch_deltas(self):
+        """
+        Приращения координат point_1 - point_0 в общих для обеих точек эпохах.
+        Общие эпохи находятся одним пересечением отсортированных массивов эпох.
+
+        :return: массив (общие эпохи, 3) приращений dx, dy, dz
+        """
+        measure_0 = self.point_0.measure_data
+        measure_1 = self.point_1.measure_data
+        _, idx_0, idx_1 = np.intersect1d(measure_0.epochs, measure_1.epochs,
+                                         assume_unique=True, return_indices=True)
+        return np.column_stack((measure_1.x[idx_1] - measure_0.x[idx_0],
+                                measure_1.y[idx_1] - measure_0.y[idx_0],
+                                measure_1.z[idx_1] - measure_0.z[idx_0]))
+
+    @staticmethod
+    def _column_sums(values):
+        """
+        Суммы массива по столбцам встроенным sum(), как и в прежнем поэпохном расчете
+        (в Python 3.12+ sum() суммирует float с компенсацией по Ноймайеру; math.fsum
+        округляет иначе в последнем знаке).
+        """
+        return [sum(column) for column in values.T.tolist()]
+
+    @staticmethod
+    def _residual_sums(values, means):
+        """
+        Суммы квадратов уклонений от средних по столбцам. Квадраты считаются возведением в степень
+        чисел float (** 2 через pow), как в прежнем расчете: x * x в NumPy иногда отличается в последнем знаке.
+        """
+        return [sum([(value - mean) ** 2 for value in column]) for column, mean in zip(values.T.tolist(), means)]
+
     def calk_vector(self):
-        d_x, d_y, d_z = [], [], []
-        for time, measure_0 in self.point_0:
-            measure_1 = self.point_1.measure_data.get(time)
-            if measure_1 is not None:
-                d_x.append(measure_1["x"] - measure_0["x"])
-                d_y.append(measure_1["y"] - measure_0["y"])
-                d_z.append(measure_1["z"] - measure_0["z"])
+        deltas = self.get_epoch_deltas()
         try:
-            self.dx = sum(d_x) / len(d_x)
-            self.dy = sum(d_y) / len(d_y)
-            self.dz = sum(d_z) / len(d_z)
+            self.dx, self.dy, self.dz = (d_sum / len(deltas) for d_sum in self._column_sums(deltas))
         except ZeroDivisionError:
             self.dx = self.point_1.x - self.point_0.x
             self.dy = self.point_1.y - self.point_0.y
             self.dz = self.point_1.z - self.point_0.z
-        self.s_dist = (self.dx ** 2 + self.dy ** 2 + self.dz ** 2) ** 0.5
-        self.h_dist = (self.dx ** 2 + self.dy ** 2) ** 0.5
-        self.azimuth = math.atan2(self.dy, self.dx)
-        self.zenith = math.acos(self.dz / self.s_dist)
+        self.s_dist, self.h_dist, self.azimuth, self.zenith = self.get_vector_geometry(self.dx, self.dy, self.dz)
         if self.is_measured_vector:
-            self.calk_vector_mse()
-
-    def calk_vector_mse(self):
-        vx_2, vy_2, vz_2 = [], [], []
-        for time, measure_0 in self.point_0:
-            measure_1 = self.point_1.measure_data.get(time)
-            if measure_1 is not None:
-                vx_2.append((measure_1["x"] - measure_0["x"] - self.dx) ** 2)
-                vy_2.append((measure_1["y"] - measure_0["y"] - self.dy) ** 2)
-                vz_2.append((measure_1["z"] - measure_0["z"] - self.dz) ** 2)
-        self.mse_dx = (sum(vx_2) / (len(vx_2) - 1)) ** 0.5
-        self.mse_dy = (sum(vy_2) / (len(vy_2) - 1)) ** 0.5
-        self.mse_dz = (sum(vz_2) / (len(vz_2) - 1)) ** 0.5
-
-        self.mse_s_dist = ((self.dx / self.s_dist) ** 2 * self.mse_dx ** 2 +
-                           (self.dy / self.s_dist) ** 2 * self.mse_dy ** 2 +
-                           (self.dz / self.s_dist) ** 2 * self.mse_dz ** 2) ** 0.5
-
-        self.mse_azimuth = ((-self.dy / (self.dx ** 2 + self.dy ** 2)) ** 2 * self.mse_dx ** 2 +
-                            (self.dx / (self.dx ** 2 + self.dy ** 2)) ** 2 * self.mse_dy ** 2) ** 0.5
-
-        self.mse_zenith = ((-1 / (self.s_dist * (1 - (self.dz / self.s_dist) ** 2) ** 0.5)) ** 2 * self.mse_dz ** 2 +
-                           (self.dz / (self.s_dist ** 2 * (1 - (self.dz / self.s_dist) ** 2) ** 0.5)) ** 2 * self.mse_s_dist ** 2) ** 0.5
-        self.mse_s_dist = self.mse_s_dist / (len(vx_2) ** 0.5)
-        self.mse_azimuth = self.mse_azimuth / (len(vx_2) ** 0.5)
-        self.mse_zenith = self.mse_zenith / (len(vx_2) ** 0.5)
+            self.calk_vector_mse(deltas)
+
+    def calk_vector_mse(self, deltas=None):
+        if deltas is None:
+            deltas = self.get_epoch_deltas()
+        residual_sums = self._residual_sums(deltas, (self.dx, self.dy, self.dz))
+        (self.mse_dx, self.mse_dy, self.mse_dz,
+         self.mse_s_dist, self.mse_azimuth, self.mse_zenith) = self.get_vector_mse(self.dx, self.dy, self.dz,
+                                                                                   self.s_dist, residual_sums,
+                                                                                   len(deltas))
+
+    @staticmethod
+    def get_vector_geometry(dx, dy, dz):
+        """
+        Наклонная и горизонтальная дальности, азимут и зенитное расстояние вектора (числа float).
+        Используется и в GnssVectorBatch, чтобы результаты совпадали побитово.
+
+        :return: (s_dist, h_dist, azimuth, zenith)
+        """
+        s_dist = (dx ** 2 + dy ** 2 + dz ** 2) ** 0.5
+        h_dist = (dx ** 2 + dy ** 2) ** 0.5
+        return s_dist, h_dist, math.atan2(dy, dx), math.acos(dz / s_dist)
+
+    @staticmethod
+    def get_vector_mse(dx, dy, dz, s_dist, residual_sums, count):
+        """
+        СКО приращений и элементов вектора по суммам квадратов уклонений (числа float).
+        Используется и в GnssVectorBatch, чтобы результаты совпадали побитово.
+
+        :param residual_sums: Суммы квадратов уклонений приращений dx, dy, dz от средних
+        :param count: Число общих эпох
+        :return: (mse_dx, mse_dy, mse_dz, mse_s_dist, mse_azimuth, mse_zenith)
+        """
+        vx_2, vy_2, vz_2 = residual_sums
+        mse_dx = (vx_2 / (count - 1)) ** 0.5
+        mse_dy = (vy_2 / (count - 1)) ** 0.5
+        mse_dz = (vz_2 / (count - 1)) ** 0.5
+
+        mse_s_dist = ((dx / s_dist) ** 2 * mse_dx ** 2 +
+                      (dy / s_dist) ** 2 * mse_dy ** 2 +
+                      (dz / s_dist) ** 2 * mse_dz ** 2) ** 0.5
+
+        mse_azimuth = ((-dy / (dx ** 2 + dy ** 2)) ** 2 * mse_dx ** 2 +
+                       (dx / (dx ** 2 + dy ** 2)) ** 2 * mse_dy ** 2) ** 0.5
+
+        mse_zenith = ((-1 / (s_dist * (1 - (dz / s_dist) ** 2) ** 0.5)) ** 2 * mse_dz ** 2 +
+                      (dz / (s_dist ** 2 * (1 - (dz / s_dist) ** 2) ** 0.5)) ** 2 * mse_s_dist ** 2) ** 0.5
+        return (mse_dx, mse_dy, mse_dz,
+                mse_s_dist / (count ** 0.5), mse_azimuth / (count ** 0.5), mse_zenith / (count ** 0.5))
 
     @staticmethod
     def calk_base_coordinates_for_point(point: GnssPoint):
@@ -0,0 +1,195 @@
+import numpy as np
+
+from GnssNet import GnssNet
+from GnssVector import GnssVector
+
+
+class GnssVectorView(GnssVector):
+    """
+    Легковесный вектор, все характеристики которого хранятся в массивах GnssVectorBatch.
+    Совместим с GnssVector (и с EqualisedNetwork), но ничего не пересчитывает при создании.
+    """
+
+    def __init__(self, batch, idx, color="black"):
+        self.batch = batch
+        self.idx = idx
+        self.gnss_net = batch.gnss_net
+        self.point_0 = batch.points[batch.idx_0[idx]]
+        self.point_1 = batch.points[batch.idx_1[idx]]
+        self.color = color
+        self.is_measured_vector = batch.is_measured_vector
+
+    def _value(self, name):
+        value = getattr(self.batch, name)
+        return None if value is None else float(value[self.idx])
+
+    x_0 = property(lambda self: float(self.batch.coordinates[self.batch.idx_0[self.idx], 0]))
+    y_0 = property(lambda self: float(self.batch.coordinates[self.batch.idx_0[self.idx], 1]))
+    z_0 = property(lambda self: float(self.batch.coordinates[self.batch.idx_0[self.idx], 2]))
+    x_1 = property(lambda self: float(self.batch.coordinates[self.batch.idx_1[self.idx], 0]))
+    y_1 = property(lambda self: float(self.batch.coordinates[self.batch.idx_1[self.idx], 1]))
+    z_1 = property(lambda self: float(self.batch.coordinates[self.batch.idx_1[self.idx], 2]))
+    dx = property(lambda self: self._value("dx"))
+    dy = property(lambda self: self._value("dy"))
+    dz = property(lambda self: self._value("dz"))
+    s_dist = property(lambda self: self._value("s_dist"))
+    h_dist = property(lambda self: self._value("h_dist"))
+    azimuth = property(lambda self: self._value("azimuth"))
+    zenith = property(lambda self: self._value("zenith"))
+    mse_dx = property(lambda self: self._value("mse_dx"))
+    mse_dy = property(lambda self: self._value("mse_dy"))
+    mse_dz = property(lambda self: self._value("mse_dz"))
+    mse_s_dist = property(lambda self: self._value("mse_s_dist"))
+    mse_azimuth = property(lambda self: self._value("mse_azimuth"))
+    mse_zenith = property(lambda self: self._value("mse_zenith"))
+
+    def calk_vector(self):
+        raise TypeError("GnssVectorView вычисляется в GnssVectorBatch")
+
+    def calk_vector_mse(self, deltas=None):
+        raise TypeError("GnssVectorView вычисляется в GnssVectorBatch")
+
+
+class GnssVectorBatch:
+
+    # Предельное число элементов в промежуточном массиве (векторы x эпохи)
+    MAX_CHUNK_ELEMENTS = 2 ** 22
+
+    def __init__(self, gnss_net: GnssNet, pairs, color="black", is_measured_vector=True):
+        """
+        Пакетный расчет всех векторов сети по общей таблице эпох.
+
+        :param gnss_net: Объект GnssNet
+        :param pairs: Список пар имен точек [(point_0_name, point_1_name), ...]
+        :param color: Цвет векторов или список цветов для каждой пары
+        :param is_measured_vector: Рассчитывать ли СКО векторов
+        """
+        self.gnss_net = gnss_net
+        self.is_measured_vector = is_measured_vector
+        self.points = []
+        point_idx = {}
+        self.idx_0, self.idx_1 = [], []
+        for point_0_name, point_1_name in pairs:
+            for point_name, idx_lst in (point_0_name, self.idx_0), (point_1_name, self.idx_1):
+                point = gnss_net.get_point_by_name(point_name)
+                if point.name not in point_idx:
+                    point_idx[point.name] = len(self.points)
+                    self.points.append(point)
+                idx_lst.append(point_idx[point.name])
+        self.idx_0 = np.array(self.idx_0, dtype=np.intp)
+        self.idx_1 = np.array(self.idx_1, dtype=np.intp)
+        self.coordinates = gnss_net.coordinates[[gnss_net.index_of(point) for point in self.points]].reshape(-1, 3)
+        self.epochs, self.table, self.valid = self._init_epoch_table()
+        self.count = None
+        self.dx, self.dy, self.dz = None, None, None
+        self.s_dist, self.azimuth, self.zenith = None, None, None
+        self.h_dist = None
+        self.mse_dx, self.mse_dy, self.mse_dz = None, None, None
+        self.mse_s_dist, self.mse_azimuth, self.mse_zenith = None, None, None
+        self.calk_vectors()
+        colors = [color] * len(self.idx_0) if isinstance(color, str) else list(color)
+        self.vectors = [GnssVectorView(self, idx, color=colors[idx]) for idx in range(len(self.idx_0))]
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def __iter__(self):
+        return iter(self.vectors)
+
+    def __getitem__(self, idx):
+        return self.vectors[idx]
+
+    def __repr__(self):
+        return f"GnssVectorBatch({len(self.vectors)} vectors, {len(self.epochs)} epochs)"
+
+    def _init_epoch_table(self):
+        """
+        Общая таблица эпох всех участвующих точек.
+
+        :return: массив эпох (E,), координаты (3, P, E) и маска наличия измерений (P, E)
+        """
+        measures = [point.measure_data for point in self.points]
+        if measures:
+            epochs = np.unique(np.concatenate([measure.epochs for measure in measures]))
+        else:
+            epochs = np.empty(0, dtype=np.int64)
+        table = np.zeros((3, len(measures), len(epochs)))
+        valid = np.zeros((len(measures), len(epochs)), dtype=bool)
+        for idx, measure in enumerate(measures):
+            pos = np.searchsorted(epochs, measure.epochs)
+            table[0, idx, pos] = measure.x
+            table[1, idx, pos] = measure.y
+            table[2, idx, pos] = measure.z
+            valid[idx, pos] = True
+        return epochs, table, valid
+
+    def _calk_chunk_sums(self, vectors_slice):
+        """
+        Для части векторов считает по общим эпохам количество эпох, суммы приращений
+        и суммы квадратов уклонений от среднего.
+        Приращения считаются массивами, а суммы и квадраты уклонений - как в GnssVector
+        (встроенный sum() и ** 2 для чисел float), поэтому средние и СКО совпадают побитово.
+        """
+        idx_0, idx_1 = self.idx_0[vectors_slice], self.idx_1[vectors_slice]
+        common = self.valid[idx_0] & self.valid[idx_1]
+        deltas = self.table[:, idx_1] - self.table[:, idx_0]
+        count = common.sum(axis=1)
+        mean = np.zeros((3, len(idx_0)))
+        v_sum = np.zeros((3, len(idx_0)))
+        for vector_idx, vector_common in enumerate(common):
+            if not count[vector_idx]:
+                continue
+            for axis, values in enumerate(deltas[:, vector_idx, vector_common].tolist()):
+                mean[axis, vector_idx] = axis_mean = sum(values) / len(values)
+                v_sum[axis, vector_idx] = sum([(value - axis_mean) ** 2 for value in values])
+        return count, mean, v_sum
+
+    def calk_vectors(self):
+        vectors_count = len(self.idx_0)
+        chunk = max(1, self.MAX_CHUNK_ELEMENTS // max(1, len(self.epochs)))
+        count = np.zeros(vectors_count, dtype=np.int64)
+        mean = np.zeros((3, vectors_count))
+        v_sum = np.zeros((3, vectors_count))
+        for start in range(0, vectors_count, chunk):
+            vectors_slice = slice(start, start + chunk)
+            count[vectors_slice], mean[:, vectors_slice], v_sum[:, vectors_slice] = \
+                self._calk_chunk_sums(vectors_slice)
+
+        # Векторы без общих эпох берутся по исходным координатам точек, как в GnssVector
+        no_measures = count == 0
+        mean[:, no_measures] = (self.coordinates[self.idx_1[no_measures]] -
+                                self.coordinates[self.idx_0[no_measures]]).T
+        self.count = count
+        self.dx, self.dy, self.dz = mean
+        # Дальности и углы считаются теми же формулами для чисел float, что и в GnssVector:
+        # ** 0.5 и ** 2 массивов NumPy могут отличаться в последнем знаке
+        geometry = [GnssVector.get_vector_geometry(*deltas) for deltas in mean.T.tolist()]
+        self.s_dist, self.h_dist, self.azimuth, self.zenith = np.array(geometry, dtype=np.float64).reshape(-1, 4).T
+        if self.is_measured_vector:
+            self.calk_vectors_mse(v_sum)
+
+    def calk_vectors_mse(self, v_sum):
+        if np.any(self.count < 2):
+            bad_vectors = [f"{self.points[i_0].name}-{self.points[i_1].name}"
+                           for i_0, i_1 in zip(self.idx_0[self.count < 2], self.idx_1[self.count < 2])]
+            raise ZeroDivisionError(f"Недостаточно общих эпох для оценки СКО векторов: {bad_vectors}")
+        mse = [GnssVector.get_vector_mse(dx, dy, dz, s_dist, residual_sums, count)
+               for dx, dy, dz, s_dist, residual_sums, count in zip(self.dx.tolist(), self.dy.tolist(),
+                                                                   self.dz.tolist(), self.s_dist.tolist(),
+                                                                   v_sum.T.tolist(), self.count.tolist())]
+        (self.mse_dx, self.mse_dy, self.mse_dz,
+         self.mse_s_dist, self.mse_azimuth, self.mse_zenith) = np.array(mse, dtype=np.float64).reshape(-1, 6).T
+
+
+if __name__ == "__main__":
+    from GnssMasureGenerator import GnssMeasureGenerator
+    from GnssNetGenerator import GnssNetGenerator
+
+    gnss_net = GnssNetGenerator(random_seed=42, num_points=5).create_gnss_net()
+    gmg = GnssMeasureGenerator(gnss_net, random_seed=42, num_of_measure=100)
+
+    batch = gnss_net.compute_vectors([("PUSN", "PVAU"), ("SIEY", "PVAU")], color="r")
+    print(batch)
+    for vector in batch:
+        print(vector)
+        print(GnssVector(gnss_net, vector.point_0.name, vector.point_1.name))
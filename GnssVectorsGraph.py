@@ -0,0 +1,91 @@
+class GnssVectorsGraph:
+
+    def __init__(self, point_names, base_point_names=()):
+        """
+        Граф векторов серии на системе непересекающихся множеств (union-find).
+        Ребро задается неупорядоченной парой имен точек, поэтому векторы A-B и B-A считаются одним ребром.
+
+        :param point_names: Имена всех точек сети
+        :param base_point_names: Имена исходных точек
+        """
+        self._parents = {name: name for name in point_names}
+        self._ranks = dict.fromkeys(self._parents, 0)
+        self.base_point_names = set(base_point_names)
+        self.edges = set()
+        self.duplicate_edges = []
+        self.cycle_edges = []
+
+    @staticmethod
+    def get_edge_key(point_0_name, point_1_name):
+        return tuple(sorted((point_0_name, point_1_name)))
+
+    def _find(self, name):
+        root = name
+        while self._parents[root] != root:
+            root = self._parents[root]
+        while self._parents[name] != root:
+            self._parents[name], name = root, self._parents[name]
+        return root
+
+    def add_edge(self, point_0_name, point_1_name):
+        """
+        Добавляет ребро. Повторное ребро запоминается в duplicate_edges,
+        ребро, замыкающее цикл, - в cycle_edges.
+        """
+        key = self.get_edge_key(point_0_name, point_1_name)
+        if key in self.edges:
+            self.duplicate_edges.append(key)
+            return
+        self.edges.add(key)
+        for name in key:
+            if name not in self._parents:
+                self._parents[name] = name
+                self._ranks[name] = 0
+        root_0, root_1 = self._find(key[0]), self._find(key[1])
+        if root_0 == root_1:
+            self.cycle_edges.append(key)
+            return
+        if self._ranks[root_0] < self._ranks[root_1]:
+            root_0, root_1 = root_1, root_0
+        self._parents[root_1] = root_0
+        if self._ranks[root_0] == self._ranks[root_1]:
+            self._ranks[root_0] += 1
+
+    def get_components(self):
+        """
+        Компоненты связности: список множеств имен точек.
+        """
+        components = {}
+        for name in self._parents:
+            components.setdefault(self._find(name), set()).add(name)
+        return list(components.values())
+
+    def get_unreachable_rovers(self):
+        """
+        Определяемые точки, не связанные векторами ни с одной исходной точкой.
+        """
+        unreachable = []
+        for component in self.get_components():
+            if component.isdisjoint(self.base_point_names):
+                unreachable += sorted(component - self.base_point_names)
+        return unreachable
+
+    def get_problems(self, allow_cycles=False, allow_duplicates=False):
+        """
+        Проверяет граф: связность всех точек, связь каждой определяемой точки с исходной,
+        отсутствие повторных ребер и (если запрещены) циклов.
+
+        :return: список описаний нарушений (пустой для правильной сети)
+        """
+        problems = []
+        components = self.get_components()
+        if len(components) > 1:
+            problems.append(f"Сеть распадается на {len(components)} части")
+        unreachable = self.get_unreachable_rovers()
+        if unreachable:
+            problems.append(f"Точки не связаны с исходными: {unreachable}")
+        if self.duplicate_edges and not allow_duplicates:
+            problems.append(f"Повторяющиеся векторы: {self.duplicate_edges}")
+        if self.cycle_edges and not allow_cycles:
+            problems.append(f"Векторы образуют замкнутые фигуры: {self.cycle_edges}")
+        return problems
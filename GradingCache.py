@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+
+import CONFIG
+from FileUtils import write_file_atomic
+from VariantCache import VariantCache
+
+
+class GradingCache:
+
+    # Версия правил проверки: при ее изменении все сохраненные результаты устаревают
+    GRADING_VERSION = 1
+
+    def __init__(self, cache_path, memory=None):
+        """
+        Кэш результатов проверки векторов: по файлу JSON на студента с вердиктом и сводкой уравнивания.
+        Ключ - SHA-256 файла векторов, SHA-256 имени студента и отпечаток параметров варианта
+        и допусков проверки, поэтому повторно проверяются только измененные работы.
+        Словарь memory (если задан) - быстрый слой в памяти перед файлами.
+
+        :param cache_path: Каталог кэша; None - только кэш в памяти
+        :param memory: Словарь {SHA-256 имени студента: запись}
+        """
+        self.cache_path = cache_path
+        self.memory = {} if memory is None else memory
+
+    @staticmethod
+    def get_student_hash(student_name):
+        return hashlib.sha256(student_name.strip().encode("UTF-8")).hexdigest()
+
+    @classmethod
+    def get_fingerprint(cls):
+        """
+        Отпечаток параметров варианта (VariantCache.get_fingerprint), допусков CHECK_* и версии правил проверки.
+        """
+        checks = {name: getattr(CONFIG, name) for name in dir(CONFIG) if name.startswith("CHECK_")}
+        fingerprint = {"variant": VariantCache.get_fingerprint(num_of_series=CONFIG.NUM_OF_SERIES,
+                                                               rng_mode="compat"),
+                       "checks": checks,
+                       "version": cls.GRADING_VERSION}
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True, default=str).encode("UTF-8")).hexdigest()[:16]
+
+    @staticmethod
+    def get_vectors_hash(vectors_path):
+        """
+        :return: SHA-256 файла векторов или None, если файла нет
+        """
+        try:
+            with open(vectors_path, "rb") as file:
+                return hashlib.sha256(file.read()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def get_key(cls, student_name, vectors_path):
+        """
+        Ключ результата проверки.
+
+        :return: строка ключа или None, если файла векторов нет
+        """
+        vectors_hash = cls.get_vectors_hash(vectors_path)
+        if vectors_hash is None:
+            return None
+        return f"{vectors_hash}_{cls.get_student_hash(student_name)}_{cls.get_fingerprint()}"
+
+    def _get_file_path(self, student_name):
+        return os.path.join(self.cache_path, f"{self.get_student_hash(student_name)}.json")
+
+    def load(self, student_name, key):
+        """
+        :return: запись {"key", "result", "summary"} или None, если результата с таким ключом нет
+        """
+        student_hash = self.get_student_hash(student_name)
+        record = self.memory.get(student_hash)
+        if record is None and self.cache_path is not None:
+            try:
+                with open(self._get_file_path(student_name), "rt", encoding="UTF-8") as file:
+                    record = json.load(file)
+            except (OSError, ValueError):
+                record = None
+        if record is None or record.get("key") != key:
+            return None
+        self.memory[student_hash] = record
+        return record
+
+    def save(self, student_name, key, result, summary=None):
+        """
+        Сохраняет результат проверки (заменяет прежний результат студента).
+
+        :return: сохраненная запись
+        """
+        record = {"key": key, "result": result, "summary": summary}
+        self.memory[self.get_student_hash(student_name)] = record
+        if self.cache_path is not None:
+            os.makedirs(self.cache_path, exist_ok=True)
+            write_file_atomic(self._get_file_path(student_name), json.dumps(record, ensure_ascii=False, indent=4))
+        return record
@@ -0,0 +1,122 @@
+import contextlib
+import datetime
+import glob
+import hashlib
+import io
+import json
+import os
+import zipfile
+
+import numpy as np
+
+import CONFIG
+from FileUtils import write_file_atomic
+from GnssMeasureData import GnssMeasureData
+from GnssNet import GnssNet
+
+
+class VariantCache:
+
+    # Версия формата и алгоритмов генерации: при ее изменении все сохраненные варианты устаревают
+    CACHE_VERSION = 1
+
+    # Параметры CONFIG, от которых зависит вариант; остальные настройки на кэш не влияют
+    GENERATION_PARAMETERS = ("NUM_POINTS", "COUNT_OF_BASE_POINTS", "MIN_DISTANCE", "XY_LIMITS", "Z_LIMITS",
+                             "NUM_OF_SERIES", "D_TIME", "NUM_OF_MEASURES", "GNSS_DISPLACEMENT", "PASS_POINT_PROB",
+                             "CROP_PERC", "MSE_A", "MSE_B", "MSE_Z_SCALER")
+
+    def __init__(self, cache_path):
+        """
+        Дисковый кэш вариантов: по файлу .npz на студента и набор параметров варианта с базовой сетью
+        и измерениями всех серий. Имя файла состоит из SHA-256 имени студента и отпечатка
+        (get_fingerprint), поэтому при изменении параметров генерации в CONFIG (или месяца и года,
+        от которых зависят даты измерений) вариант генерируется заново, а устаревший файл удаляется.
+        Варианты одного студента с разными параметрами (число серий, режим генератора) хранятся рядом.
+
+        :param cache_path: Каталог кэша
+        """
+        self.cache_path = cache_path
+
+    @staticmethod
+    def _get_hash(data):
+        return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("UTF-8")).hexdigest()[:16]
+
+    @classmethod
+    def get_fingerprint(cls, **parameters):
+        """
+        Отпечаток варианта из двух частей: параметров варианта и параметров генерации
+        (GENERATION_PARAMETERS из CONFIG, текущие год и месяц, версия кэша).
+
+        :param parameters: Параметры варианта (например, число серий и режим генератора)
+        :return: строка "<параметры варианта>_<параметры генерации>"
+        """
+        current_time = datetime.datetime.now()
+        config = {name: getattr(CONFIG, name) for name in cls.GENERATION_PARAMETERS}
+        generation = {"config": config,
+                      "year": current_time.year,
+                      "month": current_time.month,
+                      "version": cls.CACHE_VERSION}
+        return f"{cls._get_hash(parameters)}_{cls._get_hash(generation)}"
+
+    def get_file_path(self, name_hash, fingerprint):
+        return os.path.join(self.cache_path, f"{name_hash}_{fingerprint}.npz")
+
+    def load(self, name_hash, fingerprint):
+        """
+        Загружает вариант из кэша.
+
+        :param name_hash: SHA-256 имени студента (шестнадцатеричная строка)
+        :param fingerprint: Отпечаток параметров генерации
+        :return: (базовая сеть, список сетей серий) или None, если варианта нет или файл поврежден
+        """
+        path = self.get_file_path(name_hash, fingerprint)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                base_gnss_net = GnssNet()
+                base_gnss_net.add_points(coordinates=data["coordinates"],
+                                         names=data["names"].tolist(),
+                                         point_types=data["point_types"].tolist())
+                measured_gnss_nets = []
+                for series in range(int(data["num_of_series"])):
+                    gnss_net = base_gnss_net.copy()
+                    bounds = np.cumsum(np.concatenate(([0], data[f"series_{series}_counts"])))
+                    epochs, xyz = data[f"series_{series}_epochs"], data[f"series_{series}_xyz"]
+                    for point, start, end in zip(gnss_net, bounds[:-1].tolist(), bounds[1:].tolist()):
+                        point.measure_data = GnssMeasureData(epochs[start:end], *xyz[start:end].T)
+                    measured_gnss_nets.append(gnss_net)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+        return base_gnss_net, measured_gnss_nets
+
+    def save(self, name_hash, fingerprint, base_gnss_net, measured_gnss_nets):
+        """
+        Сохраняет вариант в кэш (атомарно) и удаляет устаревшие файлы этого студента с теми же параметрами варианта.
+
+        :param name_hash: SHA-256 имени студента (шестнадцатеричная строка)
+        :param fingerprint: Отпечаток параметров генерации
+        :param base_gnss_net: Базовая сеть
+        :param measured_gnss_nets: Список сетей серий
+        """
+        arrays = {"coordinates": np.asarray(base_gnss_net.coordinates),
+                  "names": np.array([str(name) for name in base_gnss_net.names]),
+                  "point_types": np.array([point.point_type for point in base_gnss_net]),
+                  "num_of_series": np.array(len(measured_gnss_nets))}
+        for series, gnss_net in enumerate(measured_gnss_nets):
+            measures = [point.measure_data for point in gnss_net]
+            arrays[f"series_{series}_counts"] = np.array([len(measure) for measure in measures], dtype=np.int64)
+            arrays[f"series_{series}_epochs"] = np.concatenate([measure.epochs for measure in measures] +
+                                                               [np.empty(0, dtype=np.int64)])
+            arrays[f"series_{series}_xyz"] = np.concatenate([measure.xyz for measure in measures] +
+                                                            [np.empty((0, 3))])
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        os.makedirs(self.cache_path, exist_ok=True)
+        path = self.get_file_path(name_hash, fingerprint)
+        write_file_atomic(path, buffer.getvalue())
+        # Устаревают только файлы с теми же параметрами варианта, но другими параметрами генерации
+        parameters_key = fingerprint.partition("_")[0]
+        for stale_path in glob.glob(os.path.join(glob.escape(self.cache_path), f"{name_hash}_{parameters_key}_*.npz")):
+            if stale_path != path:
+                # Файл мог удалить параллельный процесс, сохранивший тот же вариант
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(stale_path)
@@ -2,54 +2,118 @@ import hashlib
 import json
 import os
 import random
-from copy import deepcopy
 import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 from CONFIG import NUM_POINTS, COUNT_OF_BASE_POINTS, MIN_DISTANCE, XY_LIMITS, Z_LIMITS, NUM_OF_SERIES, D_TIME, \
     NUM_OF_MEASURES, GNSS_DISPLACEMENT, BASE_PATH, PASS_POINT_PROB
 from EqualisedNetwork import EqualisedNetwork
+from FileUtils import write_file_atomic
 from GnssMasureGenerator import GnssMeasureGenerator
 from GnssNetGenerator import GnssNetGenerator
-from GnssVector import GnssVector
+from VariantCache import VariantCache
 
 
 class VariantGenerator:
 
-    def __init__(self, student_name: str, num_of_series=NUM_OF_SERIES):
+    # Режимы генераторов случайных чисел варианта
+    RNG_MODES = ("compat", "streams")
+
+    def __init__(self, student_name: str, num_of_series=NUM_OF_SERIES, rng_mode="compat", cache_path=None):
+        """
+        Вариант студента, полностью определяемый SHA-256 его имени.
+        Глобальный модуль random не используется, поэтому варианты можно строить
+        одновременно в потоках или вперемешку в одном процессе.
+
+        :param student_name: ФИО студента
+        :param num_of_series: Количество серий измерений
+        :param rng_mode: "compat" - один собственный random.Random(хеш имени), из которого числа берутся
+                         в прежнем порядке: варианты совпадают с выданными ранее;
+                         "streams" - np.random.SeedSequence(хеш имени) с независимыми подпотоками
+                         для сети, дат начала измерений и каждой серии (внутри серии - каждой точки)
+        :param cache_path: Каталог дискового кэша вариантов (VariantCache); None - без кэша.
+                           Вариант из кэша совпадает со сгенерированным, кэш сбрасывается при изменении CONFIG
+        """
         self.student_name = student_name.strip()
         self.num_of_series = num_of_series
-        random.seed(self._get_hash())
-        self.base_gnss_net = GnssNetGenerator(num_points=NUM_POINTS,
-                                              count_of_base_point=COUNT_OF_BASE_POINTS,
-                                              min_distance=MIN_DISTANCE,
-                                              xy_limits=XY_LIMITS,
-                                              z_limit=Z_LIMITS).create_gnss_net()
+        self.rng_mode = rng_mode
+        self.cache = None if cache_path is None else VariantCache(cache_path)
         self.measured_gnss_nets = []
-        self._create_measures()
+        if not self._load_from_cache():
+            net_rng, self._dates_rng, self._series_rngs = self._init_rngs()
+            self.base_gnss_net = GnssNetGenerator(num_points=NUM_POINTS,
+                                                  count_of_base_point=COUNT_OF_BASE_POINTS,
+                                                  min_distance=MIN_DISTANCE,
+                                                  xy_limits=XY_LIMITS,
+                                                  z_limit=Z_LIMITS,
+                                                  rng=net_rng).create_gnss_net()
+            self._create_measures()
+            self._save_to_cache()
         self.eq_net = None
 
+    def _get_cache_key(self):
+        name_hash = hashlib.sha256(self.student_name.encode("UTF-8")).hexdigest()
+        return name_hash, VariantCache.get_fingerprint(num_of_series=self.num_of_series, rng_mode=self.rng_mode)
+
+    def _load_from_cache(self):
+        if self.cache is None:
+            return False
+        cached = self.cache.load(*self._get_cache_key())
+        if cached is None:
+            return False
+        self.base_gnss_net, self.measured_gnss_nets = cached
+        return True
+
+    def _save_to_cache(self):
+        if self.cache is not None:
+            self.cache.save(*self._get_cache_key(), self.base_gnss_net, self.measured_gnss_nets)
+
     def _get_hash(self):
         hash_ = int(hashlib.sha256(self.student_name.encode("UTF-8")).hexdigest(), 16)
         # hash_ = int(hashlib.sha256(self.name.encode("UTF-8")).hexdigest(), 16) % 10 ** 8
         return hash_
 
+    def _init_rngs(self):
+        """
+        Генераторы случайных чисел для сети, дат начала измерений и каждой серии.
+
+        :return: (генератор сети, генератор дат, список генераторов серий)
+        """
+        if self.rng_mode == "compat":
+            rng = random.Random(self._get_hash())
+            return rng, rng, [rng] * self.num_of_series
+        if self.rng_mode == "streams":
+            net_seed, dates_seed, *series_seeds = np.random.SeedSequence(self._get_hash()).spawn(
+                2 + self.num_of_series)
+            return (np.random.default_rng(net_seed), np.random.default_rng(dates_seed),
+                    [np.random.default_rng(series_seed) for series_seed in series_seeds])
+        raise ValueError(f"Неизвестный режим генератора случайных чисел: {self.rng_mode}")
+
     def _get_start_measure_month_day(self):
         current_time = datetime.datetime.now()
-        month = random.randint(1, current_time.month - 1)
-        day = random.randint(1, 28 - self.num_of_series)
+        if isinstance(self._dates_rng, np.random.Generator):
+            month = int(self._dates_rng.integers(1, current_time.month - 1, endpoint=True))
+            day = int(self._dates_rng.integers(1, 28 - self.num_of_series, endpoint=True))
+            return month, day
+        month = self._dates_rng.randint(1, current_time.month - 1)
+        day = self._dates_rng.randint(1, 28 - self.num_of_series)
         return month, day
 
     def _create_measures(self):
         month, day = self._get_start_measure_month_day()
         for series in range(self.num_of_series):
-            gnss_net_copy = deepcopy(self.base_gnss_net)
+            # Серии разделяют геометрию базовой сети; собственные у каждой серии только измерения
+            gnss_net_copy = self.base_gnss_net.copy()
             gmg = GnssMeasureGenerator(gnss_net_copy,
                                        d_time=D_TIME,
                                        num_of_measure=NUM_OF_MEASURES,
                                        gnss_displacement=GNSS_DISPLACEMENT,
                                        pass_point_prob=PASS_POINT_PROB,
                                        month=month,
-                                       day=day)
+                                       day=day,
+                                       rng=self._series_rngs[series])
             self.measured_gnss_nets.append(gnss_net_copy)
             day += 1
 
@@ -59,10 +123,27 @@ class VariantGenerator:
             key = str(series + 1)
             blank_vectors = [["####", "####"] for _ in range(NUM_POINTS - 1)]
             blank_vectors_dict[key] = blank_vectors
-        with open(os.path.join(vectors_path, f"Vectors_{self.student_name}.json"), "w") as file:
-            file.write(json.dumps(blank_vectors_dict, sort_keys=True, indent=4))
+        write_file_atomic(os.path.join(vectors_path, f"Vectors_{self.student_name}.json"),
+                          json.dumps(blank_vectors_dict, sort_keys=True, indent=4),
+                          encoding=None)
+
+    @staticmethod
+    def _get_point_file_lines(point):
+        """
+        Строки файла измерений точки: заголовок и по строке на эпоху.
+        """
+        measure_data = point.measure_data
+        yield "DATE_TIME,X,Y,Z\n"
+        for time, x, y, z in zip(measure_data.times, measure_data.x.tolist(),
+                                 measure_data.y.tolist(), measure_data.z.tolist()):
+            yield f"{time},{x},{y},{z}\n"
 
     def save_variant(self, base_path=BASE_PATH, students_group="", create_blank_vectors_json=False):
+        """
+        Сохраняет вариант: файлы измерений точек по сериям и файл исходных пунктов.
+        Каждый файл записывается целиком одним вызовом через временный файл и переименование,
+        поэтому повторное сохранение заменяет файлы, а не дописывает в них данные.
+        """
         variant_path = os.path.join(base_path, f"ММОМГИ_КР_{datetime.datetime.now().year}", students_group,
                                     "Вариант", self.student_name)
         os.makedirs(variant_path, exist_ok=True)
@@ -75,18 +156,13 @@ class VariantGenerator:
             series_path = os.path.join(variant_path, f"Серия_{idx + 1}")
             os.makedirs(series_path, exist_ok=True)
             for point in net:
-                with open(os.path.join(series_path, f"{point.name}.txt"), "a", encoding="UTF-8") as file:
-                    file.write(f"DATE_TIME,X,Y,Z\n")
-                for time, measure in point:
-                    with open(os.path.join(series_path, f"{point.name}.txt"), "a", encoding="UTF-8") as file:
-                        file.write(f"{time},{measure["x"]},{measure["y"]},{measure["z"]}\n")
-        with open(os.path.join(variant_path, "Base_points.txt"), "a", encoding="UTF-8") as file:
-            file.write(f"Point_name,X,Y,Z\n")
-            for point in self.base_gnss_net:
-                if point.is_base():
-                    file.write(f"{point.name},{point.x},{point.y},{point.z}\n")
-
-    def solve_variant(self, base_path=BASE_PATH, students_group=""):
+                write_file_atomic(os.path.join(series_path, f"{point.name}.txt"), self._get_point_file_lines(point))
+        base_points_lines = [f"Point_name,X,Y,Z\n"]
+        base_points_lines += [f"{point.name},{point.x},{point.y},{point.z}\n"
+                              for point in self.base_gnss_net if point.is_base()]
+        write_file_atomic(os.path.join(variant_path, "Base_points.txt"), base_points_lines)
+
+    def solve_variant(self, base_path=BASE_PATH, students_group="", calculate=True):
         vector_path = os.path.join(base_path, f"ММОМГИ_КР_{datetime.datetime.now().year}", students_group,
                                    "Векторы", self.student_name, f"Vectors_{self.student_name}.json")
         with open(vector_path, 'r', encoding='utf-8') as file:
@@ -96,11 +172,10 @@ class VariantGenerator:
         for series, vectors in vectors_dict.items():
             series = int(series)
             color = "r" if series == 1 else "b"
-            for vector in vectors:
-                v = GnssVector(self.measured_gnss_nets[series - 1], point_0_name=vector[0],
-                               point_1_name=vector[1], color=color)
+            for v in self.measured_gnss_nets[series - 1].compute_vectors(vectors, color=color):
                 self.eq_net.add_gnss_vector(v)
-        self.eq_net.calculate()
+        if calculate:
+            self.eq_net.calculate()
         return self.eq_net
 
     def plot(self):
@@ -110,18 +185,71 @@ class VariantGenerator:
             self.eq_net.plot_eq_net()
 
 
+def _create_and_save_variants(students, create_blank_vectors_json, return_variants):
+    """
+    Создает и сохраняет варианты для списка строк (student_name, student_group) по порядку.
+    Выполняется в процессе пула create_variants_for_students_file.
+
+    :return: список объектов VariantGenerator (если return_variants) или None для каждой строки
+    """
+    variants = []
+    for student_name, student_group in students:
+        vg = VariantGenerator(student_name)
+        vg.save_variant(students_group=student_group,
+                        create_blank_vectors_json=create_blank_vectors_json)
+        variants.append(vg if return_variants else None)
+    return variants
+
+
 def create_variants_for_students_file(students_file, base_path=BASE_PATH,
                                       create_blank_vectors_json=False,
-                                      plot_gnss_net=False):
+                                      plot_gnss_net=False,
+                                      workers=1):
+    """
+    Создает варианты для всех студентов из файла "ФИО;группа".
+
+    Каждый вариант определяется только SHA-256 имени студента, поэтому при workers > 1 варианты
+    строятся и сохраняются параллельно в пуле процессов с тем же результатом, что и последовательно.
+    Повторяющиеся строки одного студента обрабатываются одной задачей в исходном порядке.
+    Ход работы печатается в порядке строк файла.
+
+    :param students_file: Имя файла со списком студентов в каталоге base_path
+    :param base_path: Каталог файла со списком студентов
+    :param create_blank_vectors_json: Создавать ли пустые шаблоны файлов векторов
+    :param plot_gnss_net: Показывать ли схему сети каждого варианта
+    :param workers: Число процессов; 1 - последовательно, None - по числу ядер
+    """
     with (open(os.path.join(base_path, students_file), "rt", encoding="UTF-8") as file):
-        for student in file:
-            student_name, student_group = student.strip().split(";")
-            vg = VariantGenerator(student_name)
-            vg.save_variant(students_group=student_group,
-                            create_blank_vectors_json=create_blank_vectors_json)
+        students = [tuple(student.strip().split(";")) for student in file]
+
+    if workers == 1:
+        for student_name, student_group in students:
+            vg, = _create_and_save_variants([(student_name, student_group)], create_blank_vectors_json,
+                                            return_variants=plot_gnss_net)
             print(student_name, student_group)
             if plot_gnss_net:
                 vg.plot()
+        return
+
+    # Строки одного студента попадают в одну задачу, чтобы дописывание файлов шло в исходном порядке
+    tasks = {}
+    for line_idx, (student_name, student_group) in enumerate(students):
+        tasks.setdefault((student_name.strip(), student_group), []).append(line_idx)
+    task_of_line = {line_idx: (task_idx, position)
+                    for task_idx, lines in enumerate(tasks.values())
+                    for position, line_idx in enumerate(lines)}
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_create_and_save_variants, [students[line_idx] for line_idx in lines],
+                                   create_blank_vectors_json, plot_gnss_net)
+                   for lines in tasks.values()]
+        for line_idx, (student_name, student_group) in enumerate(students):
+            task_idx, position = task_of_line[line_idx]
+            if task_idx not in results:
+                results[task_idx] = futures[task_idx].result()
+            print(student_name, student_group)
+            if plot_gnss_net:
+                results[task_idx][position].plot()
 
 if __name__ == "__main__":
     name = "Выстрчил Михаил Георгиевич"
@@ -1,33 +1,56 @@
 import json
 import os
 import datetime
-from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 import pandas as pd
 from tabulate import tabulate
 
-from CONFIG import BASE_PATH, NUM_POINTS
+from CONFIG import (BASE_PATH, NUM_POINTS, VARIANT_CACHE_PATH, GRADING_CACHE_PATH, CHECK_ALLOW_CYCLES,
+                    CHECK_ALLOW_DUPLICATES)
+from EqSolutionChecker import EqSolutionChecker
 from EqualisedNetwork import EqualisedNetwork
+from FileUtils import write_file_atomic
 from GnssNet import GnssNet, PointNameException
 from GnssVector import GnssVector
+from GnssVectorsGraph import GnssVectorsGraph
+from GradingCache import GradingCache
 from VariantGenerator import VariantGenerator
 
 
 class VectorTester:
 
+    # Слой в памяти кэша результатов проверки GradingCache: {SHA-256 имени студента: запись}
     _results = {}
 
     def __init__(self, student_name):
         self.student_name = student_name
-        self.vg = VariantGenerator(student_name)
+        self.vg = VariantGenerator(student_name, cache_path=VARIANT_CACHE_PATH)
         self.vectors_net = []
+        self.solution_summary = None
 
     @classmethod
     def check_vectors_for_students_group(cls,
                                          students_file,
                                          students_file_with_good_vectors,
                                          base_path=BASE_PATH,
+                                         workers=1,
                                          ):
+        """
+        Проверяет векторы всех студентов из файла "ФИО;группа" и сохраняет отчет.
+
+        При workers > 1 студенты проверяются параллельно в пуле процессов. Строки отчета и файла
+        студентов с принятыми векторами идут в порядке файла студентов, как и при последовательной
+        проверке; файл с принятыми векторами перезаписывается атомарно один раз в конце.
+        Повторяющиеся строки одного студента проверяются один раз. Результаты неизмененных
+        файлов векторов берутся из кэша GradingCache (каталог GRADING_CACHE_PATH).
+
+        :param students_file: Файл со списком студентов
+        :param students_file_with_good_vectors: Файл студентов с принятыми векторами
+        :param base_path: Каталог с работами студентов
+        :param workers: Число процессов; 1 - последовательно, None - по числу ядер
+        """
         result = {"student": [],
                   "group": [],
                   "result": []}
@@ -40,21 +63,35 @@ class VectorTester:
                 pass
             good_vectors_student = []
         with open(students_file, "rt", encoding="UTF-8") as s_file:
-            for student_line in s_file:
-                student, group = student_line.strip().split(";")
-                if student_line in good_vectors_student:
-                    students_file_with_good_vectors_list.append(student_line)
-                    student_result = "OK"
-                else:
-                    student_result = cls(student).check_vectors(base_path=base_path, students_group=group)
-                    if student_result == "OK":
-                        students_file_with_good_vectors_list.append(student_line)
-                result["student"].append(student)
-                result["group"].append(group)
-                result["result"].append(student_result)
-        with open(students_file_with_good_vectors, "w", encoding="UTF-8") as sfwgv:
-            for student_line in students_file_with_good_vectors_list:
-                sfwgv.write(student_line)
+            student_lines = s_file.readlines()
+
+        tasks = {}
+        for student_line in student_lines:
+            if student_line not in good_vectors_student:
+                tasks.setdefault(tuple(student_line.strip().split(";")), None)
+        if workers == 1:
+            results = {task: cls._check_student_vectors(*task, base_path) for task in tasks}
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {task: executor.submit(cls._check_student_vectors, *task, base_path) for task in tasks}
+                results = {task: future.result() for task, future in futures.items()}
+            # Записи, созданные в процессах пула, переносятся в кэш в памяти этого процесса
+            for (student, _), record in results.items():
+                if record["key"] is not None:
+                    cls._results[GradingCache.get_student_hash(student)] = record
+
+        for student_line in student_lines:
+            student, group = student_line.strip().split(";")
+            if student_line in good_vectors_student:
+                student_result = "OK"
+            else:
+                student_result = results[(student, group)]["result"]
+            if student_result == "OK":
+                students_file_with_good_vectors_list.append(student_line)
+            result["student"].append(student)
+            result["group"].append(group)
+            result["result"].append(student_result)
+        write_file_atomic(students_file_with_good_vectors, students_file_with_good_vectors_list)
 
         os.makedirs(os.path.join("Результаты проверки"), exist_ok=True)
         path = os.path.join("Результаты проверки", f"Проверка_векторов_{str(datetime.datetime.now())}.txt")
@@ -65,6 +102,39 @@ class VectorTester:
             print(tab)
             file.write(tab)
 
+    @classmethod
+    def _check_student_vectors(cls, student, group, base_path):
+        """
+        Проверка одного студента с кэшем результатов; выполняется и в процессе пула
+        check_vectors_for_students_group.
+
+        Если проверяющий уже вынес решение по этому файлу векторов (EqSolutionChecker.get_decision),
+        оно применяется без проверки и кэша.
+        Решения, переданные на ручную проверку (EqSolutionChecker.BORDERLINE), не кэшируются:
+        пока решения проверяющего нет, работа проверяется заново при каждом запуске.
+
+        :return: запись {"key", "result", "summary"}; key = None, если результат не кэшируется
+                 (нет файла векторов, решение на ручной проверке или решение проверяющего)
+        """
+        vectors_path = cls.get_vectors_path(student, base_path, group)
+        decision = EqSolutionChecker().get_decision(GradingCache.get_vectors_hash(vectors_path))
+        if decision is not None:
+            result = "OK" if decision == EqSolutionChecker.OK else "Решение не принято при ручной проверке!\n"
+            print(f"{student}: {result.strip()} (решение проверяющего)")
+            return {"key": None, "result": result, "summary": {"verdict": decision, "problems": []}}
+        cache = GradingCache(GRADING_CACHE_PATH, memory=cls._results)
+        key = GradingCache.get_key(student, vectors_path)
+        record = None if key is None else cache.load(student, key)
+        if record is not None:
+            print(f"{student}: {record['result'].strip()} (результат из кэша)")
+            return record
+        vt = cls(student)
+        result = vt.check_vectors(base_path=base_path, students_group=group)
+        is_on_review = vt.solution_summary is not None and vt.solution_summary["verdict"] == EqSolutionChecker.BORDERLINE
+        if key is None or is_on_review:
+            return {"key": None, "result": result, "summary": vt.solution_summary}
+        return cache.save(student, key, result, vt.solution_summary)
+
     def check_vectors(self, base_path=BASE_PATH, students_group=""):
         print(self.student_name)
         try:
@@ -105,9 +175,13 @@ class VectorTester:
             return result
         return "OK"
 
+    @staticmethod
+    def get_vectors_path(student_name, base_path, students_group):
+        return os.path.join(base_path, f"ММОМГИ_КР_{datetime.datetime.now().year}", students_group,
+                            "Векторы", student_name, f"Vectors_{student_name}.json")
+
     def _init_vectors_dict(self, base_path, students_group):
-        vector_path = os.path.join(base_path, f"ММОМГИ_КР_{datetime.datetime.now().year}", students_group,
-                                   "Векторы", self.student_name, f"Vectors_{self.student_name}.json")
+        vector_path = self.get_vectors_path(self.student_name, base_path, students_group)
         with open(vector_path, 'r', encoding='utf-8') as file:
             vectors_dict = json.load(file)
         return vectors_dict
@@ -136,13 +210,8 @@ class VectorTester:
         for series, vectors in vectors_dict.items():
             series = int(series)
             color = "r" if series == 1 else "b"
-            vectors_net = []
-            for vector in vectors:
-                # v = GnssVector(self.vg.base_gnss_net, point_0_name=vector[0],
-                #                point_1_name=vector[1], color=color, is_measured_vector=True)
-                v = GnssVector(self.vg.measured_gnss_nets[series - 1], point_0_name=vector[0],
-                               point_1_name=vector[1], color=color, is_measured_vector=True)
-                vectors_net.append(v)
+            vectors_net = list(self.vg.measured_gnss_nets[series - 1].compute_vectors(vectors, color=color,
+                                                                                       is_measured_vector=True))
             self.vectors_net.append(vectors_net)
 
     def _check_vectors_doubler_between_series(self):
@@ -157,8 +226,7 @@ class VectorTester:
         return res_str
 
     def _check_double_base_points_in_vectors(self):
-        vn_nets = deepcopy(self.vectors_net)
-        vn_nets= [vector for vector_net in vn_nets for vector in vector_net]
+        vn_nets = [vector for vector_net in self.vectors_net for vector in vector_net]
         bad_vectors = []
         for vector in vn_nets:
             if vector.point_0.is_base() and vector.point_1.is_base():
@@ -169,41 +237,56 @@ class VectorTester:
         return res_str
 
     def _check_vectors_nets_graf(self):
-        vn_nets = deepcopy(self.vectors_net)
-        # vn_nets.append([vector for vector_net in vn_nets for vector in vector_net])
-        answers = []
-        for v_net in vn_nets:
+        """
+        Автоматическая проверка схемы каждой серии: все точки связаны векторами, каждая определяемая
+        точка связана с исходной, нет повторных векторов и замкнутых фигур (если они запрещены
+        CHECK_ALLOW_DUPLICATES и CHECK_ALLOW_CYCLES). Описания нарушений идут в результате
+        отдельными строками после "Неправильная сеть №N".
+        """
+        point_names = [point.name for point in self.vg.base_gnss_net]
+        base_point_names = [point.name for point in self.vg.base_gnss_net.get_base_points()]
+        res_str = ""
+        for idx, v_net in enumerate(self.vectors_net):
+            graph = GnssVectorsGraph(point_names, base_point_names)
+            for v in v_net:
+                graph.add_edge(v.point_0.name, v.point_1.name)
+            problems = graph.get_problems(allow_cycles=CHECK_ALLOW_CYCLES, allow_duplicates=CHECK_ALLOW_DUPLICATES)
+            if problems:
+                res_str += f"Неправильная сеть №{idx + 1}\n"
+                res_str += "".join(f"    {problem}\n" for problem in problems)
+        return res_str
+
+    def plot_vectors_nets(self):
+        # Векторы только читаются: сеть EqualisedNetwork строится без уравнивания
+        for v_net in self.vectors_net:
             eq = EqualisedNetwork()
             for v in v_net:
                 eq.add_gnss_vector(v)
             eq.plot_eq_net()
-            answers.append(input("It`s a correct Net? (Y/N): "))
-        res_str = ""
-        for idx, answer in enumerate(answers):
-            if answer.upper() == "N":
-                res_str += f"Неправильная сеть №{idx + 1}\n"
-            elif answer.upper() == "Y":
-                continue
-            else:
-                print(f"Некорректный ответ на сеть №{idx + 1}\n")
-                res_str = self._check_vectors_nets_graf()
-        return res_str
 
     def _check_nets_eq_solution(self, base_path, students_group):
-        self.vg.solve_variant(base_path=base_path, students_group=students_group)
-        eq = deepcopy(self.vg.eq_net.result_df).round(3)
+        """
+        Уравнивает сеть студента и проверяет решение правилами EqSolutionChecker.
+        """
+        try:
+            self.vg.solve_variant(base_path=base_path, students_group=students_group)
+        except (np.linalg.LinAlgError, ValueError, ZeroDivisionError):
+            return "Сеть не уравнивается!\n"
+        eq = self.vg.eq_net.result_df.round(3)
         print(tabulate(eq, headers='keys', tablefmt='pretty'))
-        answer = input("It`s normal solution? (Y/N): ")
-        res_str = ""
-        if answer.upper() == "N":
-            res_str += "Сеть не уравнивается!\n"
-        elif answer.upper() == "Y":
-            return res_str
-        else:
-            res_str = self._check_nets_eq_solution(base_path, students_group)
-        return res_str
-
-
+        vectors_hash = GradingCache.get_vectors_hash(self.get_vectors_path(self.student_name, base_path,
+                                                                          students_group))
+        verdict, problems, metrics = EqSolutionChecker().check(self.vg.eq_net, self.vg.base_gnss_net,
+                                                               student_name=self.student_name,
+                                                               vectors_hash=vectors_hash)
+        self.solution_summary = {"verdict": verdict, "problems": problems, **metrics}
+        for problem in problems:
+            print(problem)
+        if verdict == EqSolutionChecker.FAIL:
+            return "Сеть не уравнивается!\n"
+        if verdict == EqSolutionChecker.BORDERLINE:
+            return "Решение передано на ручную проверку!\n"
+        return ""
 
 
 if __name__ == "__main__":
@@ -0,0 +1,200 @@
+import datetime
+import fnmatch
+import os
+import queue
+import time
+import traceback
+
+from CONFIG import BASE_PATH, WATCH_DEBOUNCE, WATCH_POLL_INTERVAL
+from FileUtils import write_file_atomic
+from VectorTester import VectorTester
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class VectorsWatcher:
+
+    VECTORS_FILE_PATTERN = "Vectors_*.json"
+
+    def __init__(self, students_file_with_good_vectors, base_path=BASE_PATH, report_path=None,
+                 debounce=WATCH_DEBOUNCE, poll_interval=WATCH_POLL_INTERVAL, use_inotify=True):
+        """
+        Режим наблюдения: следит за каталогами ММОМГИ_КР_<год>/<группа>/Векторы/<студент>/ и
+        проверяет только тех студентов, чей файл Vectors_*.json изменился. Изменения отслеживаются
+        через inotify (пакет watchdog), а без него - опросом времени изменения файлов.
+        Проверка начинается, когда файл не менялся debounce секунд, поэтому серия записей
+        одного файла дает одну проверку. Результаты дописываются в отчет, принятые студенты -
+        в файл студентов с принятыми векторами (атомарно).
+
+        :param students_file_with_good_vectors: Файл студентов с принятыми векторами
+        :param base_path: Каталог с работами студентов
+        :param report_path: Файл отчета; по умолчанию - в каталоге "Результаты проверки"
+        :param debounce: Время без изменений файла перед проверкой, с
+        :param poll_interval: Период опроса файлов (и проверки очереди изменений), с
+        :param use_inotify: Использовать ли inotify (если установлен watchdog)
+        """
+        self.students_file_with_good_vectors = students_file_with_good_vectors
+        self.base_path = base_path
+        self.root_path = os.path.join(base_path, f"ММОМГИ_КР_{datetime.datetime.now().year}")
+        if report_path is None:
+            os.makedirs("Результаты проверки", exist_ok=True)
+            report_path = os.path.join("Результаты проверки",
+                                       f"Наблюдение_векторов_{datetime.datetime.now():%Y-%m-%d_%H-%M-%S}.txt")
+        self.report_path = report_path
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and Observer is not None
+        # Путь файла векторов -> время последнего изменения (time.monotonic)
+        self._pending = {}
+        self._events = queue.Queue()
+        self._snapshot = {}
+
+    def _parse_vectors_path(self, path):
+        """
+        :return: (студент, группа) для файла векторов студента или None для других файлов
+        """
+        parts = os.path.relpath(path, self.root_path).split(os.sep)
+        if len(parts) != 4 or parts[1] != "Векторы" or not fnmatch.fnmatch(parts[3], self.VECTORS_FILE_PATTERN):
+            return None
+        group, _, student, _ = parts
+        return student, group
+
+    def _scan(self):
+        """
+        :return: словарь {путь файла векторов: (время изменения, размер)}
+        """
+        snapshot = {}
+        for dir_path, _, file_names in os.walk(self.root_path):
+            for file_name in fnmatch.filter(file_names, self.VECTORS_FILE_PATTERN):
+                path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _poll(self):
+        snapshot = self._scan()
+        for path in snapshot.keys() | self._snapshot.keys():
+            if snapshot.get(path) != self._snapshot.get(path):
+                self._pending[path] = time.monotonic()
+        self._snapshot = snapshot
+
+    def _collect_events(self):
+        while True:
+            try:
+                path = self._events.get_nowait()
+            except queue.Empty:
+                return
+            self._pending[path] = time.monotonic()
+
+    def check_pending(self, force=False):
+        """
+        Проверяет студентов, чьи файлы не менялись debounce секунд (или все отложенные, если force).
+
+        :return: список строк отчета
+        """
+        now = time.monotonic()
+        ready = [path for path, changed in self._pending.items() if force or now - changed >= self.debounce]
+        students = {}
+        for path in ready:
+            del self._pending[path]
+            student = self._parse_vectors_path(path)
+            if student is not None:
+                students[student] = None
+        return [self.check_student(student, group) for student, group in students]
+
+    def check_student(self, student, group):
+        """
+        Проверяет студента, дописывает результат в отчет и обновляет файл принятых студентов.
+        Ошибка при проверке одного файла (например, сломанной структуры JSON) попадает в отчет
+        строкой этого студента и не останавливает наблюдение.
+
+        :return: строка отчета
+        """
+        try:
+            result = VectorTester._check_student_vectors(student, group, self.base_path)["result"]
+        except Exception as e:
+            traceback.print_exc()
+            result = f"Ошибка проверки: {type(e).__name__}: {e}"
+        self._update_good_vectors_file(f"{student};{group}\n", result == "OK")
+        line = f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S};{student};{group};{' '.join(result.split())}\n"
+        with open(self.report_path, "a", encoding="UTF-8") as file:
+            file.write(line)
+        print(line, end="")
+        return line
+
+    def _update_good_vectors_file(self, student_line, is_good):
+        try:
+            with open(self.students_file_with_good_vectors, "rt", encoding="UTF-8") as file:
+                good_vectors_student = file.readlines()
+        except FileNotFoundError:
+            good_vectors_student = []
+        if is_good and student_line not in good_vectors_student:
+            good_vectors_student.append(student_line)
+        elif not is_good and student_line in good_vectors_student:
+            good_vectors_student = [line for line in good_vectors_student if line != student_line]
+        else:
+            return
+        write_file_atomic(self.students_file_with_good_vectors, good_vectors_student)
+
+    def watch(self, check_existing=False, duration=None):
+        """
+        Запускает наблюдение (до Ctrl+C или истечения duration секунд).
+
+        :param check_existing: Проверить при запуске все уже загруженные файлы векторов
+        :param duration: Длительность наблюдения, с; None - без ограничения
+        """
+        os.makedirs(self.root_path, exist_ok=True)
+        self._snapshot = self._scan()
+        if check_existing:
+            self._pending.update(dict.fromkeys(self._snapshot, time.monotonic()))
+        observer = None
+        if self.use_inotify:
+            observer = Observer()
+            observer.schedule(_VectorsEventHandler(self._events), self.root_path, recursive=True)
+            observer.start()
+        print(f"Наблюдение за {self.root_path} ({'inotify' if observer is not None else 'опрос'}), "
+              f"отчет: {self.report_path}")
+        end_time = None if duration is None else time.monotonic() + duration
+        try:
+            while end_time is None or time.monotonic() < end_time:
+                time.sleep(self.poll_interval)
+                if observer is None:
+                    self._poll()
+                else:
+                    self._collect_events()
+                self.check_pending()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+        self.check_pending(force=True)
+
+
+class _VectorsEventHandler(FileSystemEventHandler):
+    """
+    Передает пути измененных файлов векторов из потока watchdog в очередь наблюдателя.
+    """
+
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+
+    # Открытие и чтение файла (в том числе самой проверкой) изменением не считается
+    EVENT_TYPES = ("created", "modified", "moved", "deleted")
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in self.EVENT_TYPES:
+            return
+        for path in event.src_path, getattr(event, "dest_path", ""):
+            if path and fnmatch.fnmatch(os.path.basename(path), VectorsWatcher.VECTORS_FILE_PATTERN):
+                self.events.put(os.fsdecode(path))
@@ -1,19 +1,29 @@
 from BaseLineTester import BaseLineTester
 from VariantGenerator import create_variants_for_students_file
 from VectorTester import VectorTester
+from VectorsWatcher import VectorsWatcher
 
 def start_checking(students_file="ГГ-21.csv",
                    students_file_with_good_vectors="Good_Vectors_ГГ-21.csv",
-                   base_path=r"/Users/mikhail_vystrchil/Downloads"):
-    # Проверка векторов
+                   base_path=r"/Users/mikhail_vystrchil/Downloads",
+                   workers=None):
+    # Проверка векторов (workers=None - параллельно на всех ядрах)
     VectorTester.check_vectors_for_students_group(students_file=students_file,
                                                   students_file_with_good_vectors=students_file_with_good_vectors,
-                                                  base_path=base_path)
+                                                  base_path=base_path,
+                                                  workers=workers)
     BaseLineTester.check_base_lines_for_students_group(students_file=students_file,
                                                   students_file_with_good_vectors=students_file_with_good_vectors,
                                                   base_path=base_path)
 
 
+def start_watching(students_file_with_good_vectors="Good_Vectors_ГГ-21.csv",
+                   base_path=r"/Users/mikhail_vystrchil/Downloads"):
+    # Проверка векторов по мере загрузки файлов (до Ctrl+C)
+    VectorsWatcher(students_file_with_good_vectors=students_file_with_good_vectors,
+                   base_path=base_path).watch()
+
+
 if __name__ == "__main__":
     # Создание вариантов
     # create_variants_for_students_file("ГГ-21.csv", create_blank_vectors_json=True, plot_gnss_net=False)
@@ -22,6 +32,8 @@ if __name__ == "__main__":
     start_checking(students_file="ГГ-21.csv",
                    students_file_with_good_vectors="Good_Vectors_ГГ-21.csv",
                    base_path=r"/Users/mikhail_vystrchil/Downloads")
+    # start_watching(students_file_with_good_vectors="Good_Vectors_ГГ-21.csv",
+    #                base_path=r"/Users/mikhail_vystrchil/Downloads")
     # VectorTester.check_vectors_for_students_group(students_file="ГГ-21.csv",
     #                                               students_file_with_good_vectors="Good_Vectors_ГГ-21.csv",
     #                                               base_path=r"/Users/mikhail_vystrchil/Downloads")
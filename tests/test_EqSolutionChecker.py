@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EqSolutionChecker import EqSolutionChecker
+
+METRICS = {"plan_error": 0.045, "height_error": 0.01, "mu": 1.0, "ellipse_a": 0.01}
+
+
+class TestEqSolutionChecker(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.queue_path = os.path.join(self.tmp_dir.name, "queue.jsonl")
+        self.decisions_path = os.path.join(self.tmp_dir.name, "decisions.json")
+        self.checker = EqSolutionChecker(review_queue_path=self.queue_path, review_decisions_path=self.decisions_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read_queue(self):
+        with open(self.queue_path, "rt", encoding="UTF-8") as file:
+            return [json.loads(line) for line in file]
+
+    def test_verdicts(self):
+        self.assertEqual(self.checker.get_verdict(dict(METRICS, plan_error=0.01))[0], EqSolutionChecker.OK)
+        self.assertEqual(self.checker.get_verdict(METRICS)[0], EqSolutionChecker.BORDERLINE)
+        self.assertEqual(self.checker.get_verdict(dict(METRICS, plan_error=0.06))[0], EqSolutionChecker.FAIL)
+        self.assertEqual(self.checker.get_verdict(dict(METRICS, mu=float("nan")))[0], EqSolutionChecker.FAIL)
+
+    def test_review_queue_skips_same_vectors_file(self):
+        self.assertTrue(self.checker.add_to_review_queue("Иванов", METRICS, [], "hash_1"))
+        self.assertFalse(self.checker.add_to_review_queue("Иванов", METRICS, [], "hash_1"))
+        self.assertTrue(self.checker.add_to_review_queue("Иванов", METRICS, [], "hash_2"))
+        self.assertTrue(self.checker.add_to_review_queue("Петров", METRICS, [], "hash_1"))
+        records = self.read_queue()
+        self.assertEqual([(record["student"], record["vectors_hash"]) for record in records],
+                         [("Иванов", "hash_1"), ("Иванов", "hash_2"), ("Петров", "hash_1")])
+
+    def test_decisions_by_vectors_hash(self):
+        self.assertIsNone(self.checker.get_decision("hash_1"))
+        with open(self.decisions_path, "wt", encoding="UTF-8") as file:
+            json.dump({"hash_1": "OK", "hash_2": "FAIL", "hash_3": "maybe"}, file)
+        self.assertEqual(self.checker.get_decision("hash_1"), EqSolutionChecker.OK)
+        self.assertEqual(self.checker.get_decision("hash_2"), EqSolutionChecker.FAIL)
+        self.assertIsNone(self.checker.get_decision("hash_3"))
+        self.assertIsNone(self.checker.get_decision(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
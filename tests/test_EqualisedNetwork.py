@@ -0,0 +1,87 @@
+import itertools
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EqualisedNetwork import EqualisedNetwork
+from test_GnssVector import get_measured_net
+
+
+def get_vectors(seed, num_points=8):
+    gnss_net = get_measured_net(seed, num_points)
+    pairs = [(point_0.name, point_1.name) for point_0, point_1 in itertools.combinations(gnss_net.points, 2)]
+    return list(gnss_net.compute_vectors(pairs))
+
+
+def get_full_q_blocks(eq_net):
+    q = eq_net._get_q_matrix()
+    points_count = len(q) // 3
+    idx = np.arange(points_count)
+    return q.reshape(points_count, 3, points_count, 3)[idx, :, idx, :]
+
+
+class TestEqualisedNetwork(unittest.TestCase):
+
+    def assert_networks_equal(self, eq_net, expected):
+        np.testing.assert_allclose(eq_net.get_mu(), expected.get_mu(), rtol=1e-9)
+        np.testing.assert_allclose(eq_net.coord_df.to_numpy(), expected.coord_df.to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(eq_net.mse_df.to_numpy(), expected.mse_df.to_numpy(), rtol=1e-7, atol=1e-12)
+
+    def test_q_blocks_match_full_covariance(self):
+        vectors = get_vectors(0, num_points=12)
+        for backend in "dense", "sparse":
+            with self.subTest(backend=backend):
+                eq_net = EqualisedNetwork(*vectors, backend=backend)
+                eq_net.Q_BLOCKS_CHUNK = 2
+                eq_net._solve()["q_blocks"] = None
+                np.testing.assert_allclose(eq_net._get_q_blocks(), get_full_q_blocks(eq_net), rtol=1e-9, atol=1e-15)
+
+    def test_sparse_backend_matches_dense(self):
+        vectors = get_vectors(1, num_points=12)
+        self.assert_networks_equal(EqualisedNetwork(*vectors, backend="sparse"),
+                                   EqualisedNetwork(*vectors, backend="dense"))
+
+
+    def test_auto_backend_uses_threshold(self):
+        vectors = get_vectors(1, num_points=12)
+        unknowns_count = len(EqualisedNetwork(*vectors)._solve()["unknowns_index"])
+        with mock.patch.object(EqualisedNetwork, "SPARSE_THRESHOLD", unknowns_count):
+            eq_net = EqualisedNetwork(*vectors)
+            self.assertIsNotNone(eq_net._solve()["lu"])
+        with mock.patch.object(EqualisedNetwork, "SPARSE_THRESHOLD", unknowns_count + 1):
+            self.assertIsNone(EqualisedNetwork(*vectors)._solve()["lu"])
+        self.assert_networks_equal(eq_net, EqualisedNetwork(*vectors, backend="dense"))
+        with self.assertRaises(ValueError):
+            EqualisedNetwork(*vectors, backend="sparse", sequential=True)
+
+    def test_sequential_updates_match_full_adjustment(self):
+        vectors = get_vectors(2)
+        eq_net = EqualisedNetwork(sequential=True)
+        for vector in vectors:
+            eq_net.add_gnss_vector(vector)
+        self.assertIsNotNone(eq_net._solution["n_inv"])
+        self.assert_networks_equal(eq_net, EqualisedNetwork(*vectors, backend="dense"))
+        for vector in vectors[::5]:
+            eq_net.remove_gnss_vector(vector)
+        self.assertIsNotNone(eq_net._solution["n_inv"])
+        self.assert_networks_equal(eq_net, EqualisedNetwork(*[vector for vector in vectors
+                                                              if vector not in vectors[::5]], backend="dense"))
+
+    def test_stacked_solve_matches_separate_networks(self):
+        networks = [EqualisedNetwork(*get_vectors(seed), backend="dense") for seed in range(3, 7)]
+        expected = [(network.result_df.copy(), network.get_mu()) for network in networks]
+        for network in networks:
+            network._solution = None
+        results = EqualisedNetwork.calculate_networks(networks)
+        for (result_df, mu), (expected_df, expected_mu) in zip(results, expected):
+            self.assertAlmostEqual(mu, expected_mu, delta=1e-9 * expected_mu)
+            np.testing.assert_allclose(result_df.to_numpy(), expected_df.to_numpy(), rtol=1e-7, atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FileUtils import write_file_atomic
+
+
+class TestWriteFileAtomic(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "Файл.txt")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read(self, mode="rt"):
+        with open(self.path, mode, **({} if "b" in mode else {"encoding": "UTF-8"})) as file:
+            return file.read()
+
+    def test_str_bytes_and_lines(self):
+        write_file_atomic(self.path, "строка\n")
+        self.assertEqual(self.read(), "строка\n")
+        write_file_atomic(self.path, b"\x00\x01")
+        self.assertEqual(self.read("rb"), b"\x00\x01")
+        write_file_atomic(self.path, (f"{idx}\n" for idx in range(3)))
+        self.assertEqual(self.read(), "0\n1\n2\n")
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["Файл.txt"])
+
+    def test_failed_write_keeps_previous_file(self):
+        write_file_atomic(self.path, "прежнее содержимое\n")
+
+        def lines():
+            yield "начало\n"
+            raise RuntimeError("обрыв")
+
+        with self.assertRaises(RuntimeError):
+            write_file_atomic(self.path, lines())
+        self.assertEqual(self.read(), "прежнее содержимое\n")
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["Файл.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import datetime
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CONFIG import MSE_Z_SCALER
+from GnssMasureGenerator import GnssMeasureGenerator
+from GnssMeasureData import datetime_to_epoch
+from GnssNetGenerator import GnssNetGenerator
+
+
+def get_legacy_measures(gnss_net, rng, month, day, d_time, num_of_measure, gnss_displacement, pass_point_prob,
+                        crop_perc):
+    """
+    Измерения в порядке прежнего поточечного генератора: sum() 12 равномерных чисел на каждое значение.
+
+    :return: {имя точки: [(эпоха, x, y, z), ...]}
+    """
+    current_time = datetime.datetime.now()
+    d_time = datetime.timedelta(seconds=d_time)
+    start_time = datetime.datetime(current_time.year, month, day,
+                                   rng.randint(8, 20), rng.randint(0, 59), rng.randint(0, 59))
+    end_time = start_time + num_of_measure * d_time
+    times = [start_time + idx * d_time for idx in range(num_of_measure)]
+    displacement = [[round(rng.random() * gnss_displacement - gnss_displacement / 2, 3) for _ in range(3)]
+                    for _ in times]
+
+    def get_norm_value(count=12):
+        return sum([rng.random() for _ in range(count)]) - count / 2
+
+    farthest_point = gnss_net.find_farthest_point()
+    measures = {}
+    for point in gnss_net:
+        distance = ((point.x - farthest_point.x) ** 2 + (point.y - farthest_point.y) ** 2) ** 0.5
+        vector_mse = (gnss_net.accuracy["a"] + gnss_net.accuracy["b"] * distance / 1000) / 1000
+        point_measures = []
+        for time, (dx, dy, dz) in zip(times, displacement):
+            x = dx + point.x
+            y = dy + point.y
+            z = dz + point.z
+            x += get_norm_value() * vector_mse
+            y += get_norm_value() * vector_mse
+            z += get_norm_value() * vector_mse * MSE_Z_SCALER
+            point_measures.append((time, x, y, z))
+        measures[point.name] = point_measures
+    for point in gnss_net:
+        measures[point.name] = [measure for measure in measures[point.name] if not rng.random() <= pass_point_prob]
+    for point in gnss_net:
+        crop_start = start_time + rng.randint(0, int(crop_perc * num_of_measure)) * d_time
+        crop_end = end_time - rng.randint(0, int(crop_perc * num_of_measure)) * d_time
+        measures[point.name] = [(datetime_to_epoch(time), x, y, z) for time, x, y, z in measures[point.name]
+                                if crop_start <= time <= crop_end]
+    return measures
+
+
+class TestGnssMeasureGenerator(unittest.TestCase):
+
+    def test_norm_matches_builtin_sum(self):
+        gnss_net = GnssNetGenerator(random_seed=42, num_points=3).create_gnss_net()
+        gmg = GnssMeasureGenerator(gnss_net, rng=random.Random(1), month=1, day=1, num_of_measure=5)
+        gmg.rng = gmg._random_source = random.Random(7)
+        legacy_rng = random.Random(7)
+        expected = [sum([legacy_rng.random() for _ in range(12)]) - 6 for _ in range(2000 * 3)]
+        self.assertEqual(gmg._norm((2000, 3)).ravel().tolist(), expected)
+
+    def test_measures_match_legacy_generator(self):
+        parameters = {"month": 3, "day": 5, "d_time": 15, "num_of_measure": 200,
+                      "gnss_displacement": 0.01, "pass_point_prob": 0.1}
+        gnss_net = GnssNetGenerator(random_seed=42, num_points=6).create_gnss_net()
+        GnssMeasureGenerator(gnss_net, rng=random.Random(11), **parameters)
+        expected = get_legacy_measures(gnss_net, random.Random(11), crop_perc=0.1, **parameters)
+        for point in gnss_net:
+            measure_data = point.measure_data
+            actual = list(zip(measure_data.epochs.tolist(), measure_data.x.tolist(),
+                              measure_data.y.tolist(), measure_data.z.tolist()))
+            self.assertEqual(actual, expected[point.name])
+
+
+if __name__ == "__main__":
+    unittest.main()
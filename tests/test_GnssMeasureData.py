@@ -0,0 +1,60 @@
+import datetime
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GnssMeasureData import GnssMeasureData, datetime_to_epoch
+
+START = datetime.datetime(2024, 3, 5, 10, 0, 0)
+
+
+def get_measure_dict(count=5):
+    return {START + datetime.timedelta(seconds=15 * idx): {"x": 1.0 + idx, "y": 2.0 + idx, "z": 3.0 + idx}
+            for idx in range(count)}
+
+
+class TestGnssMeasureData(unittest.TestCase):
+
+    def test_dict_round_trip(self):
+        measure_dict = get_measure_dict()
+        measure_data = GnssMeasureData.from_dict(measure_dict)
+        self.assertEqual(measure_data.to_dict(), measure_dict)
+        self.assertEqual(measure_data, measure_dict)
+        self.assertEqual(list(measure_data), list(measure_dict))
+
+    def test_epochs_are_sorted_and_unique(self):
+        epochs = [datetime_to_epoch(START) + step for step in (30, 0, 15, 0)]
+        measure_data = GnssMeasureData(epochs, x=[3.0, 1.0, 2.0, 1.0])
+        np.testing.assert_array_equal(measure_data.epochs - datetime_to_epoch(START), [0, 15, 30])
+        np.testing.assert_array_equal(measure_data.x, [1.0, 2.0, 3.0])
+
+    def test_lookup_and_epoch_view(self):
+        measure_data = GnssMeasureData.from_dict(get_measure_dict())
+        time = START + datetime.timedelta(seconds=30)
+        self.assertIn(time, measure_data)
+        self.assertNotIn(START + datetime.timedelta(seconds=1), measure_data)
+        self.assertIsNone(measure_data.get(START - datetime.timedelta(seconds=15)))
+        with self.assertRaises(KeyError):
+            measure_data[START - datetime.timedelta(seconds=15)]
+        self.assertEqual(dict(measure_data[time].items()), {"x": 3.0, "y": 4.0, "z": 5.0})
+        measure_data[time]["z"] = 10.0
+        self.assertEqual(measure_data.z[2], 10.0)
+
+    def test_select_returns_new_store(self):
+        measure_data = GnssMeasureData.from_dict(get_measure_dict())
+        selected = measure_data.select(measure_data.x > 2.5)
+        self.assertEqual(len(selected), 3)
+        selected.x[0] = -1.0
+        self.assertEqual(measure_data.x[2], 3.0)
+
+    def test_columns_must_have_same_length(self):
+        with self.assertRaises(ValueError):
+            GnssMeasureData([1, 2, 3], x=[1.0, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import pickle
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GnssMeasureData import GnssMeasureData
+from GnssNet import GnssNet
+from GnssPoint import GnssPoint
+
+NAMES = ["AAAA", "BBBB", "CCCC", "DDDD"]
+
+
+def get_net():
+    gnss_net = GnssNet()
+    gnss_net.add_points(coordinates=np.arange(12, dtype=np.float64).reshape(4, 3), names=NAMES,
+                        point_types=["base", "rover", "rover", "base"])
+    return gnss_net
+
+
+class TestGnssNetArrays(unittest.TestCase):
+
+    def test_points_are_views_of_net_arrays(self):
+        gnss_net = get_net()
+        point = gnss_net.get_point_by_name("cccc")
+        self.assertEqual((point.x, point.y, point.z, point.point_type), (6.0, 7.0, 8.0, "rover"))
+        point.z = 100.0
+        self.assertEqual(gnss_net.coordinates[2, 2], 100.0)
+        self.assertFalse(gnss_net.coordinates.flags.writeable)
+        self.assertEqual(gnss_net.get_base_points(), [gnss_net.points[0], gnss_net.points[3]])
+        with self.assertRaises(AttributeError):
+            point.color = "r"
+
+    def test_add_and_remove_points_keep_arrays_consistent(self):
+        gnss_net = get_net()
+        removed = gnss_net.get_point_by_name("BBBB")
+        gnss_net.remove_point(removed)
+        self.assertEqual((removed.x, removed.name), (3.0, "BBBB"))
+        gnss_net.add_point(GnssPoint(20.0, 21.0, 22.0, "EEEE", "rover"))
+        self.assertEqual(list(gnss_net.names), ["AAAA", "CCCC", "DDDD", "EEEE"])
+        np.testing.assert_array_equal(gnss_net.coordinates[:, 0], [0.0, 6.0, 9.0, 20.0])
+        self.assertEqual([point.name for point in gnss_net], list(gnss_net.names))
+        self.assertEqual(gnss_net.get_point_by_name("EEEE").y, 21.0)
+
+    def test_pickle_round_trip(self):
+        gnss_net = get_net()
+        gnss_net.points[1].measure_data = GnssMeasureData([1, 2], x=[1.0, 2.0], y=[3.0, 4.0], z=[5.0, 6.0])
+        restored = pickle.loads(pickle.dumps(gnss_net))
+        np.testing.assert_array_equal(restored.coordinates, gnss_net.coordinates)
+        self.assertEqual(list(restored.names), NAMES)
+        self.assertEqual(restored.points[1].measure_data, gnss_net.points[1].measure_data)
+        restored.points[0].x = -1.0
+        self.assertEqual(gnss_net.points[0].x, 0.0)
+
+
+class TestGnssNetCopy(unittest.TestCase):
+
+    def test_copy_shares_arrays_until_write(self):
+        gnss_net = get_net()
+        net_copy = gnss_net.copy()
+        self.assertTrue(np.shares_memory(net_copy.coordinates, gnss_net.coordinates))
+        net_copy.points[1].x = -10.0
+        self.assertFalse(np.shares_memory(net_copy.coordinates, gnss_net.coordinates))
+        self.assertEqual(gnss_net.points[1].x, 3.0)
+        self.assertEqual(net_copy.points[1].x, -10.0)
+        gnss_net.points[2].name = "ZZZZ"
+        self.assertEqual(net_copy.get_point_by_name("CCCC").y, 7.0)
+        self.assertEqual(gnss_net.get_point_by_name("ZZZZ").y, 7.0)
+
+    def test_copy_gets_own_points_measures_and_mse(self):
+        gnss_net = get_net()
+        gnss_net.points[0].mse = {"M": 1.0}
+        net_copy = gnss_net.copy()
+        net_copy.points[0].measure_data = GnssMeasureData([1], x=[1.0], y=[2.0], z=[3.0])
+        net_copy.points[0].mse["M"] = 2.0
+        net_copy.remove_point(net_copy.points[3])
+        self.assertEqual(len(gnss_net.points[0].measure_data), 0)
+        self.assertEqual(gnss_net.points[0].mse, {"M": 1.0})
+        self.assertEqual(list(gnss_net.names), NAMES)
+        self.assertEqual(list(net_copy.names), NAMES[:3])
+        self.assertIsNot(net_copy.points[0], gnss_net.points[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
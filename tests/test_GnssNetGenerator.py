@@ -0,0 +1,83 @@
+import math
+import os
+import random
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GnssNetGenerator import GnssNetGenerator, PointsDensityException
+
+
+def get_legacy_most_distant_points(points, count):
+    """
+    Прежний перебор: на каждом шаге - оставшаяся точка, наиболее удаленная от ближайшей оставшейся.
+    """
+    remaining_points = points[:]
+    most_distant_points = []
+    for _ in range(count):
+        point = max(remaining_points, key=lambda p: min(math.dist(p, other) for other in remaining_points
+                                                        if other != p))
+        most_distant_points.append(point)
+        remaining_points.remove(point)
+    return most_distant_points
+
+
+class TestMostDistantPoints(unittest.TestCase):
+
+    def test_matches_legacy_search(self):
+        for seed in range(5):
+            for rng in random.Random(seed), np.random.default_rng(seed):
+                generator = GnssNetGenerator(num_points=40, count_of_base_point=6, rng=rng)
+                expected = get_legacy_most_distant_points(generator.points, 6)
+                xyz = np.array(generator.points)
+                distance_matrix = np.linalg.norm(xyz[:, None] - xyz[None, :], axis=2)
+                self.assertEqual(generator.base_points, expected)
+                self.assertEqual(generator.find_most_distant_points(distance_matrix=distance_matrix), expected)
+
+    def test_all_points_can_be_base(self):
+        generator = GnssNetGenerator(num_points=3, count_of_base_point=5, rng=random.Random(0))
+        self.assertEqual(sorted(generator.base_points), sorted(generator.points))
+
+
+class TestPoissonDisk(unittest.TestCase):
+
+    def test_points_keep_min_distance_and_limits(self):
+        generator = GnssNetGenerator(num_points=60, min_distance=1500, rng=np.random.default_rng(3))
+        xyz = np.array(generator.points)
+        self.assertEqual(len(xyz), 60)
+        distances = np.hypot(*(xyz[:, None, :2] - xyz[None, :, :2]).transpose(2, 0, 1))
+        np.fill_diagonal(distances, np.inf)
+        self.assertGreaterEqual(distances.min(), 1500)
+        for axis, (low, high) in enumerate((generator.x_range, generator.y_range, generator.z_range)):
+            self.assertTrue(np.all((low <= xyz[:, axis]) & (xyz[:, axis] <= high)))
+
+    def test_same_seed_gives_same_net(self):
+        nets = [GnssNetGenerator(num_points=20, rng=np.random.default_rng(5)).create_gnss_net() for _ in range(2)]
+        self.assertEqual(list(nets[0].names), list(nets[1].names))
+        np.testing.assert_array_equal(nets[0].coordinates, nets[1].coordinates)
+
+    def test_too_dense_net_is_rejected(self):
+        with self.assertRaises(PointsDensityException):
+            GnssNetGenerator(num_points=1000, min_distance=5000, rng=np.random.default_rng(0))
+
+
+class TestUniqueNames(unittest.TestCase):
+
+    def test_names_are_unique(self):
+        generator = GnssNetGenerator(num_points=15, rng=np.random.default_rng(1))
+        generator.num_points = 5000
+        names = generator.generate_unique_names()
+        self.assertEqual(len(set(names)), 5000)
+
+    def test_too_many_names_are_rejected(self):
+        generator = GnssNetGenerator(num_points=15, rng=np.random.default_rng(1))
+        generator.num_points = 26 ** 4 + 1
+        with self.assertRaises(ValueError):
+            generator.generate_unique_names()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GnssNet import GnssNet
+from GnssPoint import GnssPoint
+
+
+def get_net(seed, count=200):
+    coordinates = np.random.default_rng(seed).uniform(0, 10_000, size=(count, 3))
+    gnss_net = GnssNet()
+    gnss_net.add_points(coordinates=coordinates, names=[f"P{idx}" for idx in range(count)],
+                        point_types=["rover"] * count)
+    return gnss_net
+
+
+def get_sorted_by_distance(gnss_net, x, y):
+    return sorted(gnss_net.points, key=lambda point: math.dist((point.x, point.y), (x, y)))
+
+
+class TestGnssSpatialIndex(unittest.TestCase):
+
+    QUERIES = ((5_000, 5_000), (0, 0), (-3_000, 12_000), (9_999, 1))
+
+    def assert_queries_match_brute_force(self, gnss_net):
+        for x, y in self.QUERIES:
+            ordered = get_sorted_by_distance(gnss_net, x, y)
+            for k in 1, 7, len(ordered) + 5:
+                self.assertEqual(gnss_net.find_nearest_points((x, y), k), ordered[:k])
+            for radius in 0, 1_500, 20_000:
+                expected = [point for point in ordered if math.dist((point.x, point.y), (x, y)) <= radius]
+                self.assertEqual(gnss_net.find_points_in_radius((x, y), radius), expected)
+            self.assertIs(gnss_net.find_farthest_point((x, y)), ordered[-1])
+
+    def test_queries_match_brute_force(self):
+        for seed in range(3):
+            self.assert_queries_match_brute_force(get_net(seed))
+
+    def test_index_follows_added_and_removed_points(self):
+        gnss_net = get_net(5)
+        gnss_net.spatial_index
+        for point in gnss_net.points[::3]:
+            gnss_net.remove_point(point)
+        gnss_net.add_point(GnssPoint(-5_000, -5_000, 0, "FAR1", "rover"))
+        gnss_net.add_point(GnssPoint(5_100, 4_900, 0, "MID1", "rover"))
+        self.assert_queries_match_brute_force(gnss_net)
+
+    def test_index_follows_moved_points(self):
+        gnss_net = get_net(6)
+        gnss_net.spatial_index
+        gnss_net.points[0].x = 50_000
+        gnss_net.points[1].y = -40_000
+        self.assert_queries_match_brute_force(gnss_net)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import itertools
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GnssMasureGenerator import GnssMeasureGenerator
+from GnssNetGenerator import GnssNetGenerator
+from GnssVector import GnssVector
+
+VECTOR_ATTRIBUTES = ("dx", "dy", "dz", "s_dist", "h_dist", "azimuth", "zenith", "mse_dx", "mse_dy", "mse_dz",
+                     "mse_s_dist", "mse_azimuth", "mse_zenith")
+
+
+def get_legacy_vector(point_0, point_1):
+    """
+    Характеристики вектора, как в прежнем поэпохном GnssVector: списки по общим эпохам и встроенный sum().
+
+    :return: словарь {атрибут: значение}
+    """
+    measure_0, measure_1 = point_0.measure_data, point_1.measure_data
+    measures_1 = {epoch: (x, y, z) for epoch, x, y, z in zip(measure_1.epochs.tolist(), measure_1.x.tolist(),
+                                                              measure_1.y.tolist(), measure_1.z.tolist())}
+    deltas = [(measures_1[epoch][0] - x, measures_1[epoch][1] - y, measures_1[epoch][2] - z)
+              for epoch, x, y, z in zip(measure_0.epochs.tolist(), measure_0.x.tolist(),
+                                        measure_0.y.tolist(), measure_0.z.tolist())
+              if epoch in measures_1]
+    count = len(deltas)
+    dx, dy, dz = (sum([delta[axis] for delta in deltas]) / count for axis in range(3))
+    s_dist = (dx ** 2 + dy ** 2 + dz ** 2) ** 0.5
+    h_dist = (dx ** 2 + dy ** 2) ** 0.5
+    mse_dx, mse_dy, mse_dz = ((sum([(delta[axis] - mean) ** 2 for delta in deltas]) / (count - 1)) ** 0.5
+                              for axis, mean in enumerate((dx, dy, dz)))
+    mse_s_dist = ((dx / s_dist) ** 2 * mse_dx ** 2 + (dy / s_dist) ** 2 * mse_dy ** 2 +
+                  (dz / s_dist) ** 2 * mse_dz ** 2) ** 0.5
+    mse_azimuth = ((-dy / (dx ** 2 + dy ** 2)) ** 2 * mse_dx ** 2 + (dx / (dx ** 2 + dy ** 2)) ** 2 * mse_dy ** 2) ** 0.5
+    mse_zenith = ((-1 / (s_dist * (1 - (dz / s_dist) ** 2) ** 0.5)) ** 2 * mse_dz ** 2 +
+                  (dz / (s_dist ** 2 * (1 - (dz / s_dist) ** 2) ** 0.5)) ** 2 * mse_s_dist ** 2) ** 0.5
+    return {"dx": dx, "dy": dy, "dz": dz, "s_dist": s_dist, "h_dist": h_dist,
+            "azimuth": math.atan2(dy, dx), "zenith": math.acos(dz / s_dist),
+            "mse_dx": mse_dx, "mse_dy": mse_dy, "mse_dz": mse_dz,
+            "mse_s_dist": mse_s_dist / count ** 0.5, "mse_azimuth": mse_azimuth / count ** 0.5,
+            "mse_zenith": mse_zenith / count ** 0.5}
+
+
+def get_measured_net(seed, num_points=8):
+    gnss_net = GnssNetGenerator(num_points=num_points, rng=random.Random(seed)).create_gnss_net()
+    GnssMeasureGenerator(gnss_net, rng=random.Random(seed), month=3, day=5)
+    return gnss_net
+
+
+class TestGnssVector(unittest.TestCase):
+
+    def test_vectors_match_legacy_values(self):
+        for seed in range(5):
+            gnss_net = get_measured_net(seed)
+            for point_0, point_1 in itertools.permutations(gnss_net.points, 2):
+                vector = GnssVector(gnss_net, point_0.name, point_1.name)
+                expected = get_legacy_vector(point_0, point_1)
+                self.assertEqual({name: getattr(vector, name) for name in VECTOR_ATTRIBUTES}, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
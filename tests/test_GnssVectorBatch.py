@@ -0,0 +1,35 @@
+import itertools
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GnssVector import GnssVector
+from GnssVectorBatch import GnssVectorBatch
+from test_GnssVector import VECTOR_ATTRIBUTES, get_measured_net
+
+
+class TestGnssVectorBatch(unittest.TestCase):
+
+    def test_views_match_gnss_vector(self):
+        for seed in range(5):
+            gnss_net = get_measured_net(seed)
+            pairs = [(point_0.name, point_1.name) for point_0, point_1 in itertools.permutations(gnss_net.points, 2)]
+            for view, (name_0, name_1) in zip(gnss_net.compute_vectors(pairs), pairs):
+                vector = GnssVector(gnss_net, name_0, name_1)
+                for name in VECTOR_ATTRIBUTES:
+                    self.assertEqual(getattr(view, name), getattr(vector, name), (seed, name_0, name_1, name))
+
+    def test_small_chunks_do_not_change_results(self):
+        gnss_net = get_measured_net(7)
+        pairs = [(point_0.name, point_1.name) for point_0, point_1 in itertools.combinations(gnss_net.points, 2)]
+        expected = [[getattr(view, name) for name in VECTOR_ATTRIBUTES] for view in gnss_net.compute_vectors(pairs)]
+        with mock.patch.object(GnssVectorBatch, "MAX_CHUNK_ELEMENTS", 1):
+            actual = [[getattr(view, name) for name in VECTOR_ATTRIBUTES] for view in gnss_net.compute_vectors(pairs)]
+        self.assertEqual(actual, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from GnssVectorsGraph import GnssVectorsGraph
+
+
+def get_graph(edges):
+    graph = GnssVectorsGraph(["B1", "B2", "R1", "R2", "R3"], ["B1", "B2"])
+    for point_0_name, point_1_name in edges:
+        graph.add_edge(point_0_name, point_1_name)
+    return graph
+
+
+class TestGnssVectorsGraph(unittest.TestCase):
+
+    def test_tree_is_correct(self):
+        graph = get_graph([("B1", "R1"), ("R1", "R2"), ("R2", "R3"), ("R3", "B2")])
+        self.assertEqual(graph.get_problems(), [])
+
+    def test_disconnected_rovers(self):
+        graph = get_graph([("B1", "B2"), ("R1", "R2"), ("R2", "R3")])
+        problems = graph.get_problems()
+        self.assertEqual(len(problems), 2)
+        self.assertEqual(graph.get_unreachable_rovers(), ["R1", "R2", "R3"])
+
+    def test_duplicates_and_cycles_follow_settings(self):
+        edges = [("B1", "R1"), ("R1", "B1"), ("R1", "R2"), ("R2", "R3"), ("R3", "R1"), ("R3", "B2")]
+        graph = get_graph(edges)
+        self.assertEqual(graph.duplicate_edges, [("B1", "R1")])
+        self.assertEqual(graph.cycle_edges, [("R1", "R3")])
+        self.assertEqual(len(graph.get_problems()), 2)
+        self.assertEqual(graph.get_problems(allow_cycles=True, allow_duplicates=True), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
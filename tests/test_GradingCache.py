@@ -0,0 +1,41 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CONFIG
+from GradingCache import GradingCache
+from VariantCache import VariantCache
+
+
+def get_fingerprints():
+    return VariantCache.get_fingerprint(num_of_series=2, rng_mode="compat"), GradingCache.get_fingerprint()
+
+
+class TestCacheFingerprints(unittest.TestCase):
+
+    def test_watch_settings_do_not_invalidate_caches(self):
+        fingerprints = get_fingerprints()
+        with mock.patch.object(CONFIG, "WATCH_DEBOUNCE", CONFIG.WATCH_DEBOUNCE + 3), \
+                mock.patch.object(CONFIG, "WATCH_POLL_INTERVAL", CONFIG.WATCH_POLL_INTERVAL + 3):
+            self.assertEqual(get_fingerprints(), fingerprints)
+
+    def test_check_settings_invalidate_only_grading_cache(self):
+        variant_fingerprint, grading_fingerprint = get_fingerprints()
+        with mock.patch.object(CONFIG, "CHECK_MAX_PLAN_ERROR", CONFIG.CHECK_MAX_PLAN_ERROR * 2):
+            new_variant_fingerprint, new_grading_fingerprint = get_fingerprints()
+        self.assertEqual(new_variant_fingerprint, variant_fingerprint)
+        self.assertNotEqual(new_grading_fingerprint, grading_fingerprint)
+
+    def test_generation_settings_invalidate_both_caches(self):
+        variant_fingerprint, grading_fingerprint = get_fingerprints()
+        with mock.patch.object(CONFIG, "NUM_OF_MEASURES", CONFIG.NUM_OF_MEASURES + 1):
+            new_variant_fingerprint, new_grading_fingerprint = get_fingerprints()
+        self.assertNotEqual(new_variant_fingerprint, variant_fingerprint)
+        self.assertNotEqual(new_grading_fingerprint, grading_fingerprint)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import glob
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from VariantCache import VariantCache
+from test_GnssVector import get_measured_net
+
+
+class TestVariantCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = VariantCache(self.tmp_dir.name)
+        self.gnss_net = get_measured_net(0)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_load_returns_saved_variant(self):
+        self.cache.save("student", "params_generation", self.gnss_net, [self.gnss_net])
+        base_gnss_net, (measured_gnss_net,) = self.cache.load("student", "params_generation")
+        self.assertEqual(list(base_gnss_net.names), list(self.gnss_net.names))
+        np.testing.assert_array_equal(base_gnss_net.coordinates, self.gnss_net.coordinates)
+        for point, expected in zip(measured_gnss_net, self.gnss_net):
+            np.testing.assert_array_equal(point.measure_data.epochs, expected.measure_data.epochs)
+            np.testing.assert_array_equal(point.measure_data.xyz, expected.measure_data.xyz)
+
+    def test_save_removes_only_stale_files_with_same_parameters(self):
+        for fingerprint in "params_old", "other_old", "params_new":
+            self.cache.save("student", fingerprint, self.gnss_net, [self.gnss_net])
+        names = sorted(os.path.basename(path) for path in glob.glob(os.path.join(self.tmp_dir.name, "*.npz")))
+        self.assertEqual(names, ["student_other_old.npz", "student_params_new.npz"])
+        self.assertIsNone(self.cache.load("student", "params_old"))
+
+    def test_save_ignores_stale_file_removed_concurrently(self):
+        missing_path = os.path.join(self.tmp_dir.name, "student_params_old.npz")
+        with mock.patch("glob.glob", return_value=[missing_path]):
+            self.cache.save("student", "params_new", self.gnss_net, [self.gnss_net])
+        self.assertIsNotNone(self.cache.load("student", "params_new"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from VariantGenerator import VariantGenerator, create_variants_for_students_file
+
+STUDENTS = ["Иванов Иван Иванович;ГГ-21-1\n", "Петров Петр Петрович;ГГ-21-2\n", "Иванов Иван Иванович;ГГ-21-1\n",
+            "Сидорова Анна Сергеевна;ГГ-21-1\n"]
+
+
+def read_tree(root):
+    """
+    :return: {относительный путь файла: содержимое}
+    """
+    files = {}
+    for dir_path, _, file_names in os.walk(root):
+        for file_name in file_names:
+            path = os.path.join(dir_path, file_name)
+            with open(path, "rb") as file:
+                files[os.path.relpath(path, root)] = file.read()
+    return files
+
+
+def get_variant_data(vg):
+    return [(list(gnss_net.names), gnss_net.coordinates.tolist(),
+             [(point.measure_data.epochs.tolist(), point.measure_data.xyz.tolist()) for point in gnss_net])
+            for gnss_net in [vg.base_gnss_net] + vg.measured_gnss_nets]
+
+
+class TestVariantRng(unittest.TestCase):
+
+    def test_variants_do_not_use_global_random(self):
+        for rng_mode in "compat", "streams":
+            with self.subTest(rng_mode=rng_mode):
+                random.seed(1)
+                state = random.getstate()
+                vg = VariantGenerator("Иванов Иван Иванович", rng_mode=rng_mode)
+                self.assertEqual(random.getstate(), state)
+                random.seed(2)
+                self.assertEqual(get_variant_data(VariantGenerator("Иванов Иван Иванович", rng_mode=rng_mode)),
+                                 get_variant_data(vg))
+
+    def test_different_students_get_different_variants(self):
+        self.assertNotEqual(get_variant_data(VariantGenerator("Иванов Иван Иванович")),
+                            get_variant_data(VariantGenerator("Петров Петр Петрович")))
+
+
+class TestCreateVariants(unittest.TestCase):
+
+    def create_variants(self, root, workers):
+        os.makedirs(root)
+        with open(os.path.join(root, "students.csv"), "wt", encoding="UTF-8") as file:
+            file.writelines(STUDENTS)
+        cwd = os.getcwd()
+        output = io.StringIO()
+        try:
+            # Варианты сохраняются относительно текущего каталога
+            os.chdir(root)
+            with contextlib.redirect_stdout(output):
+                create_variants_for_students_file("students.csv", base_path=root, create_blank_vectors_json=True,
+                                                  workers=workers)
+        finally:
+            os.chdir(cwd)
+        return read_tree(root), output.getvalue()
+
+    def test_process_pool_matches_serial_run(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            serial_files, serial_output = self.create_variants(os.path.join(tmp_dir, "serial"), workers=1)
+            pool_files, pool_output = self.create_variants(os.path.join(tmp_dir, "pool"), workers=2)
+        self.assertGreater(len(serial_files), len(STUDENTS))
+        self.assertEqual(pool_files, serial_files)
+        self.assertEqual(pool_output, serial_output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import VectorTester as vector_tester
+
+
+def get_vector_tester(student_name="Иванов Иван Иванович"):
+    with mock.patch.object(vector_tester, "VARIANT_CACHE_PATH", None):
+        return vector_tester.VectorTester(student_name)
+
+
+class TestVectorsNetsGraf(unittest.TestCase):
+
+    def test_wrong_net_message_lists_reasons(self):
+        vt = get_vector_tester()
+        names = [point.name for point in vt.vg.base_gnss_net]
+        chain = [[point_0, point_1] for point_0, point_1 in zip(names[:-1], names[1:])]
+        vt._init_vectors_nets({"1": chain, "2": chain[:-1]})
+        lines = vt._check_vectors_nets_graf().splitlines()
+        self.assertEqual(lines[0], "Неправильная сеть №2")
+        self.assertGreater(len(lines), 1)
+        self.assertTrue(all(line.startswith("    ") for line in lines[1:]))
+
+    def test_tree_nets_are_accepted(self):
+        vt = get_vector_tester()
+        names = [point.name for point in vt.vg.base_gnss_net]
+        chain = [[point_0, point_1] for point_0, point_1 in zip(names[:-1], names[1:])]
+        vt._init_vectors_nets({"1": chain, "2": chain[::-1]})
+        self.assertEqual(vt._check_vectors_nets_graf(), "")
+
+
+def write_vectors_file(student, group, base_path, content="{}"):
+    vectors_path = vector_tester.VectorTester.get_vectors_path(student, base_path, group)
+    os.makedirs(os.path.dirname(vectors_path), exist_ok=True)
+    with open(vectors_path, "wt", encoding="UTF-8") as file:
+        file.write(content)
+    return vectors_path
+
+
+class TestReviewDecisions(unittest.TestCase):
+
+    def test_decision_is_applied_without_grading(self):
+        student, group = "Иванов Иван Иванович", "ГГ-21-1"
+        with tempfile.TemporaryDirectory() as base_path:
+            vectors_path = write_vectors_file(student, group, base_path)
+            vectors_hash = vector_tester.GradingCache.get_vectors_hash(vectors_path)
+            with mock.patch.object(vector_tester.EqSolutionChecker, "get_decision",
+                                   return_value="FAIL") as get_decision, \
+                    mock.patch.object(vector_tester.VectorTester, "check_vectors", side_effect=AssertionError):
+                record = vector_tester.VectorTester._check_student_vectors(student, group, base_path)
+        get_decision.assert_called_once_with(vectors_hash)
+        self.assertIsNone(record["key"])
+        self.assertNotEqual(record["result"], "OK")
+
+
+class TestGradingResultsCache(unittest.TestCase):
+
+    def check_twice(self, verdict, result):
+        def check_vectors(vt, base_path, students_group):
+            vt.solution_summary = {"verdict": verdict, "problems": []}
+            return result
+
+        student, group = "Иванов Иван Иванович", "ГГ-21-1"
+        with tempfile.TemporaryDirectory() as base_path, \
+                mock.patch.object(vector_tester, "VARIANT_CACHE_PATH", None), \
+                mock.patch.object(vector_tester, "GRADING_CACHE_PATH", None), \
+                mock.patch.object(vector_tester.VectorTester, "_results", {}), \
+                mock.patch.object(vector_tester.VectorTester, "check_vectors", autospec=True,
+                                  side_effect=check_vectors) as checker:
+            write_vectors_file(student, group, base_path)
+            records = [vector_tester.VectorTester._check_student_vectors(student, group, base_path) for _ in range(2)]
+        self.assertEqual([record["result"] for record in records], [result, result])
+        return checker.call_count
+
+    def test_accepted_result_is_cached(self):
+        self.assertEqual(self.check_twice(vector_tester.EqSolutionChecker.OK, "OK"), 1)
+
+    def test_result_on_review_is_not_cached(self):
+        self.assertEqual(self.check_twice(vector_tester.EqSolutionChecker.BORDERLINE,
+                                          "Решение передано на ручную проверку!\n"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import VectorTester as vector_tester
+from VectorsWatcher import VectorsWatcher
+from test_VectorTester import get_vector_tester, write_vectors_file
+
+GROUP = "ГГ-21-1"
+
+
+class TestVectorsWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.base_path = self.tmp_dir.name
+        self.report_path = os.path.join(self.base_path, "report.txt")
+        self.good_vectors_path = os.path.join(self.base_path, "good.csv")
+        self.patches = [mock.patch.object(vector_tester, "VARIANT_CACHE_PATH", None),
+                        mock.patch.object(vector_tester, "GRADING_CACHE_PATH", None),
+                        mock.patch.object(vector_tester.VectorTester, "_results", {})]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.tmp_dir.cleanup()
+
+    def get_watcher(self):
+        return VectorsWatcher(self.good_vectors_path, base_path=self.base_path, report_path=self.report_path,
+                              debounce=0, poll_interval=0.01, use_inotify=False)
+
+    def test_broken_files_are_reported_and_watching_goes_on(self):
+        one_series = "Петров Петр Петрович"
+        names = [point.name for point in get_vector_tester(one_series).vg.base_gnss_net]
+        chain = [[point_0, point_1] for point_0, point_1 in zip(names[:-1], names[1:])]
+        write_vectors_file(one_series, GROUP, self.base_path, json.dumps({"1": chain}))
+        one_element = "Иванов Иван Иванович"
+        write_vectors_file(one_element, GROUP, self.base_path, json.dumps({"1": [["ABCD"]], "2": [["ABCD"]]}))
+
+        with mock.patch("traceback.print_exc"):
+            self.get_watcher().watch(check_existing=True, duration=0.05)
+
+        with open(self.report_path, "rt", encoding="UTF-8") as file:
+            lines = [line.rstrip("\n").split(";") for line in file]
+        self.assertEqual(sorted(line[1] for line in lines), sorted([one_series, one_element]))
+        for line in lines:
+            self.assertEqual(line[2], GROUP)
+            self.assertTrue(line[3].startswith("Ошибка проверки: IndexError"), line[3])
+
+
+if __name__ == "__main__":
+    unittest.main()